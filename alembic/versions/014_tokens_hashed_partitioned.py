@@ -0,0 +1,82 @@
+"""Tokens: armazena SHA-256 (token_hash) e particiona por mês de expires_at
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+A tabela antiga guardava o token completo em VARCHAR(512) com índice único e
+nunca era limpa. A nova tabela é particionada por RANGE (expires_at), com
+partições mensais criadas/removidas pelo token_sweeper. Apenas tokens ainda
+válidos (não usados e não expirados) são migrados, já convertidos para hash.
+
+Downgrade: o valor original dos tokens não é recuperável — a tabela antiga é
+recriada vazia (usuários precisam logar novamente).
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE tokens_new (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            type tokentype NOT NULL,
+            token_hash VARCHAR(64) NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            used BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP NOT NULL,
+            PRIMARY KEY (id, expires_at)
+        ) PARTITION BY RANGE (expires_at)
+    """)
+    op.execute("CREATE INDEX ix_tokens_new_token_hash ON tokens_new (token_hash)")
+
+    # Partições do mês corrente + 3 meses (o token_sweeper mantém a janela dali em diante)
+    op.execute("""
+        DO $$
+        DECLARE
+            m DATE;
+        BEGIN
+            FOR i IN 0..3 LOOP
+                m := (date_trunc('month', now()) + make_interval(months => i))::date;
+                EXECUTE format(
+                    'CREATE TABLE tokens_p%s PARTITION OF tokens_new FOR VALUES FROM (%L) TO (%L)',
+                    to_char(m, 'YYYYMM'), m, (m + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE tokens_default PARTITION OF tokens_new DEFAULT")
+
+    op.execute("""
+        INSERT INTO tokens_new (id, user_id, type, token_hash, expires_at, used, created_at)
+        SELECT id, user_id, type, encode(sha256(convert_to(token, 'UTF8')), 'hex'),
+               expires_at, used, created_at
+        FROM tokens
+        WHERE NOT used AND expires_at > now() AT TIME ZONE 'UTC'
+    """)
+
+    op.execute("DROP TABLE tokens")
+    op.execute("ALTER TABLE tokens_new RENAME TO tokens")
+    op.execute("ALTER INDEX ix_tokens_new_token_hash RENAME TO ix_tokens_token_hash")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS tokens CASCADE")
+    op.execute("""
+        CREATE TABLE tokens (
+            id UUID PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            type tokentype NOT NULL,
+            token VARCHAR(512) NOT NULL UNIQUE,
+            expires_at TIMESTAMP NOT NULL,
+            used BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP NOT NULL
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tokens_token ON tokens (token)")
@@ -0,0 +1,39 @@
+"""Cria contract_counters — numeração de contratos por tenant sem max()+1
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+O próximo número é alocado com INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+na mesma transação da criação do contrato. Os contadores são semeados com o
+maior número já existente de cada tenant.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS contract_counters (
+            tenant_id   UUID PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+            last_numero INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    op.execute("""
+        INSERT INTO contract_counters (tenant_id, last_numero)
+        SELECT tenant_id, COALESCE(MAX(numero), 0)
+        FROM contracts
+        GROUP BY tenant_id
+        ON CONFLICT (tenant_id) DO UPDATE
+            SET last_numero = GREATEST(contract_counters.last_numero, EXCLUDED.last_numero)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS contract_counters")
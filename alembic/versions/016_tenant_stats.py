@@ -0,0 +1,54 @@
+"""Cria tenant_stats — contadores materializados por tenant para o dashboard
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+Uma linha por (tenant_id, metric), atualizada por upsert incremental na mesma
+transação das escritas de contratos, pagamentos, projetos e materiais; o
+reconciliador periódico (app/tenants/stats.py) corrige divergências. A tabela
+é semeada com os valores atuais de cada tenant.
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tenant_stats (
+            tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+            metric    VARCHAR(64) NOT NULL,
+            qty       BIGINT NOT NULL DEFAULT 0,
+            amount    NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            PRIMARY KEY (tenant_id, metric)
+        )
+    """)
+
+    op.execute("""
+        INSERT INTO tenant_stats (tenant_id, metric, qty, amount)
+        SELECT tenant_id, 'contracts:' || status::text, count(*), 0
+        FROM contracts GROUP BY tenant_id, status
+        UNION ALL
+        SELECT tenant_id, 'payments:' || status::text, count(*), COALESCE(sum(amount), 0)
+        FROM payments GROUP BY tenant_id, status
+        UNION ALL
+        SELECT tenant_id, 'projects:' || status::text, count(*), 0
+        FROM projects GROUP BY tenant_id, status
+        UNION ALL
+        SELECT tenant_id, 'materials:total', count(*), 0
+        FROM materials GROUP BY tenant_id
+        UNION ALL
+        SELECT tenant_id, 'materials:low_stock', count(*), 0
+        FROM materials WHERE quantity <= min_quantity GROUP BY tenant_id
+        ON CONFLICT (tenant_id, metric) DO UPDATE
+            SET qty = EXCLUDED.qty, amount = EXCLUDED.amount
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS tenant_stats")
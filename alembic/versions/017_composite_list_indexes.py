@@ -0,0 +1,77 @@
+"""Índices compostos para as listagens por tenant (construídos CONCURRENTLY)
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+
+Cada índice segue o filtro + a ordenação keyset da listagem correspondente
+(app/utils/pagination.py), de modo que a página é lida por index range scan já
+na ordem certa — sem Seq Scan nem Sort:
+
+  payments   (tenant_id, due_date DESC, id DESC)            list_payments
+             (tenant_id, status, due_date DESC, id DESC)    list_payments ?status=
+             (status, due_date)                             sync_overdue / overdue_sweeper
+  contracts  (tenant_id, COALESCE(numero, …) DESC, id DESC) list_contracts
+             (tenant_id, status, COALESCE(numero, …) DESC, id DESC)
+  projects   (tenant_id, created_at DESC, id DESC)          list_projects
+             (tenant_id, status, created_at DESC, id DESC)
+  materials  (tenant_id, name, id)                          list_materials
+  users      (role, is_active, created_at DESC, id DESC)    list_partners, list_users ?role=
+             (created_at DESC, id DESC) WHERE is_active     list_users
+  lpus       (tenant_id, nome, id)                          list_lpus
+  lpu_itens  (lpu_id, created_at DESC, id DESC)             list_itens_lpu
+
+As listagens devolvem a linha inteira, então os índices não usam INCLUDE — o
+ganho está em evitar a varredura e a ordenação.
+
+CREATE INDEX CONCURRENTLY não roda em transação: cada índice é criado em um
+bloco autocommit. Se uma criação anterior falhou, o índice INVALID que ficou
+para trás é removido antes de recriar. Conferência dos planos:
+scripts/check_index_scans.py.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mesmo sentinela usado na ordenação de list_contracts (numero nulo = mais recente)
+_NUMERO = "COALESCE(numero, 2147483647)"
+
+INDEXES: list[tuple[str, str]] = [
+    ("ix_payments_tenant_due", "payments (tenant_id, due_date DESC, id DESC)"),
+    ("ix_payments_tenant_status_due", "payments (tenant_id, status, due_date DESC, id DESC)"),
+    ("ix_payments_status_due", "payments (status, due_date)"),
+    ("ix_contracts_tenant_numero", f"contracts (tenant_id, ({_NUMERO}) DESC, id DESC)"),
+    ("ix_contracts_tenant_status_numero", f"contracts (tenant_id, status, ({_NUMERO}) DESC, id DESC)"),
+    ("ix_projects_tenant_created", "projects (tenant_id, created_at DESC, id DESC)"),
+    ("ix_projects_tenant_status_created", "projects (tenant_id, status, created_at DESC, id DESC)"),
+    ("ix_materials_tenant_name", "materials (tenant_id, name, id)"),
+    ("ix_users_role_active_created", "users (role, is_active, created_at DESC, id DESC)"),
+    ("ix_users_active_created", "users (created_at DESC, id DESC) WHERE is_active"),
+    ("ix_lpus_tenant_nome", "lpus (tenant_id, nome, id)"),
+    ("ix_lpu_itens_lpu_created", "lpu_itens (lpu_id, created_at DESC, id DESC)"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, definition in INDEXES:
+            invalid = bind.execute(text("""
+                SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name AND NOT i.indisvalid
+            """), {"name": name}).scalar()
+            if invalid:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,66 @@
+"""Índices de busca textual (pg_trgm) para parceiros, usuários, serviços e materiais
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-19
+
+Servem app/utils/search.py e o filtro ?search= de list_partners:
+
+  GIN gin_trgm_ops          col ILIKE '%termo%' / col % termo (termos ≥ 3 caracteres)
+  btree lower(col) text_pattern_ops
+                            lower(col) LIKE 'ab%' (termos curtos, em ordem alfabética)
+
+  users      name, email              /admin/partners/search, /admin/users/search
+  servicos   codigo, atividade        /modules/catalogo/lpu/servicos/search
+  materiais  codigo, descricao        /modules/catalogo/materiais/search
+
+Como em 017, cada índice é criado CONCURRENTLY em bloco autocommit, removendo
+antes um eventual índice INVALID de uma tentativa anterior.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUNAS: list[tuple[str, str]] = [
+    ("users", "name"),
+    ("users", "email"),
+    ("servicos", "codigo"),
+    ("servicos", "atividade"),
+    ("materiais", "codigo"),
+    ("materiais", "descricao"),
+]
+
+INDEXES: list[tuple[str, str]] = [
+    (f"ix_{tabela}_{coluna}_trgm", f"{tabela} USING gin ({coluna} gin_trgm_ops)")
+    for tabela, coluna in _COLUNAS
+] + [
+    (f"ix_{tabela}_{coluna}_prefix", f"{tabela} (lower({coluna}) text_pattern_ops)")
+    for tabela, coluna in _COLUNAS
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for name, definition in INDEXES:
+            invalid = bind.execute(text("""
+                SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = :name AND NOT i.indisvalid
+            """), {"name": name}).scalar()
+            if invalid:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade() -> None:
+    # A extensão fica: outros objetos do banco podem depender dela
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
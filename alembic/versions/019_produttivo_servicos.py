@@ -0,0 +1,38 @@
+"""Cria produttivo_servicos — métrica de produção do Produttivo → serviço do catálogo
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-19
+
+Uma linha por (tenant_id, metrica): qual Serviço precifica cada métrica do
+relatório por usuário (cabo_m, cordoalha_m, ceo, cto, dio) na valoração
+contra as LPUs (GET /modules/produttivo/relatorio/valorado).
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS produttivo_servicos (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+            metrica VARCHAR(20) NOT NULL,
+            servico_id UUID NOT NULL REFERENCES servicos(id) ON DELETE CASCADE,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            CONSTRAINT uq_produttivo_servicos_tenant_metrica UNIQUE (tenant_id, metrica)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_produttivo_servicos_servico_id ON produttivo_servicos (servico_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS produttivo_servicos")
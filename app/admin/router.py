@@ -1,14 +1,19 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.admin import schemas, service
+from app.auth.audit import audit_writer
 from app.auth.models import User, UserRole, UserStatus
-from app.database.connection import get_db
+from app.auth.dependencies import get_read_db
+from app.database.connection import get_db, read_engine
+from app.database.pool import pool_metrics, read_pool_metrics
 from app.rbac.dependencies import require_roles
+from app.utils.pagination import PageParams, page_params
 from app.utils.responses import success
+from app.utils.search import search_limit
 
 router = APIRouter()
 
@@ -32,17 +37,31 @@ async def create_user(
 async def list_users(
     role: Optional[UserRole] = None,
     user_status: Optional[UserStatus] = None,
-    page: int = 1,
-    per_page: int = 20,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     admin: User = Depends(_admin_or_master),
 ):
-    users, total = await service.list_users(db, admin, role, user_status, page, per_page)
+    page = await service.list_users(db, admin, params, role, user_status)
     return success("Lista de usuários.", {
-        "results": [schemas.UserDetail.model_validate(u) for u in users],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.UserDetail.model_validate(u) for u in page.items],
+        **page.meta(),
+    })
+
+
+@router.get("/users/search", response_model=None)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    role: Optional[UserRole] = None,
+    limit: int = Depends(search_limit),
+    db: AsyncSession = Depends(get_read_db),
+    admin: User = Depends(_admin_or_master),
+):
+    hits = await service.search_users(db, admin, q, limit, role)
+    return success("Busca de usuários.", {
+        "q": q,
+        "results": [
+            {**schemas.UserDetail.model_validate(u).model_dump(), "score": score} for u, score in hits
+        ],
     })
 
 
@@ -154,3 +173,16 @@ async def remove_user_from_tenant(
 ):
     await service.remove_user_from_tenant(db, user_id, tenant_id, admin)
     return success("Empresa removida do usuário.")
+
+
+@router.get("/audit/stats")
+async def audit_stats(admin: User = Depends(_master_only)):
+    return success("Estatísticas do audit log.", audit_writer.stats())
+
+
+@router.get("/db/pool")
+async def db_pool_stats(admin: User = Depends(_master_only)):
+    return success("Estatísticas do pool de conexões.", {
+        "primary": pool_metrics.stats(),
+        "replica": read_pool_metrics.stats() if read_engine is not None else None,
+    })
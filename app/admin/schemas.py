@@ -24,9 +24,10 @@ class UserDetail(BaseModel):
 
 class UserListResponse(BaseModel):
     results: List[UserDetail]
-    total: int
-    page: int
+    total: Optional[int]
+    page: Optional[int]
     per_page: int
+    next_cursor: Optional[str] = None
 
 
 class ApproveRequest(BaseModel):
@@ -5,16 +5,20 @@ from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import func, select, delete
+from sqlalchemy import Select, select, delete
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.models import AuditLog, Token, TokenType, User, UserRole, UserStatus, user_tenants as user_tenants_table
+from app.auth.audit import audit_writer
+from app.auth.jwt import hash_token
+from app.auth.models import Token, TokenType, User, UserRole, UserStatus, user_tenants as user_tenants_table
 from app.auth.service import hash_password
 from app.config.settings import settings
 from app.tenants.models import Tenant
 from app.utils.email import send_account_approved, send_approval_code
+from app.utils.pagination import Page, PageParams, paginate
+from app.utils.search import search
 
 logger = logging.getLogger(__name__)
 
@@ -63,42 +67,56 @@ async def list_pending_users(db: AsyncSession, admin: User) -> list[User]:
     return result.scalars().all()
 
 
-async def list_users(
-    db: AsyncSession,
-    admin: User,
-    role: UserRole | None = None,
-    user_status: UserStatus | None = None,
-    page: int = 1,
-    per_page: int = 20,
-) -> tuple[list[User], int]:
+def _users_query(admin: User) -> Select | None:
+    """Usuários ativos visíveis para `admin` (None → nenhum)."""
     query = select(User).where(User.is_active == True)
-    count_query = select(func.count()).select_from(User).where(User.is_active == True)
 
     # MASTER vê todos; demais roles filtram pela tabela N:N (user_tenants)
     # para garantir que usuários com tenant secundário também sejam visíveis.
     if admin.role != UserRole.MASTER:
         tenant_ids = [t.id for t in admin.tenants]
-        if tenant_ids:
-            member_ids = select(user_tenants_table.c.user_id).where(
-                user_tenants_table.c.tenant_id.in_(tenant_ids)
-            )
-            query = query.where(User.id.in_(member_ids))
-            count_query = count_query.where(User.id.in_(member_ids))
-        else:
-            return [], 0
+        if not tenant_ids:
+            return None
+        member_ids = select(user_tenants_table.c.user_id).where(
+            user_tenants_table.c.tenant_id.in_(tenant_ids)
+        )
+        query = query.where(User.id.in_(member_ids))
+    return query
+
+
+async def list_users(
+    db: AsyncSession,
+    admin: User,
+    params: PageParams,
+    role: UserRole | None = None,
+    user_status: UserStatus | None = None,
+) -> Page:
+    query = _users_query(admin)
+    if query is None:
+        return Page.empty(params)
 
     if role:
         query = query.where(User.role == role)
-        count_query = count_query.where(User.role == role)
     if user_status:
         query = query.where(User.status == user_status)
-        count_query = count_query.where(User.status == user_status)
 
-    total = (await db.execute(count_query)).scalar()
-    users = (await db.execute(
-        query.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
-    )).scalars().all()
-    return users, total
+    return await paginate(db, query, [(User.created_at, True), (User.id, True)], params)
+
+
+async def search_users(
+    db: AsyncSession,
+    admin: User,
+    termo: str,
+    limit: int,
+    role: UserRole | None = None,
+) -> list[tuple[User, float]]:
+    """Busca por nome/e-mail ranqueada por similaridade (ver app/utils/search.py)."""
+    query = _users_query(admin)
+    if query is None:
+        return []
+    if role:
+        query = query.where(User.role == role)
+    return await search(db, query, [User.name, User.email], termo, limit)
 
 
 async def initiate_approval(db: AsyncSession, user_id: UUID, admin: User) -> None:
@@ -111,22 +129,19 @@ async def initiate_approval(db: AsyncSession, user_id: UUID, admin: User) -> Non
     db.add(Token(
         user_id=user.id,
         type=TokenType.APPROVAL_CODE,
-        token=f"approval:{user_id}:{code}",
+        token_hash=hash_token(f"approval:{user_id}:{code}"),
         expires_at=datetime.utcnow() + timedelta(minutes=15),
     ))
     await db.commit()
 
     if settings.ADMIN_MASTER_EMAIL:
-        try:
-            await send_approval_code(settings.ADMIN_MASTER_EMAIL, code, user.name)
-        except Exception as exc:
-            logger.error("Falha ao enviar código: %s", exc)
+        await send_approval_code(settings.ADMIN_MASTER_EMAIL, code, user.name)
 
 
 async def confirm_approval(db: AsyncSession, user_id: UUID, code: str, admin: User) -> User:
-    token_value = f"approval:{user_id}:{code}"
+    token_value = hash_token(f"approval:{user_id}:{code}")
     result = await db.execute(
-        select(Token).where(Token.token == token_value, Token.type == TokenType.APPROVAL_CODE, Token.used == False)
+        select(Token).where(Token.token_hash == token_value, Token.type == TokenType.APPROVAL_CODE, Token.used == False)
     )
     token_obj = result.scalar_one_or_none()
     if not token_obj:
@@ -140,14 +155,11 @@ async def confirm_approval(db: AsyncSession, user_id: UUID, code: str, admin: Us
     user.status = UserStatus.APPROVED
     user.updated_at = datetime.utcnow()
 
-    db.add(AuditLog(user_id=admin.id, action="APPROVE_USER", details={"approved_user_id": str(user_id)}))
     await db.commit()
+    audit_writer.record(user_id=admin.id, action="APPROVE_USER", details={"approved_user_id": str(user_id)})
     await db.refresh(user)
 
-    try:
-        await send_account_approved(user.email, user.name)
-    except Exception as exc:
-        logger.warning("Falha ao notificar usuário aprovado: %s", exc)
+    await send_account_approved(user.email, user.name)
 
     return user
 
@@ -162,8 +174,8 @@ async def block_user(db: AsyncSession, user_id: UUID, admin: User, reason: str |
 
     user.status = UserStatus.BLOCKED
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(user_id=admin.id, action="BLOCK_USER", details={"blocked_user_id": str(user_id), "reason": reason}))
     await db.commit()
+    audit_writer.record(user_id=admin.id, action="BLOCK_USER", details={"blocked_user_id": str(user_id), "reason": reason})
     await db.refresh(user)
     return user
 
@@ -175,8 +187,8 @@ async def unblock_user(db: AsyncSession, user_id: UUID, admin: User) -> User:
     user.login_attempts = 0
     user.locked_until = None
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(user_id=admin.id, action="UNBLOCK_USER", details={"unblocked_user_id": str(user_id)}))
     await db.commit()
+    audit_writer.record(user_id=admin.id, action="UNBLOCK_USER", details={"unblocked_user_id": str(user_id)})
     await db.refresh(user)
     return user
 
@@ -191,8 +203,8 @@ async def change_user_role(db: AsyncSession, user_id: UUID, new_role: UserRole,
     _assert_admin_can_access_user(admin, user)
     user.role = new_role
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(user_id=admin.id, action="CHANGE_ROLE", details={"target": str(user_id), "new_role": new_role.value}))
     await db.commit()
+    audit_writer.record(user_id=admin.id, action="CHANGE_ROLE", details={"target": str(user_id), "new_role": new_role.value})
     await db.refresh(user)
     return user
 
@@ -205,8 +217,8 @@ async def change_user_password(db: AsyncSession, user_id: UUID, new_password: st
 
     user.password_hash = hash_password(new_password)
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(user_id=admin.id, action="CHANGE_PASSWORD", details={"target": str(user_id)}))
     await db.commit()
+    audit_writer.record(user_id=admin.id, action="CHANGE_PASSWORD", details={"target": str(user_id)})
     await db.refresh(user)
     return user
 
@@ -234,12 +246,12 @@ async def change_user_tenant(db: AsyncSession, user_id: UUID, tenant_id: UUID |
 
     user.tenant_id = tenant_id
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="CHANGE_TENANT",
         details={"target": str(user_id), "tenant_id": str(tenant_id) if tenant_id else None},
-    ))
-    await db.commit()
+    )
     await db.refresh(user)
     return user
 
@@ -272,14 +284,14 @@ async def add_user_to_tenant(db: AsyncSession, user_id: UUID, tenant_id: UUID, a
     # Set as primary if the user has no primary tenant yet
     if user.tenant_id is None:
         user.tenant_id = tenant_id
-        user.updated_at = datetime.utcnow()
+    user.updated_at = datetime.utcnow()  # invalida as claims dos access tokens já emitidos
 
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="ADD_USER_TENANT",
         details={"target": str(user_id), "tenant_id": str(tenant_id)},
-    ))
-    await db.commit()
+    )
 
 
 async def remove_user_from_tenant(db: AsyncSession, user_id: UUID, tenant_id: UUID, admin: User) -> None:
@@ -295,14 +307,14 @@ async def remove_user_from_tenant(db: AsyncSession, user_id: UUID, tenant_id: UU
     # If primary tenant was removed, clear users.tenant_id
     if user.tenant_id == tenant_id:
         user.tenant_id = None
-        user.updated_at = datetime.utcnow()
+    user.updated_at = datetime.utcnow()  # invalida as claims dos access tokens já emitidos
 
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="REMOVE_USER_TENANT",
         details={"target": str(user_id), "tenant_id": str(tenant_id)},
-    ))
-    await db.commit()
+    )
 
 
 async def admin_create_user(
@@ -340,12 +352,11 @@ async def admin_create_user(
         status=UserStatus.APPROVED,
     )
     db.add(new_user)
-    await db.flush()
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="ADMIN_CREATE_USER",
         details={"created_user_email": email, "role": role.value},
-    ))
-    await db.commit()
+    )
     await db.refresh(new_user)
     return new_user
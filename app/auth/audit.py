@@ -0,0 +1,134 @@
+"""
+Pipeline assíncrono de audit log.
+
+Os endpoints apenas enfileiram o evento (`audit_writer.record(...)`, O(1), sem I/O).
+Uma task em background drena a fila em lotes e grava com um único INSERT
+multi-linha por lote, em sessão própria — o request não paga pela escrita.
+
+Ciclo de vida: `start()` e `stop()` são chamados no lifespan (app/main.py);
+`stop()` faz o flush do que ainda estiver na fila.
+
+Fila limitada: se encher (banco fora do ar, pico de tráfego) o evento é
+descartado e contabilizado em `dropped` — a auditoria nunca bloqueia o request.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy import insert
+
+from app.auth.models import AuditLog
+from app.config.settings import settings
+from app.database.connection import AsyncSessionLocal
+from app.utils.client_ip import client_ip
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditWriter:
+    def __init__(self, maxsize: int, batch_size: int, flush_interval: float):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(
+        self,
+        action: str,
+        user_id: Optional[UUID] = None,
+        request: Optional[Request] = None,
+        details: Optional[dict] = None,
+    ) -> None:
+        row = {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "action": action,
+            "ip": client_ip(request),
+            "user_agent": request.headers.get("user-agent") if request else None,
+            "details": details,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait(row)
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Fila de audit log cheia — evento descartado: %s", action)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+            if stop:
+                return
+
+    async def _write(self, batch: list[dict]) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(AuditLog), batch)
+                await session.commit()
+            self.written += len(batch)
+        except Exception as exc:
+            # Um registro inválido (ex: FK de usuário removido) não deve derrubar o lote
+            logger.error("Falha ao gravar lote de audit log (%d): %s", len(batch), exc)
+            if len(batch) > 1:
+                for row in batch:
+                    await self._write([row])
+            else:
+                self.failed += 1
+
+
+audit_writer = AuditWriter(
+    maxsize=settings.AUDIT_QUEUE_MAXSIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
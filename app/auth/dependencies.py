@@ -1,22 +1,24 @@
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.database.connection import get_db
-from app.auth.models import User, UserStatus
+from app.config.settings import settings
+from app.database.connection import ReadSessionLocal, get_db, release_db
+from app.database.routing import prefer_primary
+from app.auth.models import User, UserRole, UserStatus
 from app.auth.jwt import decode_token
+from app.auth.revocation import user_versions
+from app.tenants.models import Tenant
 
 bearer_scheme = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    token = credentials.credentials
-    payload = decode_token(token)
+def _access_payload(credentials: HTTPAuthorizationCredentials) -> dict:
+    payload = decode_token(credentials.credentials)
 
     if not payload or payload.get("type") != "access":
         raise HTTPException(
@@ -24,10 +26,41 @@ async def get_current_user(
             detail="Token inválido ou expirado",
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
 
+    return payload
+
+
+def _user_from_claims(payload: dict) -> User | None:
+    """
+    Monta um User transiente (fora da sessão) a partir das claims assinadas.
+    Retorna None se o token não tiver as claims necessárias (tokens antigos)
+    ou se o usuário mudou desde a emissão — o chamador consulta o banco.
+    """
+    if "tenants" not in payload or "iat" not in payload:
+        return None
+    if payload.get("status") != UserStatus.APPROVED.value:
+        return None
+    try:
+        user_id = UUID(payload["sub"])
+        tenant_id = UUID(payload["tenant_id"]) if payload.get("tenant_id") else None
+        user = User(
+            id=user_id,
+            role=UserRole(payload["role"]),
+            status=UserStatus.APPROVED,
+            tenant_id=tenant_id,
+            is_active=True,
+        )
+        user.tenants = [Tenant(id=UUID(t)) for t in payload["tenants"]]
+    except (KeyError, ValueError):
+        return None
+    if not user_versions.is_current(user_id, payload["iat"]):
+        return None
+    return user
+
+
+async def _load_user(db: AsyncSession, user_id: str) -> User:
     result = await db.execute(
         select(User)
         .where(User.id == user_id, User.is_active == True)
@@ -42,3 +75,51 @@ async def get_current_user(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Conta não aprovada")
 
     return user
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """
+    Usuário autenticado. Com AUTH_STATELESS_ACCESS_TOKENS, retorna um User
+    transiente montado das claims (id, role, status, tenant_id, tenants) sem
+    consultar o banco — não use para ler perfil nem para alterar o próprio
+    usuário; nesses casos use `get_current_user_from_db`.
+    """
+    payload = _access_payload(credentials)
+    if settings.AUTH_STATELESS_ACCESS_TOKENS:
+        user = _user_from_claims(payload)
+        if user is not None:
+            return user
+    return await _load_user(db, payload["sub"])
+
+
+async def get_current_user_from_db(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Usuário autenticado, sempre carregado do banco (na sessão do request)."""
+    payload = _access_payload(credentials)
+    return await _load_user(db, payload["sub"])
+
+
+async def get_read_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Sessão para endpoints só de leitura (listagens, buscas, relatórios).
+
+    Sem réplica (ou com read-your-writes ativo) é a própria sessão do request —
+    nenhuma conexão a mais. Com réplica, depende do usuário autenticado: a
+    autenticação termina antes (o FastAPI reaproveita o mesmo `get_current_user`
+    nos require_roles/tenant_context do endpoint) e a conexão que ela usou no
+    principal volta ao pool antes da leitura — uma conexão por request, não duas.
+    """
+    if ReadSessionLocal is None or prefer_primary():
+        yield db
+        return
+    await release_db(db)
+    async with ReadSessionLocal() as session:
+        yield session
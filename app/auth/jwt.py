@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -6,9 +7,24 @@ from jose import JWTError, jwt
 from app.config.settings import settings
 
 
+def access_token_claims(user) -> dict:
+    """
+    Claims do usuário embutidas nos tokens. Com AUTH_STATELESS_ACCESS_TOKENS,
+    `get_current_user` confia nelas sem consultar o banco (requer `user.tenants` carregado).
+    """
+    return {
+        "sub": str(user.id),
+        "role": user.role.value,
+        "status": user.status.value,
+        "tenant_id": str(user.tenant_id) if user.tenant_id else None,
+        "tenants": [str(t.id) for t in user.tenants],
+    }
+
+
 def create_access_token(data: dict) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {**data, "exp": expire, "type": "access"}
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode = {**data, "iat": int(now.timestamp()), "exp": expire, "type": "access"}
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -23,3 +39,8 @@ def decode_token(token: str) -> Optional[dict]:
         return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
+
+
+def hash_token(token: str) -> str:
+    """Digest de tamanho fixo (SHA-256 hex) usado para persistir e buscar tokens."""
+    return hashlib.sha256(token.encode()).hexdigest()
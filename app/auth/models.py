@@ -61,12 +61,19 @@ class User(Base):
 
 
 class Token(Base):
+    """
+    Tokens de uso único (refresh, reset de senha, código de aprovação).
+
+    Guarda apenas o SHA-256 do valor (`hash_token`), nunca o token em si.
+    A tabela é particionada por mês de `expires_at` (migration 014) e limpa
+    pelo `token_sweeper`.
+    """
     __tablename__ = "tokens"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = Column(Enum(TokenType), nullable=False)
-    token = Column(String(512), unique=True, nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, index=True)
     expires_at = Column(DateTime, nullable=False)
     used = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
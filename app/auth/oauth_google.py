@@ -4,8 +4,9 @@ import httpx
 from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.auth.jwt import create_access_token, create_refresh_token
+from app.auth.jwt import access_token_claims, create_access_token, create_refresh_token
 from app.auth.models import User, UserRole, UserStatus
 from app.config.settings import settings
 
@@ -54,11 +55,15 @@ async def handle_google_callback(db: AsyncSession, code: str) -> dict:
     email = userinfo.get("email")
     name = userinfo.get("name", email)
 
-    result = await db.execute(select(User).where(User.google_id == google_id))
+    result = await db.execute(
+        select(User).where(User.google_id == google_id).options(selectinload(User.tenants))
+    )
     user = result.scalar_one_or_none()
 
     if not user:
-        email_result = await db.execute(select(User).where(User.email == email))
+        email_result = await db.execute(
+            select(User).where(User.email == email).options(selectinload(User.tenants))
+        )
         user = email_result.scalar_one_or_none()
         if user:
             user.google_id = google_id
@@ -71,6 +76,6 @@ async def handle_google_callback(db: AsyncSession, code: str) -> dict:
         await db.commit()
         raise HTTPException(status_code=403, detail="Conta aguardando aprovação")
 
-    token_payload = {"sub": str(user.id), "role": user.role.value, "tenant_id": str(user.tenant_id) if user.tenant_id else None}
+    token_payload = access_token_claims(user)
     await db.commit()
     return {"access_token": create_access_token(token_payload), "refresh_token": create_refresh_token(token_payload), "token_type": "bearer"}
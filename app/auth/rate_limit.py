@@ -0,0 +1,184 @@
+"""
+Rate limiting de login em janela deslizante (sliding window).
+
+Mantém, em memória, os timestamps das tentativas recentes por chave
+(IP ou e-mail) e rejeita o tráfego abusivo ANTES de qualquer query no banco
+ou verificação bcrypt.
+
+Backends:
+  - MemoryBackend (padrão): por processo. Suficiente para 1 worker.
+  - RedisBackend: compartilhado entre workers/instâncias. Ativado quando
+    RATE_LIMIT_REDIS_URL está configurado (requer o pacote `redis`, opcional).
+
+Uso:
+    retry_after = await login_rate_limiter.retry_after(ip, email)
+    if retry_after:
+        raise HTTPException(429, ...)
+"""
+import logging
+import time
+from collections import deque
+from typing import Optional, Protocol
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitBackend(Protocol):
+    async def hit(self, key: str, now: float, window: float) -> None: ...
+
+    async def peek(self, key: str, now: float, window: float) -> tuple[int, Optional[float]]:
+        """Retorna (tentativas na janela, timestamp da mais antiga)."""
+        ...
+
+    async def clear(self, key: str) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Backend em memória do processo — uma deque de timestamps por chave.
+
+    `_hits` fica em ordem de último acesso (a chave vai para o fim a cada hit):
+    as chaves expiradas e as menos ativas estão sempre no começo.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self._hits: dict[str, deque[float]] = {}
+        self._max_keys = max_keys
+
+    def _prune(self, key: str, now: float, window: float) -> deque[float]:
+        hits = self._hits.get(key)
+        if hits is None:
+            return deque()
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+        return hits
+
+    def _sweep(self, now: float, window: float) -> None:
+        # Limita o uso de memória sob ataque distribuído (muitas chaves distintas):
+        # descarta as expiradas e, se ainda houver chaves demais (todas dentro da
+        # janela), as de acesso mais antigo — o dict nunca passa de max_keys
+        while self._hits:
+            key, hits = next(iter(self._hits.items()))
+            if hits and hits[-1] > now - window and len(self._hits) < self._max_keys:
+                break
+            del self._hits[key]
+
+    async def hit(self, key: str, now: float, window: float) -> None:
+        hits = self._prune(key, now, window)
+        if key in self._hits:
+            del self._hits[key]    # reinsere no fim: ordem de último acesso
+        elif len(self._hits) >= self._max_keys:
+            self._sweep(now, window)
+        hits.append(now)
+        self._hits[key] = hits
+
+    async def peek(self, key: str, now: float, window: float) -> tuple[int, Optional[float]]:
+        hits = self._prune(key, now, window)
+        return len(hits), (hits[0] if hits else None)
+
+    async def clear(self, key: str) -> None:
+        self._hits.pop(key, None)
+
+
+class RedisBackend:
+    """Backend compartilhado via Redis (sorted set de timestamps por chave)."""
+
+    def __init__(self, url: str, namespace: str = "teleradar:ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:  # pragma: no cover - dependência opcional
+            raise RuntimeError(
+                "RATE_LIMIT_REDIS_URL configurado, mas o pacote 'redis' não está instalado."
+            ) from exc
+        self._redis = redis.from_url(url)
+        self._ns = namespace
+
+    async def hit(self, key: str, now: float, window: float) -> None:
+        k = self._ns + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(k, 0, now - window)
+            pipe.zadd(k, {f"{now:.6f}": now})
+            pipe.expire(k, int(window) + 1)
+            await pipe.execute()
+
+    async def peek(self, key: str, now: float, window: float) -> tuple[int, Optional[float]]:
+        k = self._ns + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(k, 0, now - window)
+            pipe.zcard(k)
+            pipe.zrange(k, 0, 0, withscores=True)
+            _, count, oldest = await pipe.execute()
+        return count, (oldest[0][1] if oldest else None)
+
+    async def clear(self, key: str) -> None:
+        await self._redis.delete(self._ns + key)
+
+
+class SlidingWindowLimiter:
+    """Limite de `limit` eventos por `window` segundos para cada chave."""
+
+    def __init__(self, backend: RateLimitBackend, prefix: str, limit: int, window: float):
+        self.backend = backend
+        self.prefix = prefix
+        self.limit = limit
+        self.window = window
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def hit(self, key: str) -> None:
+        await self.backend.hit(self._key(key), time.time(), self.window)
+
+    async def retry_after(self, key: str) -> float:
+        """Segundos até liberar a chave (0 = liberada)."""
+        now = time.time()
+        count, oldest = await self.backend.peek(self._key(key), now, self.window)
+        if count < self.limit or oldest is None:
+            return 0.0
+        return max(oldest + self.window - now, 0.0)
+
+    async def reset(self, key: str) -> None:
+        await self.backend.clear(self._key(key))
+
+
+class LoginRateLimiter:
+    """Combina os limites por IP (todas as tentativas) e por e-mail (falhas)."""
+
+    def __init__(self, backend: RateLimitBackend):
+        window = settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS
+        self.by_ip = SlidingWindowLimiter(backend, "login:ip", settings.LOGIN_RATE_LIMIT_PER_IP, window)
+        self.by_email = SlidingWindowLimiter(backend, "login:email", settings.LOGIN_RATE_LIMIT_PER_EMAIL, window)
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return email.strip().lower()
+
+    async def retry_after(self, ip: Optional[str], email: str) -> float:
+        """Verifica os limites e registra a tentativa para o IP."""
+        waits = [await self.by_email.retry_after(self._email_key(email))]
+        if ip:
+            waits.append(await self.by_ip.retry_after(ip))
+        wait = max(waits)
+        if not wait and ip:
+            await self.by_ip.hit(ip)
+        return wait
+
+    async def register_failure(self, email: str) -> None:
+        await self.by_email.hit(self._email_key(email))
+
+    async def register_success(self, email: str) -> None:
+        await self.by_email.reset(self._email_key(email))
+
+
+def _build_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_REDIS_URL:
+        logger.info("Rate limit de login usando backend Redis compartilhado")
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryBackend()
+
+
+login_rate_limiter = LoginRateLimiter(_build_backend())
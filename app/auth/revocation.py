@@ -0,0 +1,102 @@
+"""
+Lista de versões de usuários para o modo stateless de access token.
+
+Com AUTH_STATELESS_ACCESS_TOKENS=true, `get_current_user` aceita as claims
+assinadas do JWT (role, status, empresas) sem consultar o banco — desde que o
+usuário não tenha sido alterado depois da emissão do token.
+
+A "versão" de cada usuário é `users.updated_at`, que já é atualizado em
+bloqueio, aprovação, troca de role, senha e vínculo com empresas. Uma task de
+background recarrega periodicamente {user_id: updated_at} dos usuários ativos
+e aprovados. Um token é aceito pelas claims somente se:
+  - o usuário está no snapshot (ativo e aprovado), e
+  - `updated_at <= iat` do token.
+Caso contrário — ou se o snapshot estiver desatualizado — a requisição cai no
+caminho normal (consulta ao banco), que aplica as regras de sempre.
+"""
+import asyncio
+import logging
+import time
+from datetime import timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.auth.models import User, UserStatus
+from app.config.settings import settings
+from app.database.connection import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class UserVersionCache:
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._versions: dict[UUID, float] = {}
+        self._loaded_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._versions),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    def is_current(self, user_id: UUID, issued_at: int) -> bool:
+        """True se as claims de um token emitido em `issued_at` ainda valem."""
+        fresh = (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at <= self._interval * 3
+        )
+        version = self._versions.get(user_id) if fresh else None
+        if version is None or version > issued_at:
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run(), name="user-version-cache")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.refresh()
+            except Exception as exc:
+                logger.error("Falha ao atualizar versões de usuários: %s", exc)
+            try:
+                await asyncio.wait_for(self._stop.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh(self) -> None:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(User.id, User.updated_at)
+                .where(User.is_active == True, User.status == UserStatus.APPROVED)
+            )
+            rows = result.all()
+        self._versions = {
+            user_id: updated_at.replace(tzinfo=timezone.utc).timestamp()
+            for user_id, updated_at in rows
+        }
+        self._loaded_at = time.monotonic()
+
+
+user_versions = UserVersionCache(interval=settings.AUTH_REVOCATION_REFRESH_SECONDS)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import schemas, service
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_from_db
 from app.auth.models import User
 from app.auth.oauth_google import get_google_auth_url, handle_google_callback
 from app.database.connection import get_db
@@ -56,14 +56,14 @@ async def reset_password(data: schemas.ResetPassword, db: AsyncSession = Depends
 async def change_password(
     data: schemas.ChangePassword,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_from_db),
 ):
     await service.change_password(db, current_user, data.current_password, data.new_password)
     return success("Senha alterada com sucesso.")
 
 
 @router.get("/me")
-async def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: User = Depends(get_current_user_from_db)):
     return success("Dados do usuário.", schemas.UserResponse.model_validate(current_user))
 
 
@@ -1,17 +1,19 @@
+import math
 import secrets
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from uuid import UUID
 
 import bcrypt
 
 from fastapi import HTTPException, Request, status
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.jwt import create_access_token, create_refresh_token, decode_token
-from app.auth.models import AuditLog, Token, TokenType, User, UserRole, UserStatus
+from app.auth.jwt import access_token_claims, create_access_token, create_refresh_token, decode_token, hash_token
+from app.auth.audit import audit_writer
+from app.auth.models import Token, TokenType, User, UserRole, UserStatus
+from app.auth.rate_limit import login_rate_limiter
 from app.auth.schemas import MasterBootstrap, UserLogin, UserRegister
 from app.config.settings import settings
 from app.utils.email import (
@@ -19,6 +21,7 @@ from app.utils.email import (
     send_approval_notification,
     send_password_reset,
 )
+from app.utils.client_ip import client_ip
 
 logger = logging.getLogger(__name__)
 _BCRYPT_ROUNDS = 12
@@ -32,23 +35,6 @@ def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
-async def _log(
-    db: AsyncSession,
-    action: str,
-    user_id: Optional[UUID] = None,
-    request: Optional[Request] = None,
-    details: Optional[dict] = None,
-) -> None:
-    log = AuditLog(
-        user_id=user_id,
-        action=action,
-        ip=request.client.host if request and request.client else None,
-        user_agent=request.headers.get("user-agent") if request else None,
-        details=details,
-    )
-    db.add(log)
-
-
 async def register_user(db: AsyncSession, data: UserRegister, request: Request) -> User:
     existing = await db.execute(select(User).where(User.email == data.email))
     if existing.scalar_one_or_none():
@@ -62,27 +48,37 @@ async def register_user(db: AsyncSession, data: UserRegister, request: Request)
         status=UserStatus.PENDING,
     )
     db.add(user)
-    await db.flush()
-    await _log(db, "REGISTER", user.id, request, {"method": "email"})
     await db.commit()
     await db.refresh(user)
+    audit_writer.record("REGISTER", user.id, request, {"method": "email"})
 
     if settings.ADMIN_MASTER_EMAIL:
-        try:
-            await send_approval_notification(settings.ADMIN_MASTER_EMAIL, user.name, user.email)
-        except Exception as exc:
-            logger.warning("Falha ao notificar admin: %s", exc)
+        await send_approval_notification(settings.ADMIN_MASTER_EMAIL, user.name, user.email)
 
     return user
 
 
 async def login_user(db: AsyncSession, data: UserLogin, request: Request) -> dict:
-    result = await db.execute(select(User).where(User.email == data.email, User.is_active == True))
+    # Rate limit em memória — rejeita antes de qualquer query ou bcrypt
+    ip = client_ip(request)
+    retry_after = await login_rate_limiter.retry_after(ip, data.email)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Muitas tentativas de login. Tente novamente mais tarde.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    result = await db.execute(
+        select(User)
+        .where(User.email == data.email, User.is_active == True)
+        .options(selectinload(User.tenants))
+    )
     user = result.scalar_one_or_none()
 
     if not user or not user.password_hash:
-        await _log(db, "LOGIN_FAILED", None, request, {"email": data.email})
-        await db.commit()
+        await login_rate_limiter.register_failure(data.email)
+        audit_writer.record("LOGIN_FAILED", None, request, {"email": data.email})
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
     now = datetime.now(timezone.utc)
@@ -91,44 +87,50 @@ async def login_user(db: AsyncSession, data: UserLogin, request: Request) -> dic
         raise HTTPException(status_code=429, detail=f"Conta bloqueada até {user.locked_until.isoformat()}")
 
     if not verify_password(data.password, user.password_hash):
+        await login_rate_limiter.register_failure(data.email)
         user.login_attempts += 1
         if user.login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
             user.locked_until = datetime.utcnow() + timedelta(minutes=settings.LOCK_DURATION_MINUTES)
-            await _log(db, "ACCOUNT_LOCKED", user.id, request)
+            audit_writer.record("ACCOUNT_LOCKED", user.id, request)
         await db.commit()
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
     if user.status != UserStatus.APPROVED:
-        await _log(db, "LOGIN_BLOCKED", user.id, request, {"status": user.status.value})
-        await db.commit()
+        audit_writer.record("LOGIN_BLOCKED", user.id, request, {"status": user.status.value})
         raise HTTPException(status_code=403, detail="Conta aguardando aprovação ou bloqueada")
 
-    user.login_attempts = 0
-    user.locked_until = None
-
-    token_payload = {
-        "sub": str(user.id),
-        "role": user.role.value,
-        "tenant_id": str(user.tenant_id) if user.tenant_id else None,
-    }
+    await login_rate_limiter.register_success(data.email)
+    if user.login_attempts or user.locked_until:
+        # Contadores de login não entram nas claims: mantém updated_at (a versão do
+        # usuário em app/auth/revocation.py) — senão o onupdate o empurraria para
+        # depois do `iat` e o token nasceria recusado pelo modo stateless
+        await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(login_attempts=0, locked_until=None, updated_at=User.updated_at)
+        )
+
+    token_payload = access_token_claims(user)
     access_token = create_access_token(token_payload)
     refresh_token_str = create_refresh_token(token_payload)
 
     db.add(Token(
         user_id=user.id,
         type=TokenType.REFRESH,
-        token=refresh_token_str,
+        token_hash=hash_token(refresh_token_str),
         expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     ))
-    await _log(db, "LOGIN", user.id, request)
     await db.commit()
+    audit_writer.record("LOGIN", user.id, request)
 
     return {"access_token": access_token, "refresh_token": refresh_token_str, "token_type": "bearer"}
 
 
 async def refresh_tokens(db: AsyncSession, refresh_token_str: str) -> dict:
     result = await db.execute(
-        select(Token).where(Token.token == refresh_token_str, Token.type == TokenType.REFRESH, Token.used == False)
+        select(Token).where(
+            Token.token_hash == hash_token(refresh_token_str), Token.type == TokenType.REFRESH, Token.used == False,
+        )
     )
     token_obj = result.scalar_one_or_none()
 
@@ -145,23 +147,21 @@ async def refresh_tokens(db: AsyncSession, refresh_token_str: str) -> dict:
 
     token_obj.used = True
 
-    user_result = await db.execute(select(User).where(User.id == payload["sub"]))
+    user_result = await db.execute(
+        select(User).where(User.id == payload["sub"]).options(selectinload(User.tenants))
+    )
     user = user_result.scalar_one_or_none()
     if not user or user.status != UserStatus.APPROVED:
         raise HTTPException(status_code=401, detail="Usuário inativo")
 
-    token_payload = {
-        "sub": str(user.id),
-        "role": user.role.value,
-        "tenant_id": str(user.tenant_id) if user.tenant_id else None,
-    }
+    token_payload = access_token_claims(user)
     new_access = create_access_token(token_payload)
     new_refresh = create_refresh_token(token_payload)
 
     db.add(Token(
         user_id=user.id,
         type=TokenType.REFRESH,
-        token=new_refresh,
+        token_hash=hash_token(new_refresh),
         expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     ))
     await db.commit()
@@ -169,12 +169,12 @@ async def refresh_tokens(db: AsyncSession, refresh_token_str: str) -> dict:
 
 
 async def logout_user(db: AsyncSession, refresh_token_str: str, user: User, request: Request) -> None:
-    result = await db.execute(select(Token).where(Token.token == refresh_token_str, Token.user_id == user.id))
+    result = await db.execute(select(Token).where(Token.token_hash == hash_token(refresh_token_str), Token.user_id == user.id))
     token_obj = result.scalar_one_or_none()
     if token_obj:
         token_obj.used = True
-    await _log(db, "LOGOUT", user.id, request)
     await db.commit()
+    audit_writer.record("LOGOUT", user.id, request)
 
 
 async def forgot_password(db: AsyncSession, email: str) -> None:
@@ -187,20 +187,19 @@ async def forgot_password(db: AsyncSession, email: str) -> None:
     db.add(Token(
         user_id=user.id,
         type=TokenType.RESET_PASSWORD,
-        token=reset_token,
+        token_hash=hash_token(reset_token),
         expires_at=datetime.utcnow() + timedelta(minutes=15),
     ))
     await db.commit()
 
-    try:
-        await send_password_reset(user.email, user.name, reset_token)
-    except Exception as exc:
-        logger.error("Falha ao enviar e-mail de reset: %s", exc)
+    await send_password_reset(user.email, user.name, reset_token)
 
 
 async def reset_password(db: AsyncSession, token_str: str, new_password: str) -> None:
     result = await db.execute(
-        select(Token).where(Token.token == token_str, Token.type == TokenType.RESET_PASSWORD, Token.used == False)
+        select(Token).where(
+            Token.token_hash == hash_token(token_str), Token.type == TokenType.RESET_PASSWORD, Token.used == False,
+        )
     )
     token_obj = result.scalar_one_or_none()
     if not token_obj:
@@ -251,10 +250,9 @@ async def bootstrap_master(db: AsyncSession, data: MasterBootstrap, request: Req
         status=UserStatus.APPROVED,
     )
     db.add(master)
-    await db.flush()
-    await _log(db, "MASTER_BOOTSTRAP", master.id, request)
     await db.commit()
     await db.refresh(master)
+    audit_writer.record("MASTER_BOOTSTRAP", master.id, request)
 
     logger.info("MASTER criado com sucesso: %s", master.email)
     return master
@@ -0,0 +1,140 @@
+"""
+Manutenção da tabela `tokens`.
+
+A tabela é particionada por mês de `expires_at` (migration 014). Periodicamente:
+  1. garante as partições dos próximos meses (para que nada caia na DEFAULT);
+  2. remove partições cujo mês inteiro já expirou (DROP — sem varrer linhas);
+  3. apaga, em lotes, tokens usados/expirados das partições ainda vivas.
+
+Assim o índice de `token_hash` consultado por refresh/logout/reset fica pequeno.
+
+Ciclo de vida: `start()` e `stop()` no lifespan (app/main.py).
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config.settings import settings
+from app.database.connection import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_RE = re.compile(r"^tokens_p(\d{4})(\d{2})$")
+
+
+def _add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    return f"tokens_p{month_start:%Y%m}"
+
+
+class TokenSweeper:
+    def __init__(self, interval: float, batch_size: int, months_ahead: int):
+        self._interval = interval
+        self._batch_size = batch_size
+        self._months_ahead = months_ahead
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self.deleted = 0
+        self.dropped_partitions = 0
+        self.last_run: Optional[datetime] = None
+
+    def stats(self) -> dict:
+        return {
+            "deleted": self.deleted,
+            "dropped_partitions": self.dropped_partitions,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run(), name="token-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.sweep()
+            except Exception as exc:
+                logger.error("Falha na limpeza de tokens: %s", exc)
+            try:
+                await asyncio.wait_for(self._stop.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sweep(self) -> None:
+        now = datetime.utcnow()
+        await self._ensure_partitions(now.date())
+        await self._drop_expired_partitions(now.date())
+        await self._delete_dead_rows(now)
+        self.last_run = now
+
+    async def _ensure_partitions(self, today: date) -> None:
+        current = today.replace(day=1)
+        async with AsyncSessionLocal() as session:
+            for i in range(self._months_ahead + 1):
+                start = _add_months(current, i)
+                end = _add_months(start, 1)
+                await session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF tokens "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+            await session.commit()
+
+    async def _drop_expired_partitions(self, today: date) -> None:
+        current = today.replace(day=1)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(text("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'tokens'::regclass
+            """))
+            for (name,) in result.all():
+                m = _PARTITION_RE.match(name)
+                if not m:
+                    continue  # DEFAULT e partições fora do padrão ficam para a limpeza por linha
+                month_start = date(int(m.group(1)), int(m.group(2)), 1)
+                if _add_months(month_start, 1) <= current:
+                    await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                    self.dropped_partitions += 1
+                    logger.info("Partição de tokens removida: %s", name)
+            await session.commit()
+
+    async def _delete_dead_rows(self, now: datetime) -> None:
+        while not self._stop.is_set():
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(text("""
+                    DELETE FROM tokens
+                    WHERE id IN (
+                        SELECT id FROM tokens
+                        WHERE used OR expires_at < :now
+                        LIMIT :batch
+                    )
+                """), {"now": now, "batch": self._batch_size})
+                await session.commit()
+            self.deleted += result.rowcount
+            if result.rowcount < self._batch_size:
+                return
+
+
+token_sweeper = TokenSweeper(
+    interval=settings.TOKEN_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.TOKEN_SWEEP_BATCH_SIZE,
+    months_ahead=settings.TOKEN_PARTITION_MONTHS_AHEAD,
+)
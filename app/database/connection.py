@@ -1,5 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.config.settings import settings
+from app.database.pool import InstrumentedPool, pool_metrics, read_pool_metrics
+from app.database.routing import prefer_primary
 
 # TODO:UPGRADE [PRIORIDADE: ALTA]
 # Motivo: Banco PostgreSQL Free Tier expira em 30 dias após criação no Render
@@ -19,21 +21,41 @@ from app.config.settings import settings
 # Custo estimado: $6/mês
 # Métrica de alerta: Alertar ao atingir DB_STORAGE_ALERT_MB (padrão: 800 MB)
 
-def _get_db_url() -> str:
-    url = settings.DATABASE_URL
+def _get_db_url(url: str) -> str:
     if url.startswith("postgresql://"):
         url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
     return url
 
 
-engine = create_async_engine(
-    _get_db_url(),
-    pool_size=5,        # Conservativo para Free Tier (max 100 conexões)
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-    echo=settings.ENVIRONMENT == "development",
+def _create_engine(url: str, **kwargs):
+    return create_async_engine(
+        _get_db_url(url),
+        poolclass=InstrumentedPool,
+        pool_size=5,        # Conservativo para Free Tier (max 100 conexões)
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        echo=settings.ENVIRONMENT == "development",
+        **kwargs,
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
+pool_metrics.instrument(engine)
+
+# Réplica de leitura (opcional — ver app/database/routing.py). Transações
+# somente leitura por padrão: escrita acidental em endpoint de leitura falha
+# na hora, mesmo quando a URL aponta para o próprio principal (teste local).
+read_engine = (
+    _create_engine(
+        settings.DATABASE_READ_URL,
+        connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+    )
+    if settings.DATABASE_READ_URL
+    else None
 )
+if read_engine is not None:
+    read_pool_metrics.instrument(read_engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -41,10 +63,42 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+ReadSessionLocal = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
 
 async def get_db():
+    """
+    Sessão do request. A conexão só sai do pool na primeira consulta (a
+    AsyncSession é preguiçosa) e fica com a sessão até o fim da transação —
+    commit, rollback, release_db ou o fechamento no fim do request.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def release_db(session: AsyncSession) -> None:
+    """
+    Devolve a conexão da sessão ao pool antes de uma espera longa (chamada HTTP
+    externa, por exemplo). Encerra a transação corrente com commit — grava o
+    que estiver pendente — sem expirar os objetos carregados (expire_on_commit
+    =False); a próxima consulta da sessão pega outra conexão do pool.
+    """
+    if session.in_transaction():
+        await session.commit()
+
+
+def read_session() -> AsyncSession:
+    """
+    Sessão de leitura fora de dependencies (exportações em streaming): réplica
+    se configurada, principal sem réplica ou logo após uma escrita do cliente.
+    """
+    if ReadSessionLocal is None or prefer_primary():
+        return AsyncSessionLocal()
+    return ReadSessionLocal()
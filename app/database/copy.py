@@ -0,0 +1,30 @@
+"""
+Carga em massa via COPY (protocolo binário do asyncpg) para tabela temporária.
+
+Para milhares de linhas, COPY é ordens de grandeza mais rápido que INSERT com
+VALUES: uma única mensagem de dados, sem parse/plan por lote. A tabela é
+criada ON COMMIT DROP na transação corrente da sessão; o merge com a tabela
+definitiva (INSERT ... SELECT ... ON CONFLICT) é feito pelo chamador, na mesma
+transação.
+"""
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def copy_to_temp_table(
+    db: AsyncSession,
+    tabela: str,
+    colunas: dict[str, str],
+    registros: Iterable[tuple],
+) -> None:
+    """`colunas`: nome → tipo SQL, na mesma ordem dos valores de cada registro."""
+    definicao = ", ".join(f"{nome} {tipo}" for nome, tipo in colunas.items())
+    await db.execute(text(f"CREATE TEMP TABLE {tabela} ({definicao}) ON COMMIT DROP"))
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    # Mesma conexão asyncpg (e mesma transação) da sessão
+    await raw.driver_connection.copy_records_to_table(
+        tabela, records=registros, columns=list(colunas),
+    )
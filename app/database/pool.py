@@ -0,0 +1,132 @@
+"""
+Métricas do pool de conexões — espera no checkout e tempo de posse.
+
+Com pool_size=5 e max_overflow=10, quinze requisições segurando conexão ao
+mesmo tempo esgotam o pool e a décima sexta espera até pool_timeout. Os dois
+números que mostram isso:
+
+  espera — do pedido de conexão até recebê-la (InstrumentedPool._do_get);
+           inclui abrir conexão nova quando o pool cresce para o overflow;
+  posse  — do checkout ao checkin (eventos do pool), isto é, quanto tempo
+           uma sessão ficou com a conexão: transação aberta + o que o código
+           aguardou no meio dela (HTTP externo, por exemplo).
+
+Esperas acima de DB_POOL_WAIT_WARN_SECONDS e posses acima de
+DB_POOL_HOLD_WARN_SECONDS geram warning no log. Uma instância por engine
+(`pool_metrics` no principal, `read_pool_metrics` na réplica de leitura);
+`stats()` resume tudo (exposto em GET /admin/db/pool).
+"""
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_CHECKOUT_AT = "checkout_at"
+
+
+class PoolMetrics:
+    def __init__(self, name: str, wait_warn: float, hold_warn: float):
+        self._name = name
+        self._wait_warn = wait_warn
+        self._hold_warn = hold_warn
+        self._engine: AsyncEngine | None = None
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.slow_waits = 0
+        self.checkins = 0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self.long_holds = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        if seconds > self._wait_warn:
+            self.slow_waits += 1
+            logger.warning(
+                "Pool de conexões (%s): espera de %.2fs no checkout (%s)",
+                self._name, seconds, self._engine.pool.status() if self._engine else "-",
+            )
+
+    def record_hold(self, seconds: float) -> None:
+        self.checkins += 1
+        self.hold_total += seconds
+        self.hold_max = max(self.hold_max, seconds)
+        if seconds > self._hold_warn:
+            self.long_holds += 1
+            logger.warning("Pool de conexões (%s): conexão retida por %.2fs", self._name, seconds)
+
+    def stats(self) -> dict:
+        pool = self._engine.pool if self._engine else None
+        return {
+            "size": pool.size() if pool else None,
+            "checked_out": pool.checkedout() if pool else None,
+            "overflow": pool.overflow() if pool else None,
+            "checkouts": self.checkouts,
+            "wait_avg_ms": round(1000 * self.wait_total / self.checkouts, 2) if self.checkouts else 0.0,
+            "wait_max_ms": round(1000 * self.wait_max, 2),
+            "slow_waits": self.slow_waits,
+            "hold_avg_ms": round(1000 * self.hold_total / self.checkins, 2) if self.checkins else 0.0,
+            "hold_max_ms": round(1000 * self.hold_max, 2),
+            "long_holds": self.long_holds,
+        }
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        pool = engine.sync_engine.pool
+        pool._metrics = self
+
+        @event.listens_for(pool, "checkout")
+        def _checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info[_CHECKOUT_AT] = time.perf_counter()
+
+        @event.listens_for(pool, "checkin")
+        def _checkin(dbapi_connection, connection_record):
+            inicio = connection_record.info.pop(_CHECKOUT_AT, None)
+            if inicio is not None:
+                self.record_hold(time.perf_counter() - inicio)
+
+
+pool_metrics = PoolMetrics(
+    "principal",
+    wait_warn=settings.DB_POOL_WAIT_WARN_SECONDS,
+    hold_warn=settings.DB_POOL_HOLD_WARN_SECONDS,
+)
+read_pool_metrics = PoolMetrics(
+    "réplica",
+    wait_warn=settings.DB_POOL_WAIT_WARN_SECONDS,
+    hold_warn=settings.DB_POOL_HOLD_WARN_SECONDS,
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede a espera de cada checkout (PoolMetrics.instrument)."""
+
+    _metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self._metrics is not None:
+                self._metrics.record_wait(time.perf_counter() - inicio)
+
+    def recreate(self):
+        # dispose() troca o pool por um novo; os eventos vão junto, as métricas também
+        pool = super().recreate()
+        pool._metrics = self._metrics
+        return pool
+
+
+# O SQLAlchemy nomeia o logger do pool pelo módulo da classe; sob "app.*" os
+# INFO internos (dispose, invalidate) apareceriam no log da aplicação
+logging.getLogger(f"{__name__}.{InstrumentedPool.__name__}").setLevel(logging.WARNING)
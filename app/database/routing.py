@@ -0,0 +1,80 @@
+"""
+Roteamento leitura/escrita — réplica de leitura e read-your-writes.
+
+Com DATABASE_READ_URL configurada, listagens, buscas, relatórios e exportações
+(dependency `get_read_db` em app/auth/dependencies.py, `read_session()` em
+app/database/connection.py) leem da réplica; todo o resto continua no banco
+principal. A réplica aplica as escritas com algum atraso, então quem acabou
+de gravar poderia não ver a própria escrita na listagem seguinte.
+
+Read-your-writes: após uma requisição de escrita (POST/PUT/PATCH/DELETE) bem
+sucedida, o middleware grava o cookie `pgo_primary_until` com validade de
+DB_READ_STICKY_SECONDS; enquanto ele valer, as leituras desse cliente vão ao
+principal. O cookie só desvia leituras para o principal — adulterá-lo não dá
+acesso a nada.
+"""
+import math
+import time
+from contextvars import ContextVar
+
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COOKIE = "pgo_primary_until"
+_LEITURA = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_prefer_primary: ContextVar[bool] = ContextVar("db_prefer_primary", default=False)
+
+
+def prefer_primary() -> bool:
+    """True se as leituras desta requisição devem ir ao banco principal."""
+    return _prefer_primary.get()
+
+
+def _sticky(scope: Scope) -> bool:
+    for nome, valor in scope["headers"]:
+        if nome == b"cookie":
+            ate = cookie_parser(valor.decode("latin-1")).get(COOKIE)
+            try:
+                return ate is not None and float(ate) > time.time()
+            except ValueError:
+                return False
+    return False
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI puro: o ContextVar vale para endpoint, dependencies e streaming."""
+
+    def __init__(self, app: ASGIApp, sticky_seconds: float, secure: bool = True):
+        self.app = app
+        self._seconds = sticky_seconds
+        # Front e API em sites diferentes: o cookie só viaja com SameSite=None; Secure
+        self._atributos = "; SameSite=None; Secure" if secure else "; SameSite=Lax"
+
+    def _cookie(self) -> bytes:
+        ate = time.time() + self._seconds
+        return (
+            f"{COOKIE}={ate:.3f}; Max-Age={math.ceil(self._seconds)}; Path=/; HttpOnly{self._atributos}"
+        ).encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _prefer_primary.set(_sticky(scope))
+        try:
+            if scope["method"] in _LEITURA:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_com_cookie(message: Message) -> None:
+                if message["type"] == "http.response.start" and message["status"] < 400:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"set-cookie", self._cookie()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_com_cookie)
+        finally:
+            _prefer_primary.reset(token)
@@ -0,0 +1,49 @@
+"""
+Escritas com RETURNING — o objeto gravado volta na mesma ida ao banco.
+
+O caminho antigo (commit → refresh → novo SELECT com selectinload "para evitar
+MissingGreenlet") custava três idas ao banco para devolver o que acabara de
+ser gravado. Aqui o INSERT/UPDATE ... RETURNING já traz a linha como objeto
+ORM e os relacionamentos many-to-one são preenchidos com os objetos que o
+service já carregou para validar (classe, unidade, serviço...) via
+set_committed_value — sem marcar nada como alterado e sem lazy load na
+serialização.
+"""
+from typing import Any, Optional, TypeVar
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+T = TypeVar("T")
+
+
+def attach(obj: T, **related: Any) -> T:
+    """Preenche relacionamentos já conhecidos sem consultar o banco."""
+    for name, value in related.items():
+        set_committed_value(obj, name, value)
+    return obj
+
+
+async def insert_returning(db: AsyncSession, model: type[T], values: dict, **related: Any) -> T:
+    obj = (await db.execute(insert(model).values(**values).returning(model))).scalar_one()
+    return attach(obj, **related)
+
+
+async def update_returning(
+    db: AsyncSession,
+    model: type[T],
+    where: list,
+    values: dict,
+    **related: Any,
+) -> Optional[T]:
+    """UPDATE ... WHERE ... RETURNING; None se nenhuma linha casou com `where`."""
+    stmt = (
+        update(model)
+        .where(*where)
+        .values(**values)
+        .returning(model)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    obj = (await db.execute(stmt)).scalar_one_or_none()
+    return attach(obj, **related) if obj is not None else None
@@ -4,8 +4,15 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.auth.audit import audit_writer
+from app.auth.revocation import user_versions
+from app.auth.token_sweeper import token_sweeper
 from app.config.logging import setup_logging
 from app.config.settings import settings
+from app.database.routing import ReadYourWritesMiddleware
+from app.modules.payments.overdue import overdue_sweeper
+from app.tenants.stats import stats_reconciler
+from app.utils.email import email_outbox
 
 # TODO:UPGRADE [PRIORIDADE: MÉDIA]
 # Motivo: Free Tier hiberna após 15 minutos sem requisições — cold start de até 60s
@@ -20,8 +27,21 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Teleradar PGO API iniciando... ambiente=%s", settings.ENVIRONMENT)
+    await audit_writer.start()
+    await email_outbox.start()
+    await token_sweeper.start()
+    await overdue_sweeper.start()
+    await stats_reconciler.start()
+    if settings.AUTH_STATELESS_ACCESS_TOKENS:
+        await user_versions.start()
     yield
     logger.info("Teleradar PGO API encerrando...")
+    await user_versions.stop()
+    await stats_reconciler.stop()
+    await overdue_sweeper.stop()
+    await token_sweeper.stop()
+    await email_outbox.stop()
+    await audit_writer.stop()
 
 
 app = FastAPI(
@@ -41,6 +61,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.DATABASE_READ_URL and settings.DB_READ_STICKY_SECONDS > 0:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        sticky_seconds=settings.DB_READ_STICKY_SECONDS,
+        secure=settings.ENVIRONMENT != "development",
+    )
+
 from app.auth.router import router as auth_router
 from app.admin.router import router as admin_router
 from app.users.router import router as users_router
@@ -2,8 +2,12 @@ from fastapi import APIRouter
 
 from app.modules.catalogo.lpu.router import router as lpu_router
 from app.modules.catalogo.materiais.router import router as materiais_router
+from app.modules.catalogo.precos.router import router as precos_router
+from app.modules.catalogo.snapshot.router import router as snapshot_router
 
 router = APIRouter()
 
 router.include_router(lpu_router, prefix="/lpu")
 router.include_router(materiais_router, prefix="/materiais")
+router.include_router(snapshot_router, prefix="/snapshot")
+router.include_router(precos_router, prefix="/precos")
@@ -0,0 +1,221 @@
+"""
+Leitura de planilhas (CSV/XLSX) para importação em massa.
+
+Usada na importação de itens de LPU e na carga do catálogo (serviços e
+materiais — colunas em lpu/schemas.ServicoImportRow e
+materiais/schemas.MaterialImportRow). Cabeçalho na primeira linha, sem
+diferenciar maiúsculas; colunas de itens de LPU:
+  servico_codigo (ou codigo) | servico_id — identifica o serviço
+  valor_unitario                           — obrigatório
+  valor_classe                             — opcional
+
+Cada linha vira (número da linha no arquivo, {coluna: valor}); linhas em branco
+são ignoradas. `iter_csv`/`iter_xlsx` leem o arquivo sob demanda (sem carregar
+a planilha inteira na memória); `ler_csv`/`ler_xlsx` devolvem a lista já
+limitada a MAX_LINHAS. A validação fica nos services.
+"""
+import codecs
+import csv
+import io
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from fastapi import HTTPException, UploadFile
+from openpyxl import load_workbook
+from pydantic import ValidationError
+
+# Limite por importação de itens de LPU — mantém a transação e a resposta de erros em tamanho razoável
+MAX_LINHAS = 5_000
+
+# Erros devolvidos na resposta de uma importação (o total vai em `rejeitados`)
+MAX_ERROS = 1_000
+
+_ALIASES = {"codigo": "servico_codigo"}
+
+# Carga do catálogo (serviços/materiais) — planilhas de onboarding são grandes
+MAX_LINHAS_CATALOGO = 200_000
+ALIASES_CATALOGO = {
+    "código": "codigo",
+    "descrição": "descricao",
+    "classe_nome": "classe",
+    "sigla": "unidade",
+    "unidade_sigla": "unidade",
+}
+# Colunas de texto do catálogo: "Cabo 1,5mm" não é número
+TEXTO_CATALOGO = frozenset({"codigo", "atividade", "descricao", "classe", "unidade"})
+
+Linha = tuple[int, dict]
+
+
+def _coluna(nome, aliases: dict) -> str:
+    chave = str(nome or "").strip().lower()
+    return aliases.get(chave, chave)
+
+
+def _valor(valor):
+    if isinstance(valor, str):
+        valor = valor.strip()
+        if not valor:
+            return None
+        # Formato brasileiro: 1.234,56 → 1234.56
+        if "," in valor:
+            valor = valor.replace(".", "").replace(",", ".")
+    return valor
+
+
+def _texto(valor):
+    # Colunas de texto (código, descrição): sem a conversão decimal de _valor
+    if isinstance(valor, str):
+        return valor.strip() or None
+    return valor
+
+
+def _limitar(linhas: Iterator[Linha], max_linhas: int) -> Iterator[Linha]:
+    for n, linha in enumerate(linhas, start=1):
+        if n > max_linhas:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Arquivo excede o limite de {max_linhas} linhas por importação.",
+            )
+        yield linha
+
+
+def _encoding(arquivo: BinaryIO) -> str:
+    inicio = arquivo.read(64 * 1024)
+    arquivo.seek(0)
+    try:
+        # Um caractere multibyte cortado no fim do bloco não conta como erro
+        codecs.getincrementaldecoder("utf-8")().decode(inicio, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def iter_csv(
+    arquivo: BinaryIO,
+    aliases: Optional[dict] = None,
+    texto: frozenset = frozenset(),
+) -> Iterator[Linha]:
+    """Linhas do CSV sob demanda; colunas em `texto` não passam pela conversão decimal."""
+    aliases = _ALIASES if aliases is None else aliases
+    stream = io.TextIOWrapper(arquivo, encoding=_encoding(arquivo), newline="")
+    try:
+        amostra = stream.read(4096)
+        stream.seek(0)
+        try:
+            dialeto = csv.Sniffer().sniff(amostra, delimiters=";,\t")
+        except csv.Error:
+            dialeto = csv.excel
+
+        leitor = csv.reader(stream, dialeto)
+        cabecalho = [_coluna(c, aliases) for c in next(leitor, [])]
+        for numero, valores in enumerate(leitor, start=2):
+            if not any(v.strip() for v in valores):
+                continue
+            yield numero, {
+                c: (_texto(v) if c in texto else _valor(v))
+                for c, v in zip(cabecalho, valores) if c
+            }
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=422, detail="Arquivo CSV com codificação inválida (use UTF-8).")
+    finally:
+        # Devolve o arquivo ao chamador (UploadFile fecha o seu)
+        stream.detach()
+
+
+def iter_xlsx(
+    arquivo: BinaryIO,
+    aliases: Optional[dict] = None,
+    texto: frozenset = frozenset(),
+) -> Iterator[Linha]:
+    """Linhas da primeira aba sob demanda (openpyxl em modo read-only)."""
+    aliases = _ALIASES if aliases is None else aliases
+    try:
+        wb = load_workbook(arquivo, read_only=True, data_only=True)
+    except Exception:
+        raise HTTPException(status_code=422, detail="Arquivo XLSX inválido.")
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        cabecalho = [_coluna(c, aliases) for c in next(rows, ())]
+        for numero, valores in enumerate(rows, start=2):
+            if all(v is None or str(v).strip() == "" for v in valores):
+                continue
+            yield numero, {
+                c: (_texto(v) if c in texto else _valor(v))
+                for c, v in zip(cabecalho, valores) if c
+            }
+    finally:
+        wb.close()
+
+
+def abrir_planilha(
+    arquivo: UploadFile,
+    max_linhas: int,
+    aliases: Optional[dict] = None,
+    texto: frozenset = frozenset(),
+) -> Iterator[Linha]:
+    """Escolhe o leitor pelo nome/tipo do upload (415 se não for CSV nem XLSX)."""
+    nome = (arquivo.filename or "").lower()
+    if nome.endswith(".csv") or arquivo.content_type == "text/csv":
+        linhas = iter_csv(arquivo.file, aliases, texto)
+    elif nome.endswith(".xlsx"):
+        linhas = iter_xlsx(arquivo.file, aliases, texto)
+    else:
+        raise HTTPException(status_code=415, detail="Formato não suportado. Envie um arquivo CSV ou XLSX.")
+    return _limitar(linhas, max_linhas)
+
+
+def ler_csv(conteudo: bytes) -> list[Linha]:
+    return list(_limitar(iter_csv(io.BytesIO(conteudo)), MAX_LINHAS))
+
+
+def ler_xlsx(conteudo: bytes) -> list[Linha]:
+    return list(_limitar(iter_xlsx(io.BytesIO(conteudo)), MAX_LINHAS))
+
+
+def erro_validacao(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in exc.errors()
+    )
+
+
+def preparar(
+    linhas: Iterator[Linha],
+    schema,
+    registro: Callable[[object], "tuple | str"],
+) -> dict:
+    """
+    Valida as linhas de uma carga do catálogo, sem tocar no banco.
+
+    Cada linha passa por `schema` e por `registro(row)`, que devolve a tupla
+    para o COPY ou a mensagem de erro. Códigos repetidos no arquivo são
+    rejeitados (vale a primeira ocorrência). Consome o iterador — rodar em
+    thread (asyncio.to_thread) para não travar o event loop em arquivos grandes.
+    """
+    registros: list[tuple] = []
+    erros: list[dict] = []
+    vistos: dict[str, int] = {}
+    total = rejeitados = 0
+
+    for linha, dados in linhas:
+        total += 1
+        codigo = dados.get("codigo")
+        try:
+            row = schema.model_validate(dados)
+        except ValidationError as exc:
+            resultado = erro_validacao(exc)
+        else:
+            codigo = row.codigo
+            if codigo in vistos:
+                resultado = f"Código repetido (já informado na linha {vistos[codigo]})."
+            else:
+                resultado = registro(row)
+        if isinstance(resultado, tuple):
+            vistos[codigo] = linha
+            registros.append(resultado)
+            continue
+        rejeitados += 1
+        if len(erros) < MAX_ERROS:
+            erros.append({"linha": linha, "codigo": None if codigo is None else str(codigo), "erro": resultado})
+
+    return {"total": total, "registros": registros, "rejeitados": rejeitados, "erros": erros}
@@ -8,10 +8,15 @@ Endpoints:
     /classes       → CRUD de Classe
     /unidades      → CRUD de Unidade
     /servicos      → CRUD de Serviço (sem preço)
+    /servicos/search → busca por código/atividade (pickers)
+    /servicos/import → carga em massa (arquivo CSV/XLSX)
 
   Tenant-scoped:
     /lpus          → CRUD de LPU
     /lpus/{id}/itens → CRUD de Itens da LPU (onde o preço vive)
+    /lpus/{id}/itens/bulk   → importação em massa (JSON)
+    /lpus/{id}/itens/import → importação em massa (arquivo CSV/XLSX)
+    /lpus/{id}/itens/export → tabela de preços (CSV/XLSX/NDJSON, streaming)
 
 Controle de acesso:
   - Leitura: STAFF, MANAGER, ADMIN, MASTER
@@ -23,18 +28,23 @@ Resolução de tenant:
   Usuários com tenant_id próprio têm o tenant resolvido automaticamente.
   MASTER sem tenant deve informar ?tenant_id= na query.
 """
+import asyncio
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import UserRole
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
-from app.modules.catalogo.lpu import schemas, service
+from app.modules.catalogo.lpu import importacao, schemas, service
 from app.rbac.dependencies import require_roles
 from app.rbac.tenant import TenantContext, tenant_context
+from app.utils.pagination import PageParams, page_params
+from app.utils.export import ExportFormat, export_response
 from app.utils.responses import success
+from app.utils.search import search_limit
 
 router = APIRouter()
 
@@ -63,18 +73,15 @@ async def create_classe(
 
 @router.get("/classes", tags=["LPU: Classes"])
 async def list_classes(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     ativa: Optional[bool] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     _=Depends(_staff_up),
 ):
-    classes, total = await service.list_classes(db, page, per_page, ativa)
+    page = await service.list_classes(db, params, ativa)
     return success("Lista de classes.", {
-        "results": [schemas.ClasseResponse.model_validate(c) for c in classes],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.ClasseResponse.model_validate(c) for c in page.items],
+        **page.meta(),
     })
 
 
@@ -124,18 +131,15 @@ async def create_unidade(
 
 @router.get("/unidades", tags=["LPU: Unidades"])
 async def list_unidades(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     ativa: Optional[bool] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     _=Depends(_staff_up),
 ):
-    unidades, total = await service.list_unidades(db, page, per_page, ativa)
+    page = await service.list_unidades(db, params, ativa)
     return success("Lista de unidades.", {
-        "results": [schemas.UnidadeResponse.model_validate(u) for u in unidades],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.UnidadeResponse.model_validate(u) for u in page.items],
+        **page.meta(),
     })
 
 
@@ -183,21 +187,48 @@ async def create_servico(
     return success("Serviço criado.", schemas.ServicoResponse.model_validate(servico))
 
 
+@router.post("/servicos/import", tags=["LPU: Serviços"])
+async def import_servicos(
+    arquivo: UploadFile = File(..., description="Planilha CSV ou XLSX (cabeçalho na 1ª linha)."),
+    db: AsyncSession = Depends(get_db),
+    _=Depends(_admin_up),
+):
+    linhas = importacao.abrir_planilha(
+        arquivo, importacao.MAX_LINHAS_CATALOGO, importacao.ALIASES_CATALOGO, importacao.TEXTO_CATALOGO,
+    )
+    result = await service.import_servicos(db, linhas)
+    return success("Carga de serviços concluída.", schemas.CatalogoImportResult(**result))
+
+
 @router.get("/servicos", tags=["LPU: Serviços"])
 async def list_servicos(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     ativo: Optional[bool] = None,
     classe_id: Optional[UUID] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     _=Depends(_staff_up),
 ):
-    servicos, total = await service.list_servicos(db, page, per_page, ativo, classe_id)
+    page = await service.list_servicos(db, params, ativo, classe_id)
     return success("Lista de serviços.", {
-        "results": [schemas.ServicoResponse.model_validate(s) for s in servicos],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.ServicoResponse.model_validate(s) for s in page.items],
+        **page.meta(),
+    })
+
+
+@router.get("/servicos/search", tags=["LPU: Serviços"])
+async def search_servicos(
+    q: str = Query(..., min_length=1, max_length=100),
+    ativo: Optional[bool] = None,
+    limit: int = Depends(search_limit),
+    db: AsyncSession = Depends(get_read_db),
+    _=Depends(_staff_up),
+):
+    hits = await service.search_servicos(db, q, limit, ativo)
+    return success("Busca de serviços.", {
+        "q": q,
+        "results": [
+            {**schemas.ServicoResponse.model_validate(s).model_dump(), "score": score} for s, score in hits
+        ],
     })
 
 
@@ -247,19 +278,16 @@ async def create_lpu(
 
 @router.get("/lpus", tags=["LPU"])
 async def list_lpus(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     parceiro_id: Optional[UUID] = None,
     ativa: Optional[bool] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     ctx: TenantContext = Depends(_staff_tenant),
 ):
-    lpus, total = await service.list_lpus(db, ctx.tenant_id, page, per_page, parceiro_id, ativa)
+    page = await service.list_lpus(db, ctx.tenant_id, params, parceiro_id, ativa)
     return success("Lista de LPUs.", {
-        "results": [schemas.LPUResponse.model_validate(l) for l in lpus],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.LPUResponse.model_validate(l) for l in page.items],
+        **page.meta(),
     })
 
 
@@ -308,20 +336,60 @@ async def add_item_lpu(
     return success("Item adicionado à LPU.", schemas.LPUItemResponse.model_validate(item))
 
 
+@router.post("/lpus/{lpu_id}/itens/bulk", tags=["LPU: Itens"])
+async def bulk_upsert_itens_lpu(
+    lpu_id: UUID,
+    data: schemas.LPUItemBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(_admin_tenant),
+):
+    linhas = list(enumerate(data.itens, start=1))
+    result = await service.bulk_upsert_itens_lpu(db, ctx.tenant_id, lpu_id, linhas)
+    return success("Importação de itens concluída.", schemas.LPUItemBulkResult(**result))
+
+
+@router.post("/lpus/{lpu_id}/itens/import", tags=["LPU: Itens"])
+async def import_itens_lpu(
+    lpu_id: UUID,
+    arquivo: UploadFile = File(..., description="Planilha CSV ou XLSX (cabeçalho na 1ª linha)."),
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(_admin_tenant),
+):
+    nome = (arquivo.filename or "").lower()
+    conteudo = await arquivo.read()
+    if nome.endswith(".csv") or arquivo.content_type == "text/csv":
+        linhas = importacao.ler_csv(conteudo)
+    elif nome.endswith(".xlsx"):
+        linhas = await asyncio.to_thread(importacao.ler_xlsx, conteudo)
+    else:
+        raise HTTPException(status_code=415, detail="Formato não suportado. Envie um arquivo CSV ou XLSX.")
+    result = await service.bulk_upsert_itens_lpu(db, ctx.tenant_id, lpu_id, linhas)
+    return success("Importação de itens concluída.", schemas.LPUItemBulkResult(**result))
+
+
+@router.get("/lpus/{lpu_id}/itens/export", tags=["LPU: Itens"])
+async def export_itens_lpu(
+    lpu_id: UUID,
+    formato: ExportFormat = ExportFormat.CSV,
+    db: AsyncSession = Depends(get_read_db),
+    ctx: TenantContext = Depends(_staff_tenant),
+):
+    # Valida tenant/404 antes de começar a resposta (a exportação usa sessão própria)
+    lpu = await service.get_lpu(db, ctx.tenant_id, lpu_id)
+    return export_response(service.export_itens_lpu_query(lpu.id), formato, f"lpu-{lpu.id}")
+
+
 @router.get("/lpus/{lpu_id}/itens", tags=["LPU: Itens"])
 async def list_itens_lpu(
     lpu_id: UUID,
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     ctx: TenantContext = Depends(_staff_tenant),
 ):
-    itens, total = await service.list_itens_lpu(db, ctx.tenant_id, lpu_id, page, per_page)
+    page = await service.list_itens_lpu(db, ctx.tenant_id, lpu_id, params)
     return success("Itens da LPU.", {
-        "results": [schemas.LPUItemResponse.model_validate(i) for i in itens],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.LPUItemResponse.model_validate(i) for i in page.items],
+        **page.meta(),
     })
 
 
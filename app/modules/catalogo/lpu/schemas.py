@@ -5,15 +5,17 @@ Organização:
   ClasseCreate / ClasseUpdate / ClasseResponse
   UnidadeCreate / UnidadeUpdate / UnidadeResponse
   ServicoCreate / ServicoUpdate / ServicoResponse (sem campo de preço)
+  ServicoImportRow / CatalogoImportResult (carga do catálogo via planilha)
   LPUCreate / LPUUpdate / LPUResponse
   LPUItemCreate / LPUItemUpdate / LPUItemResponse
+  LPUItemImportRow / LPUItemBulkRequest / LPUItemBulkResult (importação em massa)
 """
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 # ---------------------------------------------------------------------------
@@ -112,6 +114,47 @@ class ServicoResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+def texto_planilha(value):
+    # Planilhas entregam códigos numéricos como int/float
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip() if value is not None else None
+
+
+def ativo_planilha(value):
+    # Vazio → ativo; aceita também sim/não além de true/false/1/0
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return {"sim": True, "s": True, "não": False, "nao": False}.get(value.strip().lower(), value)
+    return value
+
+
+class ServicoImportRow(BaseModel):
+    """
+    Linha da carga de serviços. Classe pelo nome (ou classe_id) e unidade pela
+    sigla/nome (ou unidade_id); serviço com código já existente é atualizado.
+    """
+    codigo: str = Field(..., min_length=1, max_length=50)
+    atividade: str = Field(..., min_length=2, max_length=255)
+    classe: Optional[str] = None
+    classe_id: Optional[UUID] = None
+    unidade: Optional[str] = None
+    unidade_id: Optional[UUID] = None
+    ativo: bool = True
+
+    _codigo_texto = field_validator("codigo", "classe", "unidade", mode="before")(texto_planilha)
+    _ativo = field_validator("ativo", mode="before")(ativo_planilha)
+
+    @model_validator(mode="after")
+    def _referencias_informadas(self):
+        if self.classe_id is None and not self.classe:
+            raise ValueError("Informe classe ou classe_id.")
+        if self.unidade_id is None and not self.unidade:
+            raise ValueError("Informe unidade ou unidade_id.")
+        return self
+
+
 # ---------------------------------------------------------------------------
 # LPU
 # ---------------------------------------------------------------------------
@@ -179,3 +222,68 @@ class LPUItemResponse(BaseModel):
     servico: Optional[ServicoResponse] = None
 
     model_config = {"from_attributes": True}
+
+
+# ---------------------------------------------------------------------------
+# LPU ITEM — importação em massa (JSON / CSV / XLSX)
+# ---------------------------------------------------------------------------
+class LPUItemImportRow(BaseModel):
+    """
+    Linha de importação. O serviço é identificado por servico_id ou
+    servico_codigo; se o serviço já estiver na LPU, os valores são substituídos.
+    """
+    servico_id: Optional[UUID] = None
+    servico_codigo: Optional[str] = Field(None, max_length=50)
+    valor_unitario: Decimal = Field(..., ge=0, decimal_places=2)
+    valor_classe: Optional[Decimal] = Field(None, ge=0, decimal_places=2)
+
+    @field_validator("servico_codigo", mode="before")
+    @classmethod
+    def _codigo_texto(cls, value):
+        # Planilhas entregam códigos numéricos como int/float
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value).strip() if value is not None else None
+
+    @model_validator(mode="after")
+    def _servico_informado(self):
+        if self.servico_id is None and not self.servico_codigo:
+            raise ValueError("Informe servico_id ou servico_codigo.")
+        return self
+
+
+class LPUItemBulkRequest(BaseModel):
+    # Linhas validadas individualmente na service (erros por linha, sem 422 do lote todo)
+    itens: list[dict[str, Any]] = Field(..., min_length=1, max_length=5_000)
+
+
+class LPUItemImportError(BaseModel):
+    linha: int
+    servico: Optional[str] = None
+    erro: str
+
+
+class LPUItemBulkResult(BaseModel):
+    total: int
+    inseridos: int
+    atualizados: int
+    erros: list[LPUItemImportError]
+
+
+# ---------------------------------------------------------------------------
+# CARGA DO CATÁLOGO (serviços / materiais)
+# ---------------------------------------------------------------------------
+class CatalogoImportError(BaseModel):
+    linha: int
+    codigo: Optional[str] = None
+    erro: str
+
+
+class CatalogoImportResult(BaseModel):
+    total: int
+    inseridos: int
+    atualizados: int
+    inalterados: int
+    rejeitados: int
+    # Primeiros erros (até importacao.MAX_ERROS); o total está em `rejeitados`
+    erros: list[CatalogoImportError]
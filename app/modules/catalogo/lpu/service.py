@@ -6,29 +6,43 @@ Responsabilidades:
 - Isolamento de tenant em LPU/LPUItem
 - Validação de integridade referencial (duplicidade, existência de FK)
 - Regra de negócio: Serviço nunca possui preço
+- Importação em massa de itens de LPU (upsert com erros por linha)
+- Carga de serviços via COPY + merge (onboarding do catálogo)
 """
-from typing import Optional
+import asyncio
+from typing import Iterable, Optional
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import select, func
+from pydantic import ValidationError
+from sqlalchemy import Select, func, literal_column, or_, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.database.copy import copy_to_temp_table
+from app.database.writes import attach, insert_returning, update_returning
+from app.modules.catalogo.lpu.importacao import Linha, erro_validacao, preparar
 from app.modules.catalogo.lpu.models import Classe, LPU, LPUItem, Servico, Unidade
+from app.modules.catalogo.precos.service import price_index
+from app.modules.catalogo.snapshot.service import catalog_snapshot
 from app.modules.catalogo.lpu.schemas import (
     ClasseCreate,
     ClasseUpdate,
     LPUCreate,
     LPUItemCreate,
+    LPUItemImportRow,
     LPUItemUpdate,
     LPUUpdate,
     ServicoCreate,
+    ServicoImportRow,
     ServicoUpdate,
     UnidadeCreate,
     UnidadeUpdate,
 )
+from app.utils.pagination import Page, PageParams, paginate
+from app.utils.search import search
 
 
 # ===========================================================================
@@ -38,42 +52,32 @@ from app.modules.catalogo.lpu.schemas import (
 async def create_classe(db: AsyncSession, data: ClasseCreate) -> Classe:
     # Verifica unicidade do nome antes de inserir
     existing = (await db.execute(
-        select(Classe).where(Classe.nome == data.nome)
+        select(Classe.id).where(Classe.nome == data.nome)
     )).scalar_one_or_none()
     if existing:
         raise HTTPException(status_code=409, detail="Classe com este nome já existe.")
 
-    classe = Classe(
-        nome=data.nome,
-        descricao=data.descricao,
-        ativa=data.ativa,
-    )
-    db.add(classe)
+    classe = await insert_returning(db, Classe, {
+        "nome": data.nome,
+        "descricao": data.descricao,
+        "ativa": data.ativa,
+    })
     await db.commit()
-    await db.refresh(classe)
+    catalog_snapshot.invalidate()
     return classe
 
 
 async def list_classes(
     db: AsyncSession,
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     ativa: Optional[bool] = None,
-) -> tuple[list[Classe], int]:
+) -> Page:
     query = select(Classe)
-    count_query = select(func.count()).select_from(Classe)
 
     if ativa is not None:
         query = query.where(Classe.ativa == ativa)
-        count_query = count_query.where(Classe.ativa == ativa)
 
-    total = (await db.execute(count_query)).scalar()
-    classes = (
-        await db.execute(
-            query.order_by(Classe.nome).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return classes, total
+    return await paginate(db, query, [(Classe.nome, False), (Classe.id, False)], params)
 
 
 async def get_classe(db: AsyncSession, classe_id: UUID) -> Classe:
@@ -85,24 +89,21 @@ async def get_classe(db: AsyncSession, classe_id: UUID) -> Classe:
 
 
 async def update_classe(db: AsyncSession, classe_id: UUID, data: ClasseUpdate) -> Classe:
-    classe = await get_classe(db, classe_id)
+    values = data.model_dump(exclude_none=True)
 
-    if data.nome is not None and data.nome != classe.nome:
+    if data.nome is not None:
         existing = (await db.execute(
-            select(Classe).where(Classe.nome == data.nome)
+            select(Classe.id).where(Classe.nome == data.nome, Classe.id != classe_id)
         )).scalar_one_or_none()
         if existing:
             raise HTTPException(status_code=409, detail="Classe com este nome já existe.")
-        classe.nome = data.nome
-
-    if data.descricao is not None:
-        classe.descricao = data.descricao
-    if data.ativa is not None:
-        classe.ativa = data.ativa
 
-    classe.updated_at = datetime.utcnow()
+    values["updated_at"] = datetime.utcnow()
+    classe = await update_returning(db, Classe, [Classe.id == classe_id], values)
+    if not classe:
+        raise HTTPException(status_code=404, detail="Classe não encontrada.")
     await db.commit()
-    await db.refresh(classe)
+    catalog_snapshot.invalidate()
     return classe
 
 
@@ -118,6 +119,7 @@ async def delete_classe(db: AsyncSession, classe_id: UUID) -> None:
         )
     await db.delete(classe)
     await db.commit()
+    catalog_snapshot.invalidate()
 
 
 # ===========================================================================
@@ -126,42 +128,32 @@ async def delete_classe(db: AsyncSession, classe_id: UUID) -> None:
 
 async def create_unidade(db: AsyncSession, data: UnidadeCreate) -> Unidade:
     existing = (await db.execute(
-        select(Unidade).where(Unidade.sigla == data.sigla)
+        select(Unidade.id).where(Unidade.sigla == data.sigla)
     )).scalar_one_or_none()
     if existing:
         raise HTTPException(status_code=409, detail="Unidade com esta sigla já existe.")
 
-    unidade = Unidade(
-        nome=data.nome,
-        sigla=data.sigla,
-        ativa=data.ativa,
-    )
-    db.add(unidade)
+    unidade = await insert_returning(db, Unidade, {
+        "nome": data.nome,
+        "sigla": data.sigla,
+        "ativa": data.ativa,
+    })
     await db.commit()
-    await db.refresh(unidade)
+    catalog_snapshot.invalidate()
     return unidade
 
 
 async def list_unidades(
     db: AsyncSession,
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     ativa: Optional[bool] = None,
-) -> tuple[list[Unidade], int]:
+) -> Page:
     query = select(Unidade)
-    count_query = select(func.count()).select_from(Unidade)
 
     if ativa is not None:
         query = query.where(Unidade.ativa == ativa)
-        count_query = count_query.where(Unidade.ativa == ativa)
 
-    total = (await db.execute(count_query)).scalar()
-    unidades = (
-        await db.execute(
-            query.order_by(Unidade.sigla).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return unidades, total
+    return await paginate(db, query, [(Unidade.sigla, False), (Unidade.id, False)], params)
 
 
 async def get_unidade(db: AsyncSession, unidade_id: UUID) -> Unidade:
@@ -173,24 +165,21 @@ async def get_unidade(db: AsyncSession, unidade_id: UUID) -> Unidade:
 
 
 async def update_unidade(db: AsyncSession, unidade_id: UUID, data: UnidadeUpdate) -> Unidade:
-    unidade = await get_unidade(db, unidade_id)
+    values = data.model_dump(exclude_none=True)
 
-    if data.sigla is not None and data.sigla != unidade.sigla:
+    if data.sigla is not None:
         existing = (await db.execute(
-            select(Unidade).where(Unidade.sigla == data.sigla)
+            select(Unidade.id).where(Unidade.sigla == data.sigla, Unidade.id != unidade_id)
         )).scalar_one_or_none()
         if existing:
             raise HTTPException(status_code=409, detail="Unidade com esta sigla já existe.")
-        unidade.sigla = data.sigla
-
-    if data.nome is not None:
-        unidade.nome = data.nome
-    if data.ativa is not None:
-        unidade.ativa = data.ativa
 
-    unidade.updated_at = datetime.utcnow()
+    values["updated_at"] = datetime.utcnow()
+    unidade = await update_returning(db, Unidade, [Unidade.id == unidade_id], values)
+    if not unidade:
+        raise HTTPException(status_code=404, detail="Unidade não encontrada.")
     await db.commit()
-    await db.refresh(unidade)
+    catalog_snapshot.invalidate()
     return unidade
 
 
@@ -210,6 +199,7 @@ async def delete_unidade(db: AsyncSession, unidade_id: UUID) -> None:
         )
     await db.delete(unidade)
     await db.commit()
+    catalog_snapshot.invalidate()
 
 
 # ===========================================================================
@@ -219,64 +209,68 @@ async def delete_unidade(db: AsyncSession, unidade_id: UUID) -> None:
 async def create_servico(db: AsyncSession, data: ServicoCreate) -> Servico:
     # Verifica unicidade do código
     existing = (await db.execute(
-        select(Servico).where(Servico.codigo == data.codigo)
+        select(Servico.id).where(Servico.codigo == data.codigo)
     )).scalar_one_or_none()
     if existing:
         raise HTTPException(status_code=409, detail="Serviço com este código já existe.")
 
-    # Valida FK: classe deve existir
-    await get_classe(db, data.classe_id)
-    # Valida FK: unidade deve existir
-    await get_unidade(db, data.unidade_id)
-
-    servico = Servico(
-        codigo=data.codigo,
-        atividade=data.atividade,
-        classe_id=data.classe_id,
-        unidade_id=data.unidade_id,
-        ativo=data.ativo,
-    )
-    db.add(servico)
+    # Valida FKs — os objetos carregados preenchem os relacionamentos da resposta
+    classe = await get_classe(db, data.classe_id)
+    unidade = await get_unidade(db, data.unidade_id)
+
+    servico = await insert_returning(db, Servico, {
+        "codigo": data.codigo,
+        "atividade": data.atividade,
+        "classe_id": data.classe_id,
+        "unidade_id": data.unidade_id,
+        "ativo": data.ativo,
+    }, classe=classe, unidade=unidade)
     await db.commit()
-    await db.refresh(servico)
-    # Re-fetch with selectinload to avoid MissingGreenlet during serialization
-    return await get_servico(db, servico.id)
+    catalog_snapshot.invalidate()
+    return servico
 
 
 async def list_servicos(
     db: AsyncSession,
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     ativo: Optional[bool] = None,
     classe_id: Optional[UUID] = None,
-) -> tuple[list[Servico], int]:
+) -> Page:
     query = select(Servico).options(
         selectinload(Servico.classe),
         selectinload(Servico.unidade),
     )
-    count_query = select(func.count()).select_from(Servico)
 
     if ativo is not None:
         query = query.where(Servico.ativo == ativo)
-        count_query = count_query.where(Servico.ativo == ativo)
     if classe_id is not None:
         query = query.where(Servico.classe_id == classe_id)
-        count_query = count_query.where(Servico.classe_id == classe_id)
 
-    total = (await db.execute(count_query)).scalar()
-    servicos = (
-        await db.execute(
-            query.order_by(Servico.codigo).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return servicos, total
+    return await paginate(db, query, [(Servico.codigo, False), (Servico.id, False)], params)
+
+
+async def search_servicos(
+    db: AsyncSession,
+    termo: str,
+    limit: int,
+    ativo: Optional[bool] = None,
+) -> list[tuple[Servico, float]]:
+    """Busca por código/atividade ranqueada por similaridade (ver app/utils/search.py)."""
+    query = select(Servico).options(
+        selectinload(Servico.classe),
+        selectinload(Servico.unidade),
+    )
+    if ativo is not None:
+        query = query.where(Servico.ativo == ativo)
+    return await search(db, query, [Servico.codigo, Servico.atividade], termo, limit)
 
 
 async def get_servico(db: AsyncSession, servico_id: UUID) -> Servico:
+    # joinedload: classe e unidade são many-to-one — vêm no mesmo SELECT
     result = await db.execute(
         select(Servico)
         .where(Servico.id == servico_id)
-        .options(selectinload(Servico.classe), selectinload(Servico.unidade))
+        .options(joinedload(Servico.classe), joinedload(Servico.unidade))
     )
     servico = result.scalar_one_or_none()
     if not servico:
@@ -285,31 +279,125 @@ async def get_servico(db: AsyncSession, servico_id: UUID) -> Servico:
 
 
 async def update_servico(db: AsyncSession, servico_id: UUID, data: ServicoUpdate) -> Servico:
-    servico = await get_servico(db, servico_id)
+    values = data.model_dump(exclude_none=True)
 
-    if data.codigo is not None and data.codigo != servico.codigo:
+    if data.codigo is not None:
         existing = (await db.execute(
-            select(Servico).where(Servico.codigo == data.codigo)
+            select(Servico.id).where(Servico.codigo == data.codigo, Servico.id != servico_id)
         )).scalar_one_or_none()
         if existing:
             raise HTTPException(status_code=409, detail="Serviço com este código já existe.")
-        servico.codigo = data.codigo
 
-    if data.atividade is not None:
-        servico.atividade = data.atividade
+    related = {}
     if data.classe_id is not None:
-        await get_classe(db, data.classe_id)  # valida existência
-        servico.classe_id = data.classe_id
+        related["classe"] = await get_classe(db, data.classe_id)  # valida existência
     if data.unidade_id is not None:
-        await get_unidade(db, data.unidade_id)  # valida existência
-        servico.unidade_id = data.unidade_id
-    if data.ativo is not None:
-        servico.ativo = data.ativo
+        related["unidade"] = await get_unidade(db, data.unidade_id)  # valida existência
 
-    servico.updated_at = datetime.utcnow()
+    values["updated_at"] = datetime.utcnow()
+    servico = await update_returning(db, Servico, [Servico.id == servico_id], values, **related)
+    if not servico:
+        raise HTTPException(status_code=404, detail="Serviço não encontrado.")
+    # Relacionamentos que não mudaram: identity map da sessão ou um SELECT por PK
+    if "classe" not in related:
+        attach(servico, classe=await db.get(Classe, servico.classe_id))
+    if "unidade" not in related:
+        attach(servico, unidade=await db.get(Unidade, servico.unidade_id))
     await db.commit()
-    # Re-fetch with selectinload to avoid MissingGreenlet during serialization
-    return await get_servico(db, servico_id)
+    catalog_snapshot.invalidate()
+    if data.codigo is not None:
+        # O índice de preços resolve serviços também pelo código, em todos os tenants
+        price_index.invalidate()
+    return servico
+
+
+async def resolver_referencias(db: AsyncSession, classes: bool = True) -> tuple[dict, dict]:
+    """
+    Nomes → ids de classes (por nome) e unidades (por sigla ou nome), em uma
+    consulta, sem diferenciar maiúsculas. Sigla tem precedência sobre nome.
+    """
+    partes = [
+        select(literal_column("'unidade_nome'"), Unidade.id, func.lower(Unidade.nome)),
+        select(literal_column("'unidade_sigla'"), Unidade.id, func.lower(Unidade.sigla)),
+    ]
+    if classes:
+        partes.append(select(literal_column("'classe'"), Classe.id, func.lower(Classe.nome)))
+    rows = (await db.execute(union_all(*partes))).all()
+
+    por_classe = {chave: id_ for tipo, id_, chave in rows if tipo == "classe"}
+    por_unidade = {chave: id_ for tipo, id_, chave in rows if tipo == "unidade_nome"}
+    por_unidade.update({chave: id_ for tipo, id_, chave in rows if tipo == "unidade_sigla"})
+    return por_classe, por_unidade
+
+
+# Staging da carga de serviços (ver app/database/copy.py)
+_SERVICOS_STAGING = {
+    "id": "uuid",
+    "codigo": "varchar(50)",
+    "atividade": "varchar(255)",
+    "classe_id": "uuid",
+    "unidade_id": "uuid",
+    "ativo": "boolean",
+}
+
+# Só regrava linhas que mudaram — reimportar a mesma planilha não gera escrita
+_SERVICOS_MERGE = text("""
+    WITH merge AS (
+        INSERT INTO servicos (id, codigo, atividade, classe_id, unidade_id, ativo, created_at, updated_at)
+        SELECT id, codigo, atividade, classe_id, unidade_id, ativo,
+               timezone('utc', now()), timezone('utc', now())
+        FROM _import_servicos
+        ON CONFLICT (codigo) DO UPDATE SET
+            atividade = EXCLUDED.atividade,
+            classe_id = EXCLUDED.classe_id,
+            unidade_id = EXCLUDED.unidade_id,
+            ativo = EXCLUDED.ativo,
+            updated_at = EXCLUDED.updated_at
+        WHERE (servicos.atividade, servicos.classe_id, servicos.unidade_id, servicos.ativo)
+              IS DISTINCT FROM
+              (EXCLUDED.atividade, EXCLUDED.classe_id, EXCLUDED.unidade_id, EXCLUDED.ativo)
+        RETURNING xmax = 0 AS inserido
+    )
+    SELECT count(*) FILTER (WHERE inserido), count(*) FILTER (WHERE NOT inserido) FROM merge
+""")
+
+
+async def import_servicos(db: AsyncSession, linhas: Iterable[Linha]) -> dict:
+    """
+    Carga de serviços (onboarding): valida as linhas, carrega as válidas via
+    COPY em tabela temporária e faz o merge com INSERT ... ON CONFLICT (codigo)
+    em um único comando. Linhas inválidas não interrompem a carga.
+    """
+    por_classe, por_unidade = await resolver_referencias(db)
+    classe_ids, unidade_ids = set(por_classe.values()), set(por_unidade.values())
+
+    def registro(row: ServicoImportRow):
+        classe_id = row.classe_id if row.classe_id else por_classe.get(row.classe.lower())
+        if classe_id not in classe_ids:
+            return f"Classe não encontrada: {row.classe or row.classe_id}."
+        unidade_id = row.unidade_id if row.unidade_id else por_unidade.get(row.unidade.lower())
+        if unidade_id not in unidade_ids:
+            return f"Unidade não encontrada: {row.unidade or row.unidade_id}."
+        return (uuid4(), row.codigo, row.atividade, classe_id, unidade_id, row.ativo)
+
+    # Leitura + validação consomem o arquivo linha a linha, fora do event loop
+    carga = await asyncio.to_thread(preparar, linhas, ServicoImportRow, registro)
+
+    inseridos = atualizados = 0
+    if carga["registros"]:
+        await copy_to_temp_table(db, "_import_servicos", _SERVICOS_STAGING, carga["registros"])
+        inseridos, atualizados = (await db.execute(_SERVICOS_MERGE)).one()
+        await db.commit()
+        catalog_snapshot.invalidate()
+
+    return {
+        "total": carga["total"],
+        "inseridos": inseridos,
+        "atualizados": atualizados,
+        "inalterados": len(carga["registros"]) - inseridos - atualizados,
+        "rejeitados": carga["rejeitados"],
+        "erros": carga["erros"],
+    }
 
 
 async def delete_servico(db: AsyncSession, servico_id: UUID) -> None:
@@ -325,6 +413,7 @@ async def delete_servico(db: AsyncSession, servico_id: UUID) -> None:
         )
     await db.delete(servico)
     await db.commit()
+    catalog_snapshot.invalidate()
 
 
 # ===========================================================================
@@ -353,6 +442,7 @@ async def create_lpu(db: AsyncSession, tenant_id: UUID, data: LPUCreate) -> LPU:
     )
     db.add(lpu)
     await db.commit()
+    price_index.invalidate(tenant_id)
     await db.refresh(lpu)
     return lpu
 
@@ -360,28 +450,18 @@ async def create_lpu(db: AsyncSession, tenant_id: UUID, data: LPUCreate) -> LPU:
 async def list_lpus(
     db: AsyncSession,
     tenant_id: UUID,
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     parceiro_id: Optional[UUID] = None,
     ativa: Optional[bool] = None,
-) -> tuple[list[LPU], int]:
+) -> Page:
     query = select(LPU).where(LPU.tenant_id == tenant_id)
-    count_query = select(func.count()).select_from(LPU).where(LPU.tenant_id == tenant_id)
 
     if parceiro_id is not None:
         query = query.where(LPU.parceiro_id == parceiro_id)
-        count_query = count_query.where(LPU.parceiro_id == parceiro_id)
     if ativa is not None:
         query = query.where(LPU.ativa == ativa)
-        count_query = count_query.where(LPU.ativa == ativa)
 
-    total = (await db.execute(count_query)).scalar()
-    lpus = (
-        await db.execute(
-            query.order_by(LPU.nome).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return lpus, total
+    return await paginate(db, query, [(LPU.nome, False), (LPU.id, False)], params)
 
 
 async def get_lpu(db: AsyncSession, tenant_id: UUID, lpu_id: UUID) -> LPU:
@@ -420,6 +500,7 @@ async def update_lpu(db: AsyncSession, tenant_id: UUID, lpu_id: UUID, data: LPUU
 
     lpu.updated_at = datetime.utcnow()
     await db.commit()
+    price_index.invalidate(tenant_id)
     await db.refresh(lpu)
     return lpu
 
@@ -437,18 +518,14 @@ async def add_item_lpu(
     # Garante que a LPU existe e pertence ao tenant
     lpu = await get_lpu(db, tenant_id, lpu_id)
 
-    # Valida que o serviço existe
-    servico = (await db.execute(
-        select(Servico).where(Servico.id == data.servico_id)
-    )).scalar_one_or_none()
-    if not servico:
-        raise HTTPException(status_code=404, detail="Serviço não encontrado.")
+    # Valida que o serviço existe (já com classe/unidade para a resposta)
+    servico = await get_servico(db, data.servico_id)
     if not servico.ativo:
         raise HTTPException(status_code=422, detail="Serviço inativo não pode ser adicionado à LPU.")
 
     # Verifica duplicidade: mesmo serviço na mesma LPU
     existing = (await db.execute(
-        select(LPUItem).where(
+        select(LPUItem.id).where(
             LPUItem.lpu_id == lpu.id,
             LPUItem.servico_id == data.servico_id,
         )
@@ -459,26 +536,117 @@ async def add_item_lpu(
             detail="Este serviço já está cadastrado nesta LPU.",
         )
 
-    item = LPUItem(
-        lpu_id=lpu.id,
-        servico_id=data.servico_id,
-        valor_unitario=data.valor_unitario,
-        valor_classe=data.valor_classe,
-    )
-    db.add(item)
+    item = await insert_returning(db, LPUItem, {
+        "lpu_id": lpu.id,
+        "servico_id": data.servico_id,
+        "valor_unitario": data.valor_unitario,
+        "valor_classe": data.valor_classe,
+    }, servico=servico)
+    await db.commit()
+    price_index.invalidate(tenant_id)
+    return item
+
+
+# Linhas por INSERT (7 parâmetros por linha — bem abaixo do limite de 32767 do asyncpg)
+_BULK_CHUNK = 1_000
+
+
+async def bulk_upsert_itens_lpu(
+    db: AsyncSession,
+    tenant_id: UUID,
+    lpu_id: UUID,
+    linhas: list[tuple[int, dict]],
+) -> dict:
+    """
+    Importa itens na LPU em uma única transação.
+
+    Todos os serviços são resolvidos em uma consulta (por id ou código); as
+    linhas válidas são gravadas com INSERT ... ON CONFLICT (lpu_id, servico_id)
+    DO UPDATE em lotes. Linhas inválidas não interrompem a importação — voltam
+    em `erros` com o número da linha.
+    """
+    lpu = await get_lpu(db, tenant_id, lpu_id)
+
+    erros: list[dict] = []
+    validas: list[tuple[int, LPUItemImportRow]] = []
+    for linha, dados in linhas:
+        try:
+            validas.append((linha, LPUItemImportRow.model_validate(dados)))
+        except ValidationError as exc:
+            erros.append({"linha": linha, "erro": erro_validacao(exc)})
+
+    ids = {r.servico_id for _, r in validas if r.servico_id}
+    codigos = {r.servico_codigo for _, r in validas if r.servico_codigo}
+    por_id: dict[UUID, tuple] = {}
+    por_codigo: dict[str, tuple] = {}
+    if ids or codigos:
+        result = await db.execute(
+            select(Servico.id, Servico.codigo, Servico.ativo)
+            .where(or_(Servico.id.in_(ids), Servico.codigo.in_(codigos)))
+        )
+        for servico in result.all():
+            por_id[servico.id] = servico
+            por_codigo[servico.codigo] = servico
+
+    now = datetime.utcnow()
+    valores: list[dict] = []
+    vistos: dict[UUID, int] = {}
+    for linha, row in validas:
+        ref = str(row.servico_id) if row.servico_id else row.servico_codigo
+        servico = por_id.get(row.servico_id) if row.servico_id else por_codigo.get(row.servico_codigo)
+        if servico is None:
+            erro = "Serviço não encontrado."
+        elif not servico.ativo:
+            erro = "Serviço inativo não pode ser adicionado à LPU."
+        elif servico.id in vistos:
+            erro = f"Serviço repetido (já informado na linha {vistos[servico.id]})."
+        else:
+            vistos[servico.id] = linha
+            valores.append({
+                "id": uuid4(),
+                "lpu_id": lpu.id,
+                "servico_id": servico.id,
+                "valor_unitario": row.valor_unitario,
+                "valor_classe": row.valor_classe,
+                "created_at": now,
+                "updated_at": now,
+            })
+            continue
+        erros.append({"linha": linha, "servico": ref, "erro": erro})
+
+    inseridos = atualizados = 0
+    for inicio in range(0, len(valores), _BULK_CHUNK):
+        stmt = pg_insert(LPUItem).values(valores[inicio:inicio + _BULK_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_lpu_itens_lpu_servico",
+            set_={
+                "valor_unitario": stmt.excluded.valor_unitario,
+                "valor_classe": stmt.excluded.valor_classe,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(literal_column("xmax = 0"))  # true → linha nova; false → atualizada
+        for (novo,) in (await db.execute(stmt)).all():
+            if novo:
+                inseridos += 1
+            else:
+                atualizados += 1
     await db.commit()
-    await db.refresh(item)
-    # Re-fetch with selectinload to avoid MissingGreenlet during serialization
-    return await get_item_lpu(db, tenant_id, lpu_id, item.id)
+    price_index.invalidate(tenant_id)
+
+    return {
+        "total": len(linhas),
+        "inseridos": inseridos,
+        "atualizados": atualizados,
+        "erros": sorted(erros, key=lambda e: e["linha"]),
+    }
 
 
 async def list_itens_lpu(
     db: AsyncSession,
     tenant_id: UUID,
     lpu_id: UUID,
-    page: int = 1,
-    per_page: int = 20,
-) -> tuple[list[LPUItem], int]:
+    params: PageParams,
+) -> Page:
     # Garante que a LPU existe e pertence ao tenant
     await get_lpu(db, tenant_id, lpu_id)
 
@@ -490,15 +658,30 @@ async def list_itens_lpu(
             selectinload(LPUItem.servico).selectinload(Servico.unidade),
         )
     )
-    count_query = select(func.count()).select_from(LPUItem).where(LPUItem.lpu_id == lpu_id)
 
-    total = (await db.execute(count_query)).scalar()
-    itens = (
-        await db.execute(
-            query.order_by(LPUItem.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
+    return await paginate(db, query, [(LPUItem.created_at, True), (LPUItem.id, True)], params)
+
+
+def export_itens_lpu_query(lpu_id: UUID) -> Select:
+    """Tabela de preços da LPU para exportação (app/utils/export.py), por código do serviço."""
+    return (
+        select(
+            Servico.codigo,
+            Servico.atividade,
+            Classe.nome.label("classe"),
+            Unidade.sigla.label("unidade"),
+            LPUItem.valor_unitario,
+            LPUItem.valor_classe,
+            LPUItem.servico_id,
+            LPUItem.id,
+            LPUItem.updated_at,
         )
-    ).scalars().all()
-    return itens, total
+        .join(Servico, Servico.id == LPUItem.servico_id)
+        .join(Classe, Classe.id == Servico.classe_id)
+        .join(Unidade, Unidade.id == Servico.unidade_id)
+        .where(LPUItem.lpu_id == lpu_id)
+        .order_by(Servico.codigo)
+    )
 
 
 async def get_item_lpu(db: AsyncSession, tenant_id: UUID, lpu_id: UUID, item_id: UUID) -> LPUItem:
@@ -526,17 +709,20 @@ async def update_item_lpu(
     item_id: UUID,
     data: LPUItemUpdate,
 ) -> LPUItem:
-    item = await get_item_lpu(db, tenant_id, lpu_id, item_id)
-
-    if data.valor_unitario is not None:
-        item.valor_unitario = data.valor_unitario
-    if data.valor_classe is not None:
-        item.valor_classe = data.valor_classe
+    # Garante que a LPU existe e pertence ao tenant
+    await get_lpu(db, tenant_id, lpu_id)
 
-    item.updated_at = datetime.utcnow()
+    values = data.model_dump(exclude_none=True)
+    values["updated_at"] = datetime.utcnow()
+    item = await update_returning(
+        db, LPUItem, [LPUItem.id == item_id, LPUItem.lpu_id == lpu_id], values,
+    )
+    if not item:
+        raise HTTPException(status_code=404, detail="Item de LPU não encontrado.")
+    attach(item, servico=await get_servico(db, item.servico_id))
     await db.commit()
-    # Re-fetch with selectinload to avoid MissingGreenlet during serialization
-    return await get_item_lpu(db, tenant_id, lpu_id, item_id)
+    price_index.invalidate(tenant_id)
+    return item
 
 
 async def delete_lpu(
@@ -547,6 +733,7 @@ async def delete_lpu(
     lpu = await get_lpu(db, tenant_id, lpu_id)
     await db.delete(lpu)
     await db.commit()
+    price_index.invalidate(tenant_id)
 
 
 async def remove_item_lpu(
@@ -558,3 +745,4 @@ async def remove_item_lpu(
     item = await get_item_lpu(db, tenant_id, lpu_id, item_id)
     await db.delete(item)
     await db.commit()
+    price_index.invalidate(tenant_id)
@@ -1,81 +1,95 @@
-from typing import Optional
+import asyncio
+from typing import Iterable, Optional
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import select, func
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.database.copy import copy_to_temp_table
+from app.database.writes import attach, insert_returning, update_returning
+from app.modules.catalogo.lpu.importacao import Linha, preparar
+from app.modules.catalogo.lpu.service import resolver_referencias
 from app.modules.catalogo.materiais.models import Material
-from app.modules.catalogo.materiais.schemas import MaterialCreate, MaterialUpdate
+from app.modules.catalogo.materiais.schemas import MaterialCreate, MaterialImportRow, MaterialUpdate
+from app.modules.catalogo.snapshot.service import catalog_snapshot
+from app.utils.pagination import Page, PageParams, paginate
+from app.utils.search import search
 from app.modules.catalogo.lpu.models import Unidade # Para validar a FK da Unidade
 
 # ===========================================================================
 # MATERIAL
 # ===========================================================================
 
+async def _get_unidade(db: AsyncSession, unidade_id: UUID) -> Unidade:
+    unidade = await db.get(Unidade, unidade_id)
+    if not unidade:
+        raise HTTPException(status_code=404, detail="Unidade não encontrada.")
+    return unidade
+
+
 async def create_material(db: AsyncSession, data: MaterialCreate) -> Material:
     # Verifica unicidade do código
     existing = (await db.execute(
-        select(Material).where(Material.codigo == data.codigo)
+        select(Material.id).where(Material.codigo == data.codigo)
     )).scalar_one_or_none()
     if existing:
         raise HTTPException(status_code=409, detail="Material com este código já existe.")
 
-    # Valida FK: unidade deve existir
-    unidade = (await db.execute(
-        select(Unidade).where(Unidade.id == data.unidade_id)
-    )).scalar_one_or_none()
-    if not unidade:
-        raise HTTPException(status_code=404, detail="Unidade não encontrada.")
+    # Valida FK: unidade deve existir (e preenche o relacionamento da resposta)
+    unidade = await _get_unidade(db, data.unidade_id)
 
-    material = Material(
-        codigo=data.codigo,
-        descricao=data.descricao,
-        unidade_id=data.unidade_id,
-        ativo=data.ativo,
-    )
-    db.add(material)
+    material = await insert_returning(db, Material, {
+        "codigo": data.codigo,
+        "descricao": data.descricao,
+        "unidade_id": data.unidade_id,
+        "ativo": data.ativo,
+    }, unidade=unidade)
     await db.commit()
-    await db.refresh(material)
-    # Re-fetch with selectinload to avoid MissingGreenlet during serialization
-    return await get_material(db, material.id)
+    catalog_snapshot.invalidate()
+    return material
 
 
 async def list_materiais(
     db: AsyncSession,
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     ativo: Optional[bool] = None,
     unidade_id: Optional[UUID] = None,
-) -> tuple[list[Material], int]:
+) -> Page:
     query = select(Material).options(
         selectinload(Material.unidade),
     )
-    count_query = select(func.count()).select_from(Material)
 
     if ativo is not None:
         query = query.where(Material.ativo == ativo)
-        count_query = count_query.where(Material.ativo == ativo)
     if unidade_id is not None:
         query = query.where(Material.unidade_id == unidade_id)
-        count_query = count_query.where(Material.unidade_id == unidade_id)
 
-    total = (await db.execute(count_query)).scalar()
-    materiais = (
-        await db.execute(
-            query.order_by(Material.codigo).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return materiais, total
+    return await paginate(db, query, [(Material.codigo, False), (Material.id, False)], params)
+
+
+async def search_materiais(
+    db: AsyncSession,
+    termo: str,
+    limit: int,
+    ativo: Optional[bool] = None,
+) -> list[tuple[Material, float]]:
+    """Busca por código/descrição ranqueada por similaridade (ver app/utils/search.py)."""
+    query = select(Material).options(
+        selectinload(Material.unidade),
+    )
+    if ativo is not None:
+        query = query.where(Material.ativo == ativo)
+    return await search(db, query, [Material.codigo, Material.descricao], termo, limit)
 
 
 async def get_material(db: AsyncSession, material_id: UUID) -> Material:
     result = await db.execute(
         select(Material)
         .where(Material.id == material_id)
-        .options(selectinload(Material.unidade))
+        .options(joinedload(Material.unidade))
     )
     material = result.scalar_one_or_none()
     if not material:
@@ -84,36 +98,90 @@ async def get_material(db: AsyncSession, material_id: UUID) -> Material:
 
 
 async def update_material(db: AsyncSession, material_id: UUID, data: MaterialUpdate) -> Material:
-    material = await get_material(db, material_id)
+    values = data.model_dump(exclude_none=True)
 
-    if data.codigo is not None and data.codigo != material.codigo:
+    if data.codigo is not None:
         existing = (await db.execute(
-            select(Material).where(Material.codigo == data.codigo)
+            select(Material.id).where(Material.codigo == data.codigo, Material.id != material_id)
         )).scalar_one_or_none()
         if existing:
             raise HTTPException(status_code=409, detail="Material com este código já existe.")
-        material.codigo = data.codigo
-
-    if data.descricao is not None:
-        material.descricao = data.descricao
-    if data.unidade_id is not None:
-        # Valida FK: unidade deve existir
-        unidade = (await db.execute(
-            select(Unidade).where(Unidade.id == data.unidade_id)
-        )).scalar_one_or_none()
-        if not unidade:
-            raise HTTPException(status_code=404, detail="Unidade não encontrada.")
-        material.unidade_id = data.unidade_id
-    if data.ativo is not None:
-        material.ativo = data.ativo
 
-    material.updated_at = datetime.utcnow()
+    # Valida FK: unidade deve existir
+    unidade = await _get_unidade(db, data.unidade_id) if data.unidade_id is not None else None
+
+    values["updated_at"] = datetime.utcnow()
+    material = await update_returning(db, Material, [Material.id == material_id], values)
+    if not material:
+        raise HTTPException(status_code=404, detail="Material não encontrado.")
+    # Unidade inalterada: identity map da sessão ou um SELECT por PK
+    attach(material, unidade=unidade or await db.get(Unidade, material.unidade_id))
     await db.commit()
-    # Re-fetch with selectinload to avoid MissingGreenlet during serialization
-    return await get_material(db, material_id)
+    catalog_snapshot.invalidate()
+    return material
 
 
 async def delete_material(db: AsyncSession, material_id: UUID) -> None:
     material = await get_material(db, material_id)
     await db.delete(material)
-    await db.commit()
\ No newline at end of file
+    await db.commit()
+    catalog_snapshot.invalidate()
+
+
+# Staging da carga de materiais (ver app/database/copy.py)
+_MATERIAIS_STAGING = {
+    "id": "uuid",
+    "codigo": "varchar(50)",
+    "descricao": "varchar(255)",
+    "unidade_id": "uuid",
+    "ativo": "boolean",
+}
+
+# Só regrava linhas que mudaram — reimportar a mesma planilha não gera escrita
+_MATERIAIS_MERGE = text("""
+    WITH merge AS (
+        INSERT INTO materiais (id, codigo, descricao, unidade_id, ativo, created_at, updated_at)
+        SELECT id, codigo, descricao, unidade_id, ativo,
+               timezone('utc', now()), timezone('utc', now())
+        FROM _import_materiais
+        ON CONFLICT (codigo) DO UPDATE SET
+            descricao = EXCLUDED.descricao,
+            unidade_id = EXCLUDED.unidade_id,
+            ativo = EXCLUDED.ativo,
+            updated_at = EXCLUDED.updated_at
+        WHERE (materiais.descricao, materiais.unidade_id, materiais.ativo)
+              IS DISTINCT FROM (EXCLUDED.descricao, EXCLUDED.unidade_id, EXCLUDED.ativo)
+        RETURNING xmax = 0 AS inserido
+    )
+    SELECT count(*) FILTER (WHERE inserido), count(*) FILTER (WHERE NOT inserido) FROM merge
+""")
+
+
+async def import_materiais(db: AsyncSession, linhas: Iterable[Linha]) -> dict:
+    """Carga de materiais — mesmo fluxo de lpu.service.import_servicos."""
+    _, por_unidade = await resolver_referencias(db, classes=False)
+    unidade_ids = set(por_unidade.values())
+
+    def registro(row: MaterialImportRow):
+        unidade_id = row.unidade_id if row.unidade_id else por_unidade.get(row.unidade.lower())
+        if unidade_id not in unidade_ids:
+            return f"Unidade não encontrada: {row.unidade or row.unidade_id}."
+        return (uuid4(), row.codigo, row.descricao, unidade_id, row.ativo)
+
+    carga = await asyncio.to_thread(preparar, linhas, MaterialImportRow, registro)
+
+    inseridos = atualizados = 0
+    if carga["registros"]:
+        await copy_to_temp_table(db, "_import_materiais", _MATERIAIS_STAGING, carga["registros"])
+        inseridos, atualizados = (await db.execute(_MATERIAIS_MERGE)).one()
+        await db.commit()
+        catalog_snapshot.invalidate()
+
+    return {
+        "total": carga["total"],
+        "inseridos": inseridos,
+        "atualizados": atualizados,
+        "inalterados": len(carga["registros"]) - inseridos - atualizados,
+        "rejeitados": carga["rejeitados"],
+        "erros": carga["erros"],
+    }
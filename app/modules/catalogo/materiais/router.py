@@ -1,14 +1,19 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
+from app.modules.catalogo.lpu import importacao
+from app.modules.catalogo.lpu.schemas import CatalogoImportResult
 from app.modules.catalogo.materiais import crud, schemas
 from app.rbac.dependencies import require_roles
+from app.utils.pagination import PageParams, page_params
 from app.utils.responses import success
+from app.utils.search import search_limit
 
 router = APIRouter()
 
@@ -32,21 +37,48 @@ async def create_material(
     return success("Material criado.", schemas.MaterialResponse.model_validate(material))
 
 
+@router.post("/import", tags=["Catalogo: Materiais"])
+async def import_materiais(
+    arquivo: UploadFile = File(..., description="Planilha CSV ou XLSX (cabeçalho na 1ª linha)."),
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(_admin_up),
+):
+    linhas = importacao.abrir_planilha(
+        arquivo, importacao.MAX_LINHAS_CATALOGO, importacao.ALIASES_CATALOGO, importacao.TEXTO_CATALOGO,
+    )
+    result = await crud.import_materiais(db, linhas)
+    return success("Carga de materiais concluída.", CatalogoImportResult(**result))
+
+
 @router.get("/", tags=["Catalogo: Materiais"])
 async def list_materiais(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     ativo: Optional[bool] = None,
     unidade_id: Optional[UUID] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(_staff_up),
 ):
-    materiais, total = await crud.list_materiais(db, page, per_page, ativo, unidade_id)
+    page = await crud.list_materiais(db, params, ativo, unidade_id)
     return success("Lista de materiais.", {
-        "results": [schemas.MaterialResponse.model_validate(m) for m in materiais],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.MaterialResponse.model_validate(m) for m in page.items],
+        **page.meta(),
+    })
+
+
+@router.get("/search", tags=["Catalogo: Materiais"])
+async def search_materiais(
+    q: str = Query(..., min_length=1, max_length=100),
+    ativo: Optional[bool] = None,
+    limit: int = Depends(search_limit),
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(_staff_up),
+):
+    hits = await crud.search_materiais(db, q, limit, ativo)
+    return success("Busca de materiais.", {
+        "q": q,
+        "results": [
+            {**schemas.MaterialResponse.model_validate(m).model_dump(), "score": score} for m, score in hits
+        ],
     })
 
 
@@ -2,9 +2,10 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.modules.catalogo.lpu.schemas import UnidadeResponse # Para o relacionamento da Unidade
+from app.modules.catalogo.lpu.schemas import ativo_planilha, texto_planilha
 
 # ---------------------------------------------------------------------------
 # MATERIAL
@@ -32,3 +33,21 @@ class MaterialResponse(BaseModel):
     unidade: Optional[UnidadeResponse] = None # Relacionamento
 
     model_config = {"from_attributes": True}
+
+
+class MaterialImportRow(BaseModel):
+    """Linha da carga de materiais: unidade pela sigla/nome (ou unidade_id)."""
+    codigo: str = Field(..., min_length=1, max_length=50)
+    descricao: str = Field(..., min_length=2, max_length=255)
+    unidade: Optional[str] = None
+    unidade_id: Optional[UUID] = None
+    ativo: bool = True
+
+    _codigo_texto = field_validator("codigo", "unidade", mode="before")(texto_planilha)
+    _ativo = field_validator("ativo", mode="before")(ativo_planilha)
+
+    @model_validator(mode="after")
+    def _unidade_informada(self):
+        if self.unidade_id is None and not self.unidade:
+            raise ValueError("Informe unidade ou unidade_id.")
+        return self
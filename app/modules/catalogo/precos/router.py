@@ -0,0 +1,87 @@
+"""
+Router — Resolução de preços (LPU)
+
+Prefixo registrado em catalogo/__init__.py: /modules/catalogo/precos
+
+  GET  /      → preço de um serviço para um parceiro em uma data
+  POST /lote  → até MAX_CONSULTAS consultas em uma chamada (valoração de atividades)
+
+Tenant-scoped (TenantContext): só LPUs do tenant entram na resolução.
+"""
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import UserRole
+from app.database.connection import get_db
+from app.modules.catalogo.precos import schemas
+from app.modules.catalogo.precos.service import resolver_precos
+from app.rbac.tenant import TenantContext, tenant_context
+from app.utils.responses import success
+
+router = APIRouter()
+
+_staff_tenant = tenant_context(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN, UserRole.MASTER)
+
+
+async def _resolver(db: AsyncSession, tenant_id: UUID, consultas: list[schemas.PrecoConsulta]) -> list:
+    hoje = date.today()
+    resolvidos = await resolver_precos(db, tenant_id, [
+        (c.parceiro_id, c.servico_id, c.servico_codigo, c.data or hoje) for c in consultas
+    ])
+    resultados = []
+    for consulta, (servico_id, preco) in zip(consultas, resolvidos):
+        valores = {}
+        if preco is not None:
+            valores = {
+                "lpu_id": preco.lpu_id,
+                "item_id": preco.item_id,
+                "valor_unitario": preco.valor_unitario,
+                "valor_classe": preco.valor_classe,
+            }
+        resultados.append(schemas.PrecoResultado(
+            parceiro_id=consulta.parceiro_id,
+            servico_id=servico_id,
+            servico_codigo=consulta.servico_codigo,
+            data=consulta.data or hoje,
+            encontrado=preco is not None,
+            **valores,
+        ))
+    return resultados
+
+
+@router.get("/", tags=["Catalogo: Preços"])
+async def resolver_preco(
+    parceiro_id: UUID,
+    servico_id: Optional[UUID] = None,
+    servico_codigo: Optional[str] = None,
+    data: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(_staff_tenant),
+):
+    if servico_id is None and not servico_codigo:
+        raise HTTPException(status_code=422, detail="Informe servico_id ou servico_codigo.")
+    consulta = schemas.PrecoConsulta(
+        parceiro_id=parceiro_id, servico_id=servico_id, servico_codigo=servico_codigo, data=data,
+    )
+    (resultado,) = await _resolver(db, ctx.tenant_id, [consulta])
+    if not resultado.encontrado:
+        raise HTTPException(status_code=404, detail="Nenhuma LPU vigente com este serviço para o parceiro na data.")
+    return success("Preço resolvido.", resultado)
+
+
+@router.post("/lote", tags=["Catalogo: Preços"])
+async def resolver_precos_lote(
+    data: schemas.PrecoLoteRequest,
+    db: AsyncSession = Depends(get_db),
+    ctx: TenantContext = Depends(_staff_tenant),
+):
+    resultados = await _resolver(db, ctx.tenant_id, data.consultas)
+    return success("Preços resolvidos.", schemas.PrecoLoteResponse(
+        total=len(resultados),
+        encontrados=sum(r.encontrado for r in resultados),
+        resultados=resultados,
+    ))
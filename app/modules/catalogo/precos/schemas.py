@@ -0,0 +1,45 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+# Consultas por chamada do lote — um relatório mensal de campo cabe com folga
+MAX_CONSULTAS = 20_000
+
+
+class PrecoConsulta(BaseModel):
+    """Serviço por servico_id ou servico_codigo; sem data, vale a data de hoje."""
+    parceiro_id: UUID
+    servico_id: Optional[UUID] = None
+    servico_codigo: Optional[str] = Field(None, max_length=50)
+    data: Optional[date] = None
+
+    @model_validator(mode="after")
+    def _servico_informado(self):
+        if self.servico_id is None and not self.servico_codigo:
+            raise ValueError("Informe servico_id ou servico_codigo.")
+        return self
+
+
+class PrecoLoteRequest(BaseModel):
+    consultas: list[PrecoConsulta] = Field(..., min_length=1, max_length=MAX_CONSULTAS)
+
+
+class PrecoResultado(BaseModel):
+    parceiro_id: UUID
+    servico_id: Optional[UUID]
+    servico_codigo: Optional[str]
+    data: date
+    encontrado: bool
+    lpu_id: Optional[UUID] = None
+    item_id: Optional[UUID] = None
+    valor_unitario: Optional[Decimal] = None
+    valor_classe: Optional[Decimal] = None
+
+
+class PrecoLoteResponse(BaseModel):
+    total: int
+    encontrados: int
+    resultados: list[PrecoResultado]
@@ -0,0 +1,262 @@
+"""
+Resolução de preços — "quanto vale o serviço X para o parceiro Y na data D?"
+
+O preço vive em LPUItem e vale durante a vigência da LPU (data_inicio /
+data_fim; vazio = sem limite). Para cada tenant o índice guarda, em memória do
+processo, parceiro → serviço → faixas de vigência ordenadas e sem sobreposição;
+cada consulta é uma busca binária (O(log n)) nessas faixas, e um lote de
+milhares de consultas não faz nenhuma ida ao banco depois do índice montado.
+
+Regras da resolução:
+  - só LPUs ativas entram no índice; vigência com data_fim < data_inicio é ignorada;
+  - LPUs do mesmo parceiro com vigências sobrepostas: vale a de data_inicio
+    mais recente (a negociação mais nova) e, no empate, a atualizada por último.
+
+Frescor (mesmo esquema do snapshot do catálogo):
+  - os services de LPU chamam `price_index.invalidate(tenant_id)` após cada
+    commit; alterações de código de serviço (globais) invalidam todos os tenants;
+  - escritas de outro worker são detectadas pela impressão digital do tenant
+    (count + max(updated_at) de LPUs e itens, e max(updated_at) dos serviços),
+    conferida no máximo a cada PRICE_INDEX_CHECK_SECONDS.
+
+Os índices de no máximo PRICE_INDEX_MAX_TENANTS tenants ficam em memória; o
+menos usado recentemente é descartado.
+"""
+import asyncio
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.modules.catalogo.lpu.models import LPU, LPUItem, Servico
+
+# Vigência aberta: sem data_inicio vale desde sempre; sem data_fim, para sempre
+_INICIO_ABERTO = date.min.toordinal()
+_FIM_ABERTO = date.max.toordinal() + 1
+
+
+@dataclass(frozen=True, slots=True)
+class Preco:
+    lpu_id: UUID
+    item_id: UUID
+    valor_unitario: Decimal
+    valor_classe: Optional[Decimal]
+    data_inicio: Optional[date]
+    data_fim: Optional[date]
+
+
+@dataclass(frozen=True, slots=True)
+class _Faixas:
+    """Faixas [inicio, fim) em dias ordinais, ordenadas e disjuntas."""
+    inicios: list[int]
+    fins: list[int]
+    precos: list[Preco]
+
+    def resolver(self, dia: int) -> Optional[Preco]:
+        i = bisect_right(self.inicios, dia) - 1
+        if i >= 0 and dia < self.fins[i]:
+            return self.precos[i]
+        return None
+
+
+def _faixas(vigencias: list[tuple[int, int, tuple, Preco]]) -> _Faixas:
+    """
+    Achata vigências possivelmente sobrepostas em faixas disjuntas.
+
+    `vigencias`: (inicio, fim exclusivo, prioridade, preço). Entre cada par de
+    fronteiras consecutivas vence a vigência de maior prioridade que cobre o
+    trecho; trechos vizinhos com o mesmo vencedor são unidos.
+    """
+    fronteiras = sorted({v[0] for v in vigencias} | {v[1] for v in vigencias})
+    inicios: list[int] = []
+    fins: list[int] = []
+    precos: list[Preco] = []
+    for inicio, fim in zip(fronteiras, fronteiras[1:]):
+        cobrem = [v for v in vigencias if v[0] <= inicio and fim <= v[1]]
+        if not cobrem:
+            continue
+        preco = max(cobrem, key=lambda v: v[2])[3]
+        if precos and precos[-1] is preco and fins[-1] == inicio:
+            fins[-1] = fim
+            continue
+        inicios.append(inicio)
+        fins.append(fim)
+        precos.append(preco)
+    return _Faixas(inicios, fins, precos)
+
+
+class TenantPrices:
+    """Índice de preços de um tenant: parceiro → serviço → faixas de vigência."""
+
+    def __init__(self, faixas: dict[UUID, dict[UUID, _Faixas]], codigos: dict[str, UUID]):
+        self._faixas = faixas
+        self._codigos = codigos
+        self.size = sum(len(f.precos) for servicos in faixas.values() for f in servicos.values())
+
+    def servico_id(self, codigo: str) -> Optional[UUID]:
+        """Id do serviço pelo código (só serviços presentes em alguma LPU do tenant)."""
+        return self._codigos.get(codigo)
+
+    def resolver(self, parceiro_id: UUID, servico_id: UUID, data: date) -> Optional[Preco]:
+        faixas = self._faixas.get(parceiro_id, {}).get(servico_id)
+        return faixas.resolver(data.toordinal()) if faixas else None
+
+
+def _fingerprint_query(tenant_id: UUID):
+    itens = LPUItem.__table__.join(LPU.__table__, LPU.id == LPUItem.lpu_id)
+    return select(
+        select(func.count()).select_from(LPU).where(LPU.tenant_id == tenant_id).scalar_subquery(),
+        select(func.max(LPU.updated_at)).where(LPU.tenant_id == tenant_id).scalar_subquery(),
+        select(func.count()).select_from(itens).where(LPU.tenant_id == tenant_id).scalar_subquery(),
+        select(func.max(LPUItem.updated_at)).select_from(itens)
+        .where(LPU.tenant_id == tenant_id).scalar_subquery(),
+        select(func.max(Servico.updated_at)).scalar_subquery(),
+    )
+
+
+async def _fingerprint(db: AsyncSession, tenant_id: UUID) -> tuple:
+    return tuple((await db.execute(_fingerprint_query(tenant_id))).one())
+
+
+async def _build(db: AsyncSession, tenant_id: UUID) -> TenantPrices:
+    result = await db.execute(
+        select(
+            LPU.id.label("lpu_id"),
+            LPU.parceiro_id,
+            LPU.data_inicio,
+            LPU.data_fim,
+            LPU.updated_at,
+            LPUItem.id.label("item_id"),
+            LPUItem.servico_id,
+            LPUItem.valor_unitario,
+            LPUItem.valor_classe,
+            Servico.codigo,
+        )
+        .join(LPUItem, LPUItem.lpu_id == LPU.id)
+        .join(Servico, Servico.id == LPUItem.servico_id)
+        .where(LPU.tenant_id == tenant_id, LPU.ativa.is_(True))
+    )
+
+    vigencias: dict[tuple[UUID, UUID], list] = {}
+    codigos: dict[str, UUID] = {}
+    for r in result.all():
+        inicio = r.data_inicio.toordinal() if r.data_inicio else _INICIO_ABERTO
+        fim = r.data_fim.toordinal() + 1 if r.data_fim else _FIM_ABERTO
+        if fim <= inicio:
+            continue
+        preco = Preco(r.lpu_id, r.item_id, r.valor_unitario, r.valor_classe, r.data_inicio, r.data_fim)
+        # Prioridade: vigência mais recente; empate → LPU atualizada por último (id desempata)
+        prioridade = (inicio, r.updated_at or datetime.min, str(r.lpu_id))
+        vigencias.setdefault((r.parceiro_id, r.servico_id), []).append((inicio, fim, prioridade, preco))
+        codigos[r.codigo] = r.servico_id
+
+    faixas: dict[UUID, dict[UUID, _Faixas]] = {}
+    for (parceiro_id, servico_id), lista in vigencias.items():
+        faixas.setdefault(parceiro_id, {})[servico_id] = _faixas(lista)
+    return TenantPrices(faixas, codigos)
+
+
+class PriceIndex:
+    def __init__(self, check_interval: float, max_tenants: int):
+        self._check_interval = check_interval
+        self._max_tenants = max_tenants
+        self._locks: dict[UUID, asyncio.Lock] = {}
+        self._generations: dict[UUID, int] = {}
+        self._global_generation = 0
+        # tenant → (geração, impressão digital, conferido em, índice); ordem = uso recente
+        self._current: OrderedDict[UUID, tuple[tuple, tuple, float, TenantPrices]] = OrderedDict()
+        self.builds = 0
+        self.hits = 0
+
+    def stats(self) -> dict:
+        return {
+            "tenants": len(self._current),
+            "precos": sum(entry[3].size for entry in self._current.values()),
+            "builds": self.builds,
+            "hits": self.hits,
+        }
+
+    def invalidate(self, tenant_id: Optional[UUID] = None) -> None:
+        """Invalida o índice do tenant (ou de todos, sem tenant_id)."""
+        if tenant_id is None:
+            self._global_generation += 1
+        else:
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+
+    def _generation(self, tenant_id: UUID) -> tuple:
+        return (self._global_generation, self._generations.get(tenant_id, 0))
+
+    def _fresh(self, tenant_id: UUID) -> Optional[TenantPrices]:
+        entry = self._current.get(tenant_id)
+        if entry is None:
+            return None
+        generation, _, checked_at, prices = entry
+        if generation != self._generation(tenant_id):
+            return None
+        if time.monotonic() - checked_at > self._check_interval:
+            return None
+        self._current.move_to_end(tenant_id)
+        return prices
+
+    async def get(self, db: AsyncSession, tenant_id: UUID) -> TenantPrices:
+        prices = self._fresh(tenant_id)
+        if prices is not None:
+            self.hits += 1
+            return prices
+
+        async with self._locks.setdefault(tenant_id, asyncio.Lock()):
+            prices = self._fresh(tenant_id)
+            if prices is not None:
+                self.hits += 1
+                return prices
+
+            generation = self._generation(tenant_id)
+            # Impressão digital antes dos dados (ver snapshot do catálogo)
+            fingerprint = await _fingerprint(db, tenant_id)
+            entry = self._current.get(tenant_id)
+            if entry is not None and entry[0] == generation and entry[1] == fingerprint:
+                prices = entry[3]
+                self.hits += 1
+            else:
+                prices = await _build(db, tenant_id)
+                self.builds += 1
+            self._current[tenant_id] = (generation, fingerprint, time.monotonic(), prices)
+            self._current.move_to_end(tenant_id)
+            while len(self._current) > self._max_tenants:
+                self._current.popitem(last=False)
+            return prices
+
+
+price_index = PriceIndex(
+    check_interval=settings.PRICE_INDEX_CHECK_SECONDS,
+    max_tenants=settings.PRICE_INDEX_MAX_TENANTS,
+)
+
+
+async def resolver_precos(
+    db: AsyncSession,
+    tenant_id: UUID,
+    consultas: Iterable[tuple[UUID, Optional[UUID], Optional[str], date]],
+) -> list[tuple[Optional[UUID], Optional[Preco]]]:
+    """
+    Resolve um lote de (parceiro_id, servico_id, servico_codigo, data).
+
+    O serviço é identificado pelo id ou, na falta dele, pelo código. Devolve,
+    na ordem das consultas, (servico_id resolvido, preço) — None quando não há.
+    """
+    prices = await price_index.get(db, tenant_id)
+    resultados = []
+    for parceiro_id, servico_id, codigo, data in consultas:
+        if servico_id is None and codigo is not None:
+            servico_id = prices.servico_id(codigo)
+        preco = prices.resolver(parceiro_id, servico_id, data) if servico_id else None
+        resultados.append((servico_id, preco))
+    return resultados
@@ -0,0 +1,41 @@
+"""
+Router — Snapshot do catálogo global
+
+Prefixo registrado em catalogo/__init__.py: /modules/catalogo/snapshot
+
+  GET /  → classes, unidades, serviços e materiais em uma resposta, com ETag.
+           Com If-None-Match igual à versão atual responde 304 sem corpo.
+"""
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import UserRole
+from app.database.connection import get_db
+from app.modules.catalogo.snapshot.service import catalog_snapshot
+from app.rbac.dependencies import require_roles
+
+router = APIRouter()
+
+_staff_up = require_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN, UserRole.MASTER)
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    return "*" in candidatos or etag in [c.removeprefix("W/") for c in candidatos]
+
+
+@router.get("/", tags=["Catalogo: Snapshot"])
+async def get_snapshot(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _=Depends(_staff_up),
+):
+    snapshot = await catalog_snapshot.get(db)
+    # private: a resposta exige autenticação; no-cache: sempre revalidar (barato via 304)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
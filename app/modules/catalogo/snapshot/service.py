@@ -0,0 +1,154 @@
+"""
+Snapshot versionado do catálogo global — classes, unidades, serviços e
+materiais — em memória do processo.
+
+O catálogo é global e quase só de leitura, mas todo picker da UI o consultava
+com listagens paginadas. O snapshot guarda o catálogo inteiro já serializado
+(corpo JSON pronto) e sua versão: o sha256 do conteúdo, usado como ETag forte.
+Como a versão depende só do conteúdo, todos os workers geram o mesmo ETag para
+o mesmo catálogo, e o cliente revalida com If-None-Match (304, sem corpo).
+
+Frescor:
+  - os services do catálogo chamam `catalog_snapshot.invalidate()` após cada
+    commit — o próximo acesso reconstrói;
+  - escritas feitas em outro worker são detectadas pela impressão digital
+    (count + max(updated_at) de cada tabela), conferida no máximo a cada
+    CATALOG_SNAPSHOT_CHECK_SECONDS com uma consulta de uma linha; só
+    reconstrói se ela mudar.
+
+Uma invalidação durante a reconstrução incrementa a geração; o snapshot
+montado antes dela ainda responde a requisição em curso, mas não é reutilizado.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.modules.catalogo.lpu.models import Classe, Servico, Unidade
+from app.modules.catalogo.lpu.schemas import ClasseResponse, ServicoResponse, UnidadeResponse
+from app.modules.catalogo.materiais.models import Material
+from app.modules.catalogo.materiais.schemas import MaterialResponse
+from app.utils.responses import success
+
+# (seção, model, schema, ordenação). Relacionamentos ficam de fora: serviços e
+# materiais referenciam classe/unidade pelo id, resolvido no cliente.
+_SECOES = [
+    ("classes", Classe, ClasseResponse, (Classe.nome, Classe.id)),
+    ("unidades", Unidade, UnidadeResponse, (Unidade.sigla, Unidade.id)),
+    ("servicos", Servico, ServicoResponse, (Servico.codigo, Servico.id)),
+    ("materiais", Material, MaterialResponse, (Material.codigo, Material.id)),
+]
+_SEM_RELACIONAMENTOS = {"classe", "unidade"}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: str
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+def _fingerprint_query():
+    colunas = []
+    for _, model, _, _ in _SECOES:
+        colunas.append(select(func.count()).select_from(model).scalar_subquery())
+        colunas.append(select(func.max(model.updated_at)).scalar_subquery())
+    return select(*colunas)
+
+
+async def _fingerprint(db: AsyncSession) -> tuple:
+    return tuple((await db.execute(_fingerprint_query())).one())
+
+
+async def _build(db: AsyncSession) -> Snapshot:
+    secoes = {}
+    for nome, model, schema, ordem in _SECOES:
+        rows = (await db.execute(select(model.__table__).order_by(*ordem))).mappings().all()
+        secoes[nome] = [
+            schema.model_validate(dict(r)).model_dump(mode="json", exclude=_SEM_RELACIONAMENTOS)
+            for r in rows
+        ]
+    conteudo = json.dumps(secoes, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    version = hashlib.sha256(conteudo.encode()).hexdigest()[:32]
+    body = json.dumps(
+        success("Catálogo.", {"version": version, **secoes}),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+    return Snapshot(version=version, body=body)
+
+
+class CatalogSnapshot:
+    def __init__(self, check_interval: float):
+        self._check_interval = check_interval
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        # (geração, impressão digital, conferido em, snapshot)
+        self._current: Optional[tuple[int, tuple, float, Snapshot]] = None
+        self.builds = 0
+        self.hits = 0
+
+    def stats(self) -> dict:
+        current = self._current[3] if self._current else None
+        return {
+            "version": current.version if current else None,
+            "bytes": len(current.body) if current else 0,
+            "builds": self.builds,
+            "hits": self.hits,
+        }
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    def _fresh(self) -> Optional[Snapshot]:
+        if self._current is None:
+            return None
+        generation, _, checked_at, snapshot = self._current
+        if generation != self._generation:
+            return None
+        if time.monotonic() - checked_at > self._check_interval:
+            return None
+        return snapshot
+
+    async def get(self, db: AsyncSession) -> Snapshot:
+        snapshot = self._fresh()
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+
+        async with self._lock:
+            # Outra requisição pode ter reconstruído enquanto esperávamos o lock
+            snapshot = self._fresh()
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+
+            generation = self._generation
+            # Impressão digital antes dos dados: uma escrita entre as duas
+            # leituras deixa a impressão "velha" e força nova reconstrução depois.
+            fingerprint = await _fingerprint(db)
+            # Sem escrita local (mesma geração) e mesma impressão: só renova a conferência
+            if (
+                self._current is not None
+                and self._current[0] == generation
+                and self._current[1] == fingerprint
+            ):
+                snapshot = self._current[3]
+                self.hits += 1
+            else:
+                snapshot = await _build(db)
+                self.builds += 1
+            self._current = (generation, fingerprint, time.monotonic(), snapshot)
+            return snapshot
+
+
+catalog_snapshot = CatalogSnapshot(check_interval=settings.CATALOG_SNAPSHOT_CHECK_SECONDS)
@@ -46,6 +46,14 @@ class Contract(Base):
     )
 
 
+class ContractCounter(Base):
+    """Último número de contrato emitido por tenant (alocado com upsert ... RETURNING)."""
+    __tablename__ = "contract_counters"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    last_numero = Column(Integer, nullable=False, default=0)
+
+
 class ContractServico(Base):
     __tablename__ = "contract_servicos"
     __table_args__ = (
@@ -1,15 +1,18 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
 from app.modules.contracts import schemas, service
 from app.modules.contracts.models import Contract, ContractStatus
 from app.rbac.dependencies import require_roles
 from app.rbac.tenant import get_user_tenant_ids
+from app.utils.pagination import PageParams, page_params
+from app.utils.export import ExportFormat, export_response
 from app.utils.responses import success
 
 router = APIRouter()
@@ -68,22 +71,29 @@ async def create_contract(
 
 @router.get("/")
 async def list_contracts(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     status: Optional[ContractStatus] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_staff_up),
 ):
     tenant_ids = get_user_tenant_ids(current_user)
-    contracts, total = await service.list_contracts(db, tenant_ids, page, per_page, status)
+    page = await service.list_contracts(db, tenant_ids, params, status)
     return success("Lista de contratos.", {
-        "results": [_to_response(c) for c in contracts],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.ContractListItem(**c) for c in page.items],
+        **page.meta(),
     })
 
 
+@router.get("/export")
+async def export_contracts(
+    formato: ExportFormat = ExportFormat.CSV,
+    status: Optional[ContractStatus] = None,
+    current_user: User = Depends(_staff_up),
+):
+    tenant_ids = get_user_tenant_ids(current_user)
+    return export_response(service.export_contracts_query(tenant_ids, status), formato, "contratos")
+
+
 @router.get("/{contract_id}")
 async def get_contract(
     contract_id: UUID,
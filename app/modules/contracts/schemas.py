@@ -65,3 +65,21 @@ class ContractResponse(BaseModel):
     logs: list[LogEntry] = []
 
     model_config = {"from_attributes": True}
+
+
+class ContractListItem(BaseModel):
+    """Projeção leve para a listagem — sem observações, logs e anexos."""
+    id: UUID
+    tenant_id: UUID
+    numero: Optional[int]
+    client_id: Optional[UUID]
+    estado: Optional[str]
+    cidade: Optional[str]
+    status: ContractStatus
+    start_date: Optional[date]
+    end_date: Optional[date]
+    created_by: Optional[UUID]
+    created_at: datetime
+    updated_at: datetime
+    servicos: list[ServicoInfo] = []
+    log_count: int = 0
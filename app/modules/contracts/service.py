@@ -1,14 +1,19 @@
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, true
+from sqlalchemy import JSON, BindParameter, Select, any_, delete, literal, literal_column, select, func, true
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, aggregate_order_by, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.modules.contracts.models import Contract, ContractServico, ContractLog, ContractStatus
+from app.modules.contracts.models import Contract, ContractCounter, ContractServico, ContractLog, ContractStatus
 from app.modules.contracts.schemas import ContractCreate, ContractUpdate
 from app.modules.catalogo.lpu.models import Servico
+from app.modules.payments.models import Payment
+from app.modules.reports.cache import dashboard_cache
+from app.tenants import stats as tenant_stats
+from app.utils.pagination import Page, PageParams, paginate
 
 
 def _tenant_filter(model, tenant_ids: list[UUID]):
@@ -31,6 +36,9 @@ async def _get_contract_full(db: AsyncSession, tenant_ids: list[UUID], contract_
             selectinload(Contract.logs),
             selectinload(Contract.anexos),
         )
+        # Recarrega as coleções mesmo se o contrato já estiver na sessão
+        # (serviços e logs são gravados por contract_id, não pelo relacionamento)
+        .execution_options(populate_existing=True)
     )
     contract = result.scalar_one_or_none()
     if not contract:
@@ -39,22 +47,72 @@ async def _get_contract_full(db: AsyncSession, tenant_ids: list[UUID], contract_
 
 
 async def _next_numero(db: AsyncSession, tenant_id: UUID) -> int:
-    """Returns the next sequential contract number for the tenant."""
-    result = await db.execute(
-        select(func.max(Contract.numero)).where(Contract.tenant_id == tenant_id)
+    """
+    Aloca o próximo número de contrato do tenant em `contract_counters`.
+
+    Upsert atômico com RETURNING, na transação do chamador: custo constante
+    (uma linha por tenant) e sem duplicidade sob criação concorrente — a linha
+    do contador fica travada até o commit/rollback do contrato.
+    """
+    stmt = (
+        pg_insert(ContractCounter)
+        .values(tenant_id=tenant_id, last_numero=1)
+        .on_conflict_do_update(
+            index_elements=[ContractCounter.tenant_id],
+            set_={"last_numero": ContractCounter.last_numero + 1},
+        )
+        .returning(ContractCounter.last_numero)
     )
-    current_max = result.scalar() or 0
-    return current_max + 1
+    return (await db.execute(stmt)).scalar_one()
+
+
+def _uuid_array(ids) -> BindParameter:
+    """Lista de UUIDs como um único parâmetro array (para `= ANY(...)`)."""
+    return literal(list(ids), ARRAY(PG_UUID(as_uuid=True)))
 
 
 async def _validate_servicos(db: AsyncSession, servico_ids: list[UUID]) -> None:
-    """Validates that all servico_ids exist."""
+    """Validates that all servico_ids exist (single query)."""
+    result = await db.execute(
+        select(Servico.id).where(Servico.id == any_(_uuid_array(set(servico_ids))))
+    )
+    found = set(result.scalars().all())
     for sid in servico_ids:
-        result = await db.execute(select(Servico).where(Servico.id == sid))
-        if not result.scalar_one_or_none():
+        if sid not in found:
             raise HTTPException(status_code=404, detail=f"Serviço {sid} não encontrado.")
 
 
+async def _replace_servicos(db: AsyncSession, contract: Contract, servico_ids: list[UUID]) -> bool:
+    """
+    Aplica a diferença entre os serviços atuais e `servico_ids`: um DELETE com
+    `= ANY(...)` para os removidos e um INSERT ... ON CONFLICT DO NOTHING para os
+    novos. Retorna True se algo mudou.
+    """
+    current = {cs.servico_id for cs in contract.servicos}
+    desired = list(dict.fromkeys(servico_ids))
+    to_add = [sid for sid in desired if sid not in current]
+    to_remove = current - set(desired)
+
+    if to_remove:
+        await db.execute(
+            delete(ContractServico).where(
+                ContractServico.contract_id == contract.id,
+                ContractServico.servico_id == any_(_uuid_array(to_remove)),
+            )
+        )
+    if to_add:
+        now = datetime.utcnow()
+        await db.execute(
+            pg_insert(ContractServico)
+            .values([
+                {"id": uuid4(), "contract_id": contract.id, "servico_id": sid, "created_at": now}
+                for sid in to_add
+            ])
+            .on_conflict_do_nothing(index_elements=["contract_id", "servico_id"])
+        )
+    return bool(to_add or to_remove)
+
+
 async def create_contract(
     db: AsyncSession, tenant_id: UUID, user_id: UUID, data: ContractCreate
 ) -> Contract:
@@ -75,8 +133,9 @@ async def create_contract(
     )
     db.add(contract)
     await db.flush()  # get contract.id before adding children
+    await tenant_stats.bump(db, tenant_id, [(tenant_stats.metric("contracts", contract.status), 1, 0)])
 
-    for sid in data.servico_ids:
+    for sid in dict.fromkeys(data.servico_ids):
         db.add(ContractServico(contract_id=contract.id, servico_id=sid))
 
     db.add(ContractLog(
@@ -87,37 +146,111 @@ async def create_contract(
     ))
 
     await db.commit()
+    dashboard_cache.invalidate(tenant_id)
     return await _get_contract_full(db, [tenant_id], contract.id)
 
 
 async def list_contracts(
     db: AsyncSession,
     tenant_ids: list[UUID],
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     status: ContractStatus | None = None,
-) -> tuple[list[Contract], int]:
+) -> Page:
+    """
+    Listagem em modo projeção: só as colunas da tabela, os serviços (id, código,
+    atividade) agregados em subquery e a contagem de logs — o grafo completo
+    (logs, anexos) é carregado apenas em `get_contract`.
+    """
+    # Mesmo formato de ServicoInfo (id, codigo, atividade) — a tela de contratos lista as atividades
+    servicos = (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(
+                # Chaves inline: json_build_object é variádico "any" e não infere o tipo de bind params
+                func.json_build_object(
+                    literal_column("'id'"), Servico.id,
+                    literal_column("'codigo'"), Servico.codigo,
+                    literal_column("'atividade'"), Servico.atividade,
+                ),
+                Servico.codigo,
+            )),
+            literal_column("'[]'::json"),
+            type_=JSON,
+        ))
+        .select_from(ContractServico)
+        .join(Servico, Servico.id == ContractServico.servico_id)
+        .where(ContractServico.contract_id == Contract.id)
+        .correlate(Contract)
+        .scalar_subquery()
+    )
+    log_count = (
+        select(func.count())
+        .select_from(ContractLog)
+        .where(ContractLog.contract_id == Contract.id)
+        .correlate(Contract)
+        .scalar_subquery()
+    )
     query = (
-        select(Contract)
-        .where(_tenant_filter(Contract, tenant_ids))
-        .options(
-            selectinload(Contract.servicos).selectinload(ContractServico.servico),
-            selectinload(Contract.logs),
+        select(
+            Contract.id,
+            Contract.tenant_id,
+            Contract.numero,
+            Contract.client_id,
+            Contract.estado,
+            Contract.cidade,
+            Contract.status,
+            Contract.start_date,
+            Contract.end_date,
+            Contract.created_by,
+            Contract.created_at,
+            Contract.updated_at,
+            servicos.label("servicos"),
+            log_count.label("log_count"),
         )
+        .where(_tenant_filter(Contract, tenant_ids))
     )
-    count_query = select(func.count()).select_from(Contract).where(_tenant_filter(Contract, tenant_ids))
 
     if status:
         query = query.where(Contract.status == status)
-        count_query = count_query.where(Contract.status == status)
 
-    total = (await db.execute(count_query)).scalar()
-    contracts = (
-        await db.execute(
-            query.order_by(Contract.numero.desc()).offset((page - 1) * per_page).limit(per_page)
+    # numero DESC com NULLs primeiro (ordem padrão do Postgres) → coalesce para o maior int.
+    # Sentinela inline (não bind param) para casar com ix_contracts_tenant_numero (migration 017)
+    order = [(func.coalesce(Contract.numero, literal_column("2147483647")), True), (Contract.id, True)]
+    return await paginate(db, query, order, params)
+
+
+def export_contracts_query(tenant_ids: list[UUID], status: ContractStatus | None = None) -> Select:
+    """Colunas da exportação (app/utils/export.py), na ordem da listagem."""
+    servico_codigos = (
+        select(func.string_agg(Servico.codigo, aggregate_order_by(literal_column("','"), Servico.codigo)))
+        .select_from(ContractServico)
+        .join(Servico, Servico.id == ContractServico.servico_id)
+        .where(ContractServico.contract_id == Contract.id)
+        .correlate(Contract)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            Contract.numero,
+            Contract.status,
+            Contract.estado,
+            Contract.cidade,
+            Contract.start_date,
+            Contract.end_date,
+            servico_codigos.label("servicos"),
+            Contract.notes,
+            Contract.client_id,
+            Contract.id,
+            Contract.tenant_id,
+            Contract.created_at,
+            Contract.updated_at,
         )
-    ).scalars().all()
-    return contracts, total
+        .where(_tenant_filter(Contract, tenant_ids))
+    )
+    if status:
+        query = query.where(Contract.status == status)
+    return query.order_by(
+        func.coalesce(Contract.numero, literal_column("2147483647")).desc(), Contract.id.desc(),
+    )
 
 
 async def get_contract(db: AsyncSession, tenant_ids: list[UUID], contract_id: UUID) -> Contract:
@@ -141,6 +274,9 @@ async def update_contract(
         contract.cidade = data.cidade
         changes.append("cidade")
     if data.status is not None and data.status != contract.status:
+        await tenant_stats.bump(
+            db, contract.tenant_id, tenant_stats.move("contracts", contract.status, data.status)
+        )
         contract.status = data.status
         changes.append(f"status → {data.status}")
     if data.start_date is not None and data.start_date != contract.start_date:
@@ -155,13 +291,8 @@ async def update_contract(
 
     if data.servico_ids is not None:
         await _validate_servicos(db, data.servico_ids)
-        # Remove existing and re-add
-        for cs in list(contract.servicos):
-            await db.delete(cs)
-        await db.flush()
-        for sid in data.servico_ids:
-            db.add(ContractServico(contract_id=contract.id, servico_id=sid))
-        changes.append("serviços")
+        if await _replace_servicos(db, contract, data.servico_ids):
+            changes.append("serviços")
 
     if changes:
         contract.updated_at = datetime.utcnow()
@@ -173,6 +304,7 @@ async def update_contract(
         ))
 
     await db.commit()
+    dashboard_cache.invalidate(contract.tenant_id)
     return await _get_contract_full(db, tenant_ids, contract_id)
 
 
@@ -188,5 +320,17 @@ async def delete_contract(
         descricao="Contrato excluído.",
     ))
     await db.flush()
+    # Os pagamentos do contrato saem junto (cascade) — os contadores deles também.
+    # FOR UPDATE: um mark_paid/cancel concorrente não muda o status entre a leitura e o delete
+    payments = await db.execute(
+        select(Payment.status, Payment.amount)
+        .where(Payment.contract_id == contract.id)
+        .with_for_update()
+    )
+    await tenant_stats.bump(db, contract.tenant_id, [
+        (tenant_stats.metric("contracts", contract.status), -1, 0),
+        *((tenant_stats.metric("payments", status), -1, -amount) for status, amount in payments.all()),
+    ])
     await db.delete(contract)
     await db.commit()
+    dashboard_cache.invalidate(contract.tenant_id)
@@ -4,10 +4,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
 from app.modules.materials import schemas, service
 from app.rbac.dependencies import require_roles
 from app.rbac.tenant import get_user_tenant_ids
+from app.utils.pagination import PageParams, page_params
 from app.utils.responses import success
 
 router = APIRouter()
@@ -34,19 +36,16 @@ async def create_material(
 
 @router.get("/")
 async def list_materials(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     low_stock_only: bool = Query(False),
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_staff_up),
 ):
     tenant_ids = get_user_tenant_ids(current_user)
-    materials, total = await service.list_materials(db, tenant_ids, page, per_page, low_stock_only)
+    page = await service.list_materials(db, tenant_ids, params, low_stock_only)
     return success("Lista de materiais.", {
-        "results": [schemas.MaterialResponse.model_validate(m) for m in materials],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.MaterialResponse.model_validate(m) for m in page.items],
+        **page.meta(),
     })
 
 
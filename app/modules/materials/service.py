@@ -3,11 +3,14 @@ from decimal import Decimal
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, true
+from sqlalchemy import select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.materials.models import Material
 from app.modules.materials.schemas import MaterialCreate, MaterialUpdate
+from app.modules.reports.cache import dashboard_cache
+from app.tenants import stats as tenant_stats
+from app.utils.pagination import Page, PageParams, paginate
 
 
 def _tenant_filter(tenant_ids: list[UUID]):
@@ -16,6 +19,17 @@ def _tenant_filter(tenant_ids: list[UUID]):
     return true()
 
 
+def _is_low(material: Material) -> bool:
+    return material.quantity <= material.min_quantity
+
+
+def _low_stock_change(was_low: bool, material: Material) -> list[tenant_stats.Change]:
+    is_low = _is_low(material)
+    if is_low == was_low:
+        return []
+    return [(tenant_stats.metric("materials", "low_stock"), 1 if is_low else -1, 0)]
+
+
 async def create_material(db: AsyncSession, tenant_id: UUID, data: MaterialCreate) -> Material:
     material = Material(
         tenant_id=tenant_id,
@@ -26,7 +40,12 @@ async def create_material(db: AsyncSession, tenant_id: UUID, data: MaterialCreat
         min_quantity=data.min_quantity,
     )
     db.add(material)
+    await tenant_stats.bump(db, tenant_id, [
+        (tenant_stats.metric("materials", "total"), 1, 0),
+        *_low_stock_change(False, material),
+    ])
     await db.commit()
+    dashboard_cache.invalidate(tenant_id)
     await db.refresh(material)
     return material
 
@@ -34,24 +53,15 @@ async def create_material(db: AsyncSession, tenant_id: UUID, data: MaterialCreat
 async def list_materials(
     db: AsyncSession,
     tenant_ids: list[UUID],
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     low_stock_only: bool = False,
-) -> tuple[list[Material], int]:
+) -> Page:
     query = select(Material).where(_tenant_filter(tenant_ids))
-    count_query = select(func.count()).select_from(Material).where(_tenant_filter(tenant_ids))
 
     if low_stock_only:
         query = query.where(Material.quantity <= Material.min_quantity)
-        count_query = count_query.where(Material.quantity <= Material.min_quantity)
 
-    total = (await db.execute(count_query)).scalar()
-    materials = (
-        await db.execute(
-            query.order_by(Material.name).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return materials, total
+    return await paginate(db, query, [(Material.name, False), (Material.id, False)], params)
 
 
 async def get_material(db: AsyncSession, tenant_ids: list[UUID], material_id: UUID) -> Material:
@@ -68,6 +78,7 @@ async def update_material(
     db: AsyncSession, tenant_ids: list[UUID], material_id: UUID, data: MaterialUpdate
 ) -> Material:
     material = await get_material(db, tenant_ids, material_id)
+    was_low = _is_low(material)
 
     if data.name is not None:
         material.name = data.name
@@ -78,8 +89,10 @@ async def update_material(
     if data.min_quantity is not None:
         material.min_quantity = data.min_quantity
 
+    await tenant_stats.bump(db, material.tenant_id, _low_stock_change(was_low, material))
     material.updated_at = datetime.utcnow()
     await db.commit()
+    dashboard_cache.invalidate(material.tenant_id)
     await db.refresh(material)
     return material
 
@@ -91,8 +104,11 @@ async def adjust_stock(
     new_qty = material.quantity + delta
     if new_qty < 0:
         raise HTTPException(status_code=422, detail="Estoque não pode ficar negativo")
+    was_low = _is_low(material)
     material.quantity = new_qty
+    await tenant_stats.bump(db, material.tenant_id, _low_stock_change(was_low, material))
     material.updated_at = datetime.utcnow()
     await db.commit()
+    dashboard_cache.invalidate(material.tenant_id)
     await db.refresh(material)
     return material
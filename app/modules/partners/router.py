@@ -1,53 +1,66 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole, UserStatus
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
 from app.modules.partners import schemas, service
 from app.rbac.dependencies import require_roles
+from app.utils.pagination import PageParams, picker_page_params
 from app.utils.responses import success
+from app.utils.search import search_limit
 
 router = APIRouter()
 
 _admin_or_master = require_roles(UserRole.ADMIN, UserRole.MASTER)
 
 
+def _list_item(u: User) -> schemas.PartnerListItem:
+    profile = u.partner_profile
+    return schemas.PartnerListItem(
+        id=u.id,
+        profile_id=profile.id if profile else None,
+        name=u.name,
+        email=u.email,
+        status=u.status,
+        tenant_id=u.tenant_id,
+        is_active=u.is_active,
+        created_at=u.created_at,
+        phone=profile.phone if profile else None,
+        cpf_cnpj=profile.cpf_cnpj if profile else None,
+        address_city=profile.address_city if profile else None,
+    )
+
+
 @router.get("/", response_model=None)
 async def list_partners(
-    page: int = 1,
-    per_page: int = 20,
     search: Optional[str] = None,
     status: Optional[UserStatus] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(picker_page_params),
+    db: AsyncSession = Depends(get_read_db),
     admin: User = Depends(_admin_or_master),
 ):
-    partners, total = await service.list_partners(db, admin, page, per_page, search, status)
-
-    results = []
-    for u in partners:
-        profile = u.partner_profile
-        results.append(schemas.PartnerListItem(
-            id=u.id,
-            profile_id=profile.id if profile else None,
-            name=u.name,
-            email=u.email,
-            status=u.status,
-            tenant_id=u.tenant_id,
-            is_active=u.is_active,
-            created_at=u.created_at,
-            phone=profile.phone if profile else None,
-            cpf_cnpj=profile.cpf_cnpj if profile else None,
-            address_city=profile.address_city if profile else None,
-        ))
-
+    page = await service.list_partners(db, admin, params, search, status)
     return success("Lista de parceiros.", {
-        "results": results,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [_list_item(u) for u in page.items],
+        **page.meta(),
+    })
+
+
+@router.get("/search", response_model=None)
+async def search_partners(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Depends(search_limit),
+    db: AsyncSession = Depends(get_read_db),
+    admin: User = Depends(_admin_or_master),
+):
+    hits = await service.search_partners(db, admin, q, limit)
+    return success("Busca de parceiros.", {
+        "q": q,
+        "results": [{**_list_item(u).model_dump(), "score": score} for u, score in hits],
     })
 
 
@@ -5,13 +5,16 @@ from uuid import UUID
 import bcrypt
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.models import AuditLog, User, UserRole, UserStatus
+from app.auth.audit import audit_writer
+from app.auth.models import User, UserRole, UserStatus
 from app.modules.partners.models import PartnerProfile
 from app.modules.partners.schemas import PartnerCreate, PartnerUpdate
+from app.utils.pagination import Page, PageParams, paginate
+from app.utils.search import contains_filter, search
 
 logger = logging.getLogger(__name__)
 _BCRYPT_ROUNDS = 12
@@ -59,60 +62,60 @@ async def create_partner(db: AsyncSession, data: PartnerCreate, admin: User) ->
     )
     db.add(profile)
 
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="CREATE_PARTNER",
         details={"partner_email": data.email, "tenant_id": str(data.tenant_id)},
-    ))
-    await db.commit()
+    )
     await db.refresh(user)
     return user
 
 
-async def list_partners(
-    db: AsyncSession,
-    admin: User,
-    page: int = 1,
-    per_page: int = 20,
-    search: str | None = None,
-    status: UserStatus | None = None,
-) -> tuple[list[User], int]:
+def _partners_query(admin: User) -> Select | None:
+    """Parceiros visíveis para `admin` (None → nenhum)."""
     query = (
         select(User)
         .options(selectinload(User.partner_profile))
         .where(User.role == UserRole.PARTNER, User.is_active == True)
     )
-    count_query = (
-        select(func.count())
-        .select_from(User)
-        .where(User.role == UserRole.PARTNER, User.is_active == True)
-    )
 
     # MASTER vê todos; demais roles filtram pelas suas empresas
     if admin.role != UserRole.MASTER:
         tenant_ids = [t.id for t in admin.tenants]
-        if tenant_ids:
-            query = query.where(User.tenant_id.in_(tenant_ids))
-            count_query = count_query.where(User.tenant_id.in_(tenant_ids))
-        else:
+        if not tenant_ids:
             # Usuário sem empresa → não vê nenhum parceiro
-            return [], 0
+            return None
+        query = query.where(User.tenant_id.in_(tenant_ids))
+    return query
+
+
+async def list_partners(
+    db: AsyncSession,
+    admin: User,
+    params: PageParams,
+    search: str | None = None,
+    status: UserStatus | None = None,
+) -> Page:
+    query = _partners_query(admin)
+    if query is None:
+        return Page.empty(params)
 
     if status:
         query = query.where(User.status == status)
-        count_query = count_query.where(User.status == status)
 
     if search:
-        like = f"%{search}%"
-        query = query.where(User.name.ilike(like) | User.email.ilike(like))
-        count_query = count_query.where(User.name.ilike(like) | User.email.ilike(like))
+        query = query.where(contains_filter([User.name, User.email], search))
 
-    total = (await db.execute(count_query)).scalar()
-    users = (await db.execute(
-        query.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
-    )).scalars().all()
+    return await paginate(db, query, [(User.created_at, True), (User.id, True)], params)
 
-    return users, total
+
+async def search_partners(db: AsyncSession, admin: User, termo: str, limit: int) -> list[tuple[User, float]]:
+    """Busca por nome/e-mail ranqueada por similaridade (ver app/utils/search.py)."""
+    query = _partners_query(admin)
+    if query is None:
+        return []
+    return await search(db, query, [User.name, User.email], termo, limit)
 
 
 async def get_partner(db: AsyncSession, partner_id: UUID, admin: User) -> User:
@@ -157,12 +160,12 @@ async def update_partner(db: AsyncSession, partner_id: UUID, data: PartnerUpdate
 
     profile.updated_at = datetime.utcnow()
 
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="UPDATE_PARTNER",
         details={"partner_id": str(partner_id)},
-    ))
-    await db.commit()
+    )
     await db.refresh(user)
     return user
 
@@ -171,12 +174,12 @@ async def block_partner(db: AsyncSession, partner_id: UUID, admin: User, reason:
     user = await get_partner(db, partner_id, admin)
     user.status = UserStatus.BLOCKED
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="BLOCK_PARTNER",
         details={"partner_id": str(partner_id), "reason": reason},
-    ))
-    await db.commit()
+    )
     await db.refresh(user)
     return user
 
@@ -187,11 +190,11 @@ async def unblock_partner(db: AsyncSession, partner_id: UUID, admin: User) -> Us
     user.login_attempts = 0
     user.locked_until = None
     user.updated_at = datetime.utcnow()
-    db.add(AuditLog(
+    await db.commit()
+    audit_writer.record(
         user_id=admin.id,
         action="UNBLOCK_PARTNER",
         details={"partner_id": str(partner_id)},
-    ))
-    await db.commit()
+    )
     await db.refresh(user)
     return user
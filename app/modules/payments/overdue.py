@@ -0,0 +1,79 @@
+"""
+Job periódico que marca pagamentos vencidos (PENDING com due_date < hoje).
+
+Roda `service.sync_overdue` para todas as empresas a cada
+OVERDUE_SWEEP_INTERVAL_SECONDS, em lotes de OVERDUE_SWEEP_BATCH_SIZE — o
+`POST /modules/payments/sync-overdue` continua disponível para forçar uma
+execução restrita às empresas do usuário.
+
+Ciclo de vida: `start()` e `stop()` no lifespan (app/main.py).
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from app.config.settings import settings
+from app.database.connection import AsyncSessionLocal
+from app.modules.payments.service import sync_overdue
+
+logger = logging.getLogger(__name__)
+
+
+class OverdueSweeper:
+    def __init__(self, interval: float, batch_size: int):
+        self._interval = interval
+        self._batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self.updated = 0
+        self.last_updated: Optional[int] = None
+        self.last_run: Optional[datetime] = None
+
+    def stats(self) -> dict:
+        return {
+            "updated": self.updated,
+            "last_updated": self.last_updated,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run(), name="overdue-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.sweep()
+            except Exception as exc:
+                logger.error("Falha ao marcar pagamentos vencidos: %s", exc)
+            try:
+                await asyncio.wait_for(self._stop.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sweep(self) -> int:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            count = await sync_overdue(session, [], batch_size=self._batch_size)
+        self.updated += count
+        self.last_updated = count
+        self.last_run = now
+        if count:
+            logger.info("%d pagamento(s) marcado(s) como vencido(s)", count)
+        return count
+
+
+overdue_sweeper = OverdueSweeper(
+    interval=settings.OVERDUE_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.OVERDUE_SWEEP_BATCH_SIZE,
+)
@@ -1,15 +1,19 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
+from app.config.settings import settings
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
 from app.modules.payments import schemas, service
 from app.modules.payments.models import PaymentStatus
 from app.rbac.dependencies import require_roles
 from app.rbac.tenant import get_user_tenant_ids
+from app.utils.pagination import PageParams, page_params
+from app.utils.export import ExportFormat, export_response
 from app.utils.responses import success
 
 router = APIRouter()
@@ -36,25 +40,32 @@ async def create_payment(
 
 @router.get("/")
 async def list_payments(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     status: Optional[PaymentStatus] = None,
     contract_id: Optional[UUID] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_staff_up),
 ):
     tenant_ids = get_user_tenant_ids(current_user)
-    payments, total = await service.list_payments(
-        db, tenant_ids, page, per_page, status, contract_id
-    )
+    page = await service.list_payments(db, tenant_ids, params, status, contract_id)
     return success("Lista de pagamentos.", {
-        "results": [schemas.PaymentResponse.model_validate(p) for p in payments],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.PaymentResponse.model_validate(p) for p in page.items],
+        **page.meta(),
     })
 
 
+@router.get("/export")
+async def export_payments(
+    formato: ExportFormat = ExportFormat.CSV,
+    status: Optional[PaymentStatus] = None,
+    contract_id: Optional[UUID] = None,
+    current_user: User = Depends(_staff_up),
+):
+    tenant_ids = get_user_tenant_ids(current_user)
+    query = service.export_payments_query(tenant_ids, status, contract_id)
+    return export_response(query, formato, "pagamentos")
+
+
 @router.get("/{payment_id}")
 async def get_payment(
     payment_id: UUID,
@@ -107,5 +118,5 @@ async def sync_overdue(
     current_user: User = Depends(_manager_up),
 ):
     tenant_ids = get_user_tenant_ids(current_user)
-    count = await service.sync_overdue(db, tenant_ids)
+    count = await service.sync_overdue(db, tenant_ids, batch_size=settings.OVERDUE_SWEEP_BATCH_SIZE)
     return success(f"{count} pagamento(s) marcado(s) como vencido(s).", {"updated": count})
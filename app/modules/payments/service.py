@@ -2,11 +2,15 @@ from datetime import datetime, date
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, true
+from sqlalchemy import Select, select, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.modules.contracts.models import Contract
 from app.modules.payments.models import Payment, PaymentStatus
 from app.modules.payments.schemas import PaymentCreate, PaymentUpdate, PaymentMarkPaid
+from app.modules.reports.cache import dashboard_cache
+from app.tenants import stats as tenant_stats
+from app.utils.pagination import Page, PageParams, paginate
 
 
 def _tenant_filter(tenant_ids: list[UUID]):
@@ -25,7 +29,9 @@ async def create_payment(db: AsyncSession, tenant_id: UUID, data: PaymentCreate)
         notes=data.notes,
     )
     db.add(payment)
+    await tenant_stats.bump(db, tenant_id, [(tenant_stats.metric("payments", PaymentStatus.PENDING), 1, data.amount)])
     await db.commit()
+    dashboard_cache.invalidate(tenant_id)
     await db.refresh(payment)
     return payment
 
@@ -33,28 +39,49 @@ async def create_payment(db: AsyncSession, tenant_id: UUID, data: PaymentCreate)
 async def list_payments(
     db: AsyncSession,
     tenant_ids: list[UUID],
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     status: PaymentStatus | None = None,
     contract_id: UUID | None = None,
-) -> tuple[list[Payment], int]:
+) -> Page:
     query = select(Payment).where(_tenant_filter(tenant_ids))
-    count_query = select(func.count()).select_from(Payment).where(_tenant_filter(tenant_ids))
 
     if status:
         query = query.where(Payment.status == status)
-        count_query = count_query.where(Payment.status == status)
     if contract_id:
         query = query.where(Payment.contract_id == contract_id)
-        count_query = count_query.where(Payment.contract_id == contract_id)
 
-    total = (await db.execute(count_query)).scalar()
-    payments = (
-        await db.execute(
-            query.order_by(Payment.due_date.desc()).offset((page - 1) * per_page).limit(per_page)
+    return await paginate(db, query, [(Payment.due_date, True), (Payment.id, True)], params)
+
+
+def export_payments_query(
+    tenant_ids: list[UUID],
+    status: PaymentStatus | None = None,
+    contract_id: UUID | None = None,
+) -> Select:
+    """Colunas da exportação (app/utils/export.py), na ordem da listagem."""
+    query = (
+        select(
+            Contract.numero.label("contrato_numero"),
+            Payment.reference,
+            Payment.amount,
+            Payment.due_date,
+            Payment.status,
+            Payment.paid_at,
+            Payment.notes,
+            Payment.contract_id,
+            Payment.id,
+            Payment.tenant_id,
+            Payment.created_at,
+            Payment.updated_at,
         )
-    ).scalars().all()
-    return payments, total
+        .join(Contract, Contract.id == Payment.contract_id)
+        .where(_tenant_filter(tenant_ids))
+    )
+    if status:
+        query = query.where(Payment.status == status)
+    if contract_id:
+        query = query.where(Payment.contract_id == contract_id)
+    return query.order_by(Payment.due_date.desc(), Payment.id.desc())
 
 
 async def get_payment(db: AsyncSession, tenant_ids: list[UUID], payment_id: UUID) -> Payment:
@@ -76,6 +103,10 @@ async def update_payment(
         raise HTTPException(status_code=422, detail="Pagamento já quitado não pode ser alterado")
 
     if data.amount is not None:
+        await tenant_stats.bump(
+            db, payment.tenant_id,
+            [(tenant_stats.metric("payments", payment.status), 0, data.amount - payment.amount)],
+        )
         payment.amount = data.amount
     if data.due_date is not None:
         payment.due_date = data.due_date
@@ -86,6 +117,7 @@ async def update_payment(
 
     payment.updated_at = datetime.utcnow()
     await db.commit()
+    dashboard_cache.invalidate(payment.tenant_id)
     await db.refresh(payment)
     return payment
 
@@ -100,10 +132,15 @@ async def mark_paid(
     if payment.status == PaymentStatus.CANCELLED:
         raise HTTPException(status_code=422, detail="Pagamento cancelado não pode ser quitado")
 
+    await tenant_stats.bump(
+        db, payment.tenant_id,
+        tenant_stats.move("payments", payment.status, PaymentStatus.PAID, payment.amount),
+    )
     payment.status = PaymentStatus.PAID
     payment.paid_at = data.paid_at or datetime.utcnow()
     payment.updated_at = datetime.utcnow()
     await db.commit()
+    dashboard_cache.invalidate(payment.tenant_id)
     await db.refresh(payment)
     return payment
 
@@ -114,26 +151,60 @@ async def cancel_payment(db: AsyncSession, tenant_ids: list[UUID], payment_id: U
     if payment.status == PaymentStatus.PAID:
         raise HTTPException(status_code=422, detail="Pagamento já quitado não pode ser cancelado")
 
+    await tenant_stats.bump(
+        db, payment.tenant_id,
+        tenant_stats.move("payments", payment.status, PaymentStatus.CANCELLED, payment.amount),
+    )
     payment.status = PaymentStatus.CANCELLED
     payment.updated_at = datetime.utcnow()
     await db.commit()
+    dashboard_cache.invalidate(payment.tenant_id)
     await db.refresh(payment)
     return payment
 
 
-async def sync_overdue(db: AsyncSession, tenant_ids: list[UUID]) -> int:
-    """Marca como OVERDUE todos os pagamentos PENDING com due_date < hoje."""
+async def sync_overdue(db: AsyncSession, tenant_ids: list[UUID], batch_size: int = 1_000) -> int:
+    """
+    Marca como OVERDUE todos os pagamentos PENDING com due_date < hoje.
+
+    UPDATE set-based em lotes de `batch_size` (commit por lote, linhas travadas
+    por outra transação são puladas e ficam para a próxima execução) — nenhum
+    objeto é carregado na sessão. Retorna o número de pagamentos alterados.
+    """
     today = date.today()
-    result = await db.execute(
-        select(Payment).where(
-            _tenant_filter(tenant_ids),
-            Payment.status == PaymentStatus.PENDING,
-            Payment.due_date < today,
+    total = 0
+    while True:
+        batch = (
+            select(Payment.id)
+            .where(
+                _tenant_filter(tenant_ids),
+                Payment.status == PaymentStatus.PENDING,
+                Payment.due_date < today,
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
         )
-    )
-    payments = result.scalars().all()
-    for p in payments:
-        p.status = PaymentStatus.OVERDUE
-        p.updated_at = datetime.utcnow()
-    await db.commit()
-    return len(payments)
+        result = await db.execute(
+            update(Payment)
+            .where(Payment.id.in_(batch.scalar_subquery()))
+            .values(status=PaymentStatus.OVERDUE, updated_at=datetime.utcnow())
+            .returning(Payment.tenant_id, Payment.amount)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        per_tenant: dict[UUID, list] = {}
+        for tenant_id, amount in rows:
+            acc = per_tenant.setdefault(tenant_id, [0, 0])
+            acc[0] += 1
+            acc[1] += amount
+        for tenant_id, (qty, amount) in sorted(per_tenant.items(), key=lambda item: str(item[0])):
+            await tenant_stats.bump(db, tenant_id, [
+                (tenant_stats.metric("payments", PaymentStatus.PENDING), -qty, -amount),
+                (tenant_stats.metric("payments", PaymentStatus.OVERDUE), qty, amount),
+            ])
+        await db.commit()
+        dashboard_cache.invalidate_many(per_tenant)
+        updated = len(rows)
+        total += updated
+        if updated < batch_size:
+            return total
@@ -2,10 +2,13 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.produttivo.config_models import ProduttivoConfig
+from app.modules.catalogo.lpu.models import Servico
+from app.modules.produttivo.config_models import ProduttivoConfig, ProduttivoServico
+from app.modules.produttivo.reports.atividades_usuario import METRICAS
 
 
 async def get_or_create_config(db: AsyncSession, tenant_id: UUID) -> ProduttivoConfig:
@@ -51,3 +54,57 @@ async def get_config_or_404(db: AsyncSession, tenant_id: UUID) -> ProduttivoConf
             detail="Cookie do Produttivo não configurado. Acesse Configurações → Produttivo.",
         )
     return config
+
+
+async def get_mapa_servicos(db: AsyncSession, tenant_id: UUID) -> dict[str, Servico]:
+    """Métrica de produção → Serviço que a precifica (só as mapeadas)."""
+    result = await db.execute(
+        select(ProduttivoServico.metrica, Servico)
+        .join(Servico, Servico.id == ProduttivoServico.servico_id)
+        .where(ProduttivoServico.tenant_id == tenant_id)
+    )
+    return {metrica: servico for metrica, servico in result.all()}
+
+
+async def save_mapa_servicos(
+    db: AsyncSession,
+    tenant_id: UUID,
+    mapeamento: dict[str, str | None],
+) -> dict[str, Servico]:
+    """Grava métrica → código do serviço; None remove o mapeamento da métrica."""
+    if tenant_id is None:
+        raise HTTPException(status_code=400, detail="Usuário não está associado a nenhuma empresa.")
+    desconhecidas = set(mapeamento) - set(METRICAS)
+    if desconhecidas:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Métricas desconhecidas: {', '.join(sorted(desconhecidas))}. Use: {', '.join(METRICAS)}.",
+        )
+
+    codigos = {c for c in mapeamento.values() if c}
+    servicos = {}
+    if codigos:
+        result = await db.execute(select(Servico).where(Servico.codigo.in_(codigos)))
+        servicos = {s.codigo: s for s in result.scalars()}
+    faltando = codigos - set(servicos)
+    if faltando:
+        raise HTTPException(status_code=404, detail=f"Serviços não encontrados: {', '.join(sorted(faltando))}.")
+
+    remover = [m for m, c in mapeamento.items() if not c]
+    if remover:
+        await db.execute(delete(ProduttivoServico).where(
+            ProduttivoServico.tenant_id == tenant_id,
+            ProduttivoServico.metrica.in_(remover),
+        ))
+    valores = [
+        {"tenant_id": tenant_id, "metrica": m, "servico_id": servicos[c].id, "updated_at": datetime.utcnow()}
+        for m, c in mapeamento.items() if c
+    ]
+    if valores:
+        stmt = pg_insert(ProduttivoServico).values(valores)
+        await db.execute(stmt.on_conflict_do_update(
+            constraint="uq_produttivo_servicos_tenant_metrica",
+            set_={"servico_id": stmt.excluded.servico_id, "updated_at": stmt.excluded.updated_at},
+        ))
+    await db.commit()
+    return await get_mapa_servicos(db, tenant_id)
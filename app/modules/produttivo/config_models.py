@@ -24,3 +24,21 @@ class ProduttivoConfig(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     tenant = relationship("Tenant")
+
+
+class ProduttivoServico(Base):
+    """Serviço do catálogo que precifica uma métrica de produção (cabo_m, ceo...) no tenant."""
+    __tablename__ = "produttivo_servicos"
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "metrica", name="uq_produttivo_servicos_tenant_metrica"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    metrica = Column(String(20), nullable=False)
+    # Serviço removido do catálogo → métrica volta a ficar sem mapeamento
+    servico_id = Column(UUID(as_uuid=True), ForeignKey("servicos.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    servico = relationship("Servico")
@@ -70,3 +70,14 @@ def gerar_excel_relatorio2(relatorio: dict) -> bytes:
     buf = io.BytesIO()
     wb.save(buf)
     return buf.getvalue()
+
+
+def gerar_excel_relatorio_valorado(relatorio: dict) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    _write_sheet(ws, "Produção Valorada", relatorio["colunas"], relatorio["linhas"])
+    ws2 = wb.create_sheet("Pagamentos")
+    _write_sheet(ws2, "Pagamentos", relatorio["colunas_pagamento"], relatorio["pagamentos"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
@@ -3,12 +3,18 @@
 Returns one row per (work_id, user_id) pair with fixed columns:
   Cliente | Nome da Atividade | Usuário | Qtd | Data Inicial | Data Final |
   CABO (m) | CORDOALHA (m) | CEO | CTO | DIO
+
+`montar_grupos` keeps, for each row, the Produttivo user's e-mail and the
+production per fill date — the valuation report (valoracao.py) prices it.
 """
 import asyncio
 from collections import defaultdict
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
 from typing import Optional
+from zoneinfo import ZoneInfo
 
+from app.config.settings import settings
 from app.modules.produttivo.api_client import (
     buscar_form_fills,
     buscar_resource_places,
@@ -18,6 +24,20 @@ from app.modules.produttivo.api_client import (
 from app.modules.produttivo.forms.registry import obter_modelo
 from app.modules.produttivo.models import FormFill
 
+# Fill timestamps come in UTC; the fill "day" (report dates, LPU validity) is local
+_TZ = ZoneInfo(settings.APP_TIMEZONE)
+
+# Production metrics (keys of BaseFormModel.extrair_producao) → report column
+METRICAS = {
+    "cabo_m": "CABO (m)",
+    "cordoalha_m": "CORDOALHA (m)",
+    "ceo": "CEO",
+    "cto": "CTO",
+    "dio": "DIO",
+}
+# Metrics reported in meters (2 decimals); the others are unit counts
+_METRICAS_METROS = {"cabo_m", "cordoalha_m"}
+
 COLUNAS = [
     "Cliente",
     "Nome da Atividade",
@@ -25,14 +45,20 @@ COLUNAS = [
     "Qtd",
     "Data Inicial",
     "Data Final",
-    "CABO (m)",
-    "CORDOALHA (m)",
-    "CEO",
-    "CTO",
-    "DIO",
+    *METRICAS.values(),
 ]
 
 
+@dataclass
+class GrupoAtividade:
+    """One report row plus what is needed to price it."""
+    linha: dict
+    user_id: int
+    email: Optional[str]
+    # fill date (None if unparseable) → metric → quantity
+    producao: dict[Optional[date], dict[str, float]] = field(default_factory=dict)
+
+
 async def gerar_relatorio_usuario(
     cookie: str,
     account_id: str,
@@ -44,6 +70,33 @@ async def gerar_relatorio_usuario(
     work_ids: Optional[list[int]] = None,
 ) -> dict:
     """Fetches filtered form fills and returns rows grouped by (work, user)."""
+    grupos, total = await montar_grupos(
+        cookie, account_id, data_inicio, data_fim,
+        user_ids=user_ids,
+        form_ids=form_ids,
+        resource_place_ids=resource_place_ids,
+        work_ids=work_ids,
+    )
+    return {
+        "periodo": {"inicio": data_inicio, "fim": data_fim},
+        "total": total,
+        "total_atividades": len(grupos),
+        "colunas": COLUNAS,
+        "linhas": [g.linha for g in grupos],
+    }
+
+
+async def montar_grupos(
+    cookie: str,
+    account_id: str,
+    data_inicio: str,    # DD/MM/YYYY
+    data_fim: str,       # DD/MM/YYYY
+    user_ids: Optional[list[int]] = None,
+    form_ids: Optional[list[int]] = None,
+    resource_place_ids: Optional[list[int]] = None,
+    work_ids: Optional[list[int]] = None,
+) -> tuple[list[GrupoAtividade], int]:
+    """Returns the (work, user) groups, sorted like the report, and the number of fills."""
     fills = await buscar_form_fills(
         cookie, account_id, data_inicio, data_fim,
         form_ids=form_ids or None,
@@ -54,13 +107,7 @@ async def gerar_relatorio_usuario(
     fills = [f for f in fills if not f.removed]
 
     if not fills:
-        return {
-            "periodo": {"inicio": data_inicio, "fim": data_fim},
-            "total": 0,
-            "total_atividades": 0,
-            "colunas": COLUNAS,
-            "linhas": [],
-        }
+        return [], 0
 
     # Collect unique work_ids from fills and fetch their full data concurrently
     # alongside users and resource_places. This covers ALL forms — not just
@@ -74,6 +121,7 @@ async def gerar_relatorio_usuario(
     )
 
     user_map = {m.user_id: _format_user(m) for m in members}
+    email_map = {m.user_id: m.user.email for m in members if m.user and m.user.email}
     rp_map = {rp.id: rp.display_name for rp in resource_places_list}
     work_map = {w.id: w for w in works}
 
@@ -82,7 +130,7 @@ async def gerar_relatorio_usuario(
     for fill in fills:
         grupos[(fill.work_id, fill.created_by_id or 0)].append(fill)
 
-    linhas = []
+    resultado = []
     for (work_id, user_id), grupo in grupos.items():
         work = work_map.get(work_id) if work_id else None
 
@@ -95,51 +143,50 @@ async def gerar_relatorio_usuario(
         usuario = user_map.get(user_id, f"Usuário #{user_id}")
 
         # Date range
-        datas = []
-        for ff in grupo:
-            try:
-                datas.append(datetime.fromisoformat(ff.created_at.replace("Z", "+00:00")))
-            except Exception:
-                pass
-        data_ini_str = min(datas).strftime("%d/%m/%Y") if datas else "—"
-        data_fim_str = max(datas).strftime("%d/%m/%Y") if datas else "—"
-
-        # Sum production values (only for forms with a registered model)
-        cabo_m = cordoalha_m = ceo = cto = dio = 0.0
+        datas = [_fill_datetime(ff) for ff in grupo]
+        validas = [d for d in datas if d is not None]
+        data_ini_str = min(validas).strftime("%d/%m/%Y") if validas else "—"
+        data_fim_str = max(validas).strftime("%d/%m/%Y") if validas else "—"
+
+        # Sum production values per fill date (only for forms with a registered model)
+        producao: dict[Optional[date], dict[str, float]] = {}
+        totais = dict.fromkeys(METRICAS, 0.0)
         if work:
             modelo = obter_modelo(work.form_id)
             if modelo:
-                for ff in grupo:
+                for ff, quando in zip(grupo, datas):
                     prod = modelo.extrair_producao(ff)
-                    cabo_m      += prod.get("cabo_m", 0)
-                    cordoalha_m += prod.get("cordoalha_m", 0)
-                    ceo         += prod.get("ceo", 0)
-                    cto         += prod.get("cto", 0)
-                    dio         += prod.get("dio", 0)
+                    dia = producao.setdefault(quando.date() if quando else None, dict.fromkeys(METRICAS, 0.0))
+                    for metrica in METRICAS:
+                        dia[metrica] += prod.get(metrica, 0)
+                        totais[metrica] += prod.get(metrica, 0)
 
-        linhas.append({
+        linha = {
             "Cliente":           cliente,
             "Nome da Atividade": work_title,
             "Usuário":           usuario,
             "Qtd":               len(grupo),
             "Data Inicial":      data_ini_str,
             "Data Final":        data_fim_str,
-            "CABO (m)":          round(cabo_m, 2),
-            "CORDOALHA (m)":     round(cordoalha_m, 2),
-            "CEO":               int(ceo),
-            "CTO":               int(cto),
-            "DIO":               int(dio),
-        })
+        }
+        for metrica, coluna in METRICAS.items():
+            linha[coluna] = round(totais[metrica], 2) if metrica in _METRICAS_METROS else int(totais[metrica])
 
-    linhas.sort(key=lambda r: (r["Cliente"], r["Nome da Atividade"], r["Usuário"]))
+        resultado.append(GrupoAtividade(linha, user_id, email_map.get(user_id), producao))
 
-    return {
-        "periodo": {"inicio": data_inicio, "fim": data_fim},
-        "total": len(fills),
-        "total_atividades": len(linhas),
-        "colunas": COLUNAS,
-        "linhas": linhas,
-    }
+    resultado.sort(key=lambda g: (g.linha["Cliente"], g.linha["Nome da Atividade"], g.linha["Usuário"]))
+    return resultado, len(fills)
+
+
+def _fill_datetime(fill: FormFill) -> Optional[datetime]:
+    """Fill creation time in APP_TIMEZONE (naive timestamps are taken as UTC)."""
+    try:
+        quando = datetime.fromisoformat(fill.created_at.replace("Z", "+00:00"))
+    except Exception:
+        return None
+    if quando.tzinfo is None:
+        quando = quando.replace(tzinfo=timezone.utc)
+    return quando.astimezone(_TZ)
 
 
 def _format_user(member) -> str:
@@ -0,0 +1,167 @@
+"""Relatório 3 — Produção valorada (relatório por usuário × preços das LPUs).
+
+Each row of the per-user report (atividades_usuario) is priced:
+  - the Produttivo user is matched to a partner (PartnerProfile) of the tenant
+    by e-mail;
+  - each production metric (cabo_m, ceo...) is mapped to a catalog Servico by
+    the tenant's produttivo_servicos table;
+  - quantities are priced per fill date with the partner's LPU in force on that
+    day (valor_unitario), using the tenant price index: the whole month is a
+    single batch lookup, deduplicated by (partner, servico, date).
+
+Quantities that cannot be priced (no partner, metric not mapped, no LPU in
+force) stay out of the totals and are listed in the row's "Pendências".
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import User
+from app.modules.catalogo.precos.service import resolver_precos
+from app.modules.partners.models import PartnerProfile
+from app.modules.produttivo.config_crud import get_mapa_servicos
+from app.modules.produttivo.reports.atividades_usuario import (
+    COLUNAS,
+    METRICAS,
+    montar_grupos,
+)
+
+_CENTAVOS = Decimal("0.01")
+
+COLUNAS_VALORADAS = [
+    *COLUNAS,
+    "Parceiro",
+    *(f"R$ {coluna}" for coluna in METRICAS.values()),
+    "Valor Total",
+    "Pendências",
+]
+
+COLUNAS_PAGAMENTO = ["Usuário", "Parceiro", "Atividades", "Valor Total", "Pendências"]
+
+
+async def _parceiros_por_email(db: AsyncSession, tenant_id: UUID, emails: set[str]) -> dict[str, tuple]:
+    """Lower-cased e-mail → (partner_id, name) for the tenant's partners."""
+    if not emails:
+        return {}
+    result = await db.execute(
+        select(func.lower(User.email), PartnerProfile.id, User.name)
+        .join(User, User.id == PartnerProfile.user_id)
+        .where(PartnerProfile.tenant_id == tenant_id, func.lower(User.email).in_(emails))
+    )
+    return {email: (partner_id, nome) for email, partner_id, nome in result.all()}
+
+
+def _dinheiro(valor: Decimal) -> float:
+    return float(valor.quantize(_CENTAVOS, rounding=ROUND_HALF_UP))
+
+
+async def gerar_relatorio_valorado(
+    db: AsyncSession,
+    tenant_id: UUID,
+    cookie: str,
+    account_id: str,
+    data_inicio: str,    # DD/MM/YYYY
+    data_fim: str,       # DD/MM/YYYY
+    user_ids: Optional[list[int]] = None,
+    form_ids: Optional[list[int]] = None,
+    resource_place_ids: Optional[list[int]] = None,
+    work_ids: Optional[list[int]] = None,
+) -> dict:
+    try:
+        # Fills without a valid date are priced at the end of the period
+        fallback = datetime.strptime(data_fim, "%d/%m/%Y").date()
+    except ValueError:
+        raise HTTPException(status_code=422, detail="data_fim inválida. Use DD/MM/YYYY.")
+
+    grupos, total = await montar_grupos(
+        cookie, account_id, data_inicio, data_fim,
+        user_ids=user_ids,
+        form_ids=form_ids,
+        resource_place_ids=resource_place_ids,
+        work_ids=work_ids,
+    )
+    mapa = await get_mapa_servicos(db, tenant_id)
+    parceiros = await _parceiros_por_email(
+        db, tenant_id, {g.email.lower() for g in grupos if g.email},
+    )
+
+    # First pass: every price lookup of the period, deduplicated
+    chaves: dict[tuple[UUID, UUID, date], int] = {}
+    for grupo in grupos:
+        parceiro = parceiros.get(grupo.email.lower()) if grupo.email else None
+        if parceiro is None:
+            continue
+        for dia, producao in grupo.producao.items():
+            for metrica, quantidade in producao.items():
+                if quantidade and metrica in mapa:
+                    chaves.setdefault((parceiro[0], mapa[metrica].id, dia or fallback), len(chaves))
+    resolvidos = await resolver_precos(db, tenant_id, [
+        (parceiro_id, servico_id, None, dia) for parceiro_id, servico_id, dia in chaves
+    ])
+    precos = [preco for _, preco in resolvidos]
+
+    # Second pass: value of each row and payout totals per user
+    linhas = []
+    pagamentos: dict[tuple, dict] = defaultdict(lambda: {"atividades": 0, "valor": Decimal(0), "pendencias": 0})
+    total_geral = Decimal(0)
+    for grupo in grupos:
+        parceiro = parceiros.get(grupo.email.lower()) if grupo.email else None
+        valores = dict.fromkeys(METRICAS, Decimal(0))
+        pendencias: set[str] = set()
+        for dia, producao in grupo.producao.items():
+            for metrica, quantidade in producao.items():
+                if not quantidade:
+                    continue
+                if parceiro is None:
+                    pendencias.add("Usuário sem parceiro cadastrado (e-mail)")
+                elif metrica not in mapa:
+                    pendencias.add(f"{METRICAS[metrica]} sem serviço mapeado")
+                else:
+                    preco = precos[chaves[(parceiro[0], mapa[metrica].id, dia or fallback)]]
+                    if preco is None:
+                        pendencias.add(f"{METRICAS[metrica]} sem LPU vigente ({mapa[metrica].codigo})")
+                    else:
+                        valores[metrica] += Decimal(str(quantidade)) * preco.valor_unitario
+
+        valor_linha = sum(valores.values(), Decimal(0))
+        total_geral += valor_linha
+        linha = {
+            **grupo.linha,
+            "Parceiro": parceiro[1] if parceiro else "—",
+            **{f"R$ {METRICAS[m]}": _dinheiro(v) for m, v in valores.items()},
+            "Valor Total": _dinheiro(valor_linha),
+            "Pendências": "; ".join(sorted(pendencias)),
+        }
+        linhas.append(linha)
+
+        pagamento = pagamentos[(linha["Usuário"], linha["Parceiro"])]
+        pagamento["atividades"] += 1
+        pagamento["valor"] += valor_linha
+        pagamento["pendencias"] += bool(pendencias)
+
+    return {
+        "periodo": {"inicio": data_inicio, "fim": data_fim},
+        "total": total,
+        "total_atividades": len(linhas),
+        "valor_total": _dinheiro(total_geral),
+        "servicos": {m: mapa[m].codigo if m in mapa else None for m in METRICAS},
+        "colunas": COLUNAS_VALORADAS,
+        "linhas": linhas,
+        "colunas_pagamento": COLUNAS_PAGAMENTO,
+        "pagamentos": [
+            {
+                "Usuário": usuario,
+                "Parceiro": parceiro,
+                "Atividades": p["atividades"],
+                "Valor Total": _dinheiro(p["valor"]),
+                "Pendências": p["pendencias"],
+            }
+            for (usuario, parceiro), p in sorted(pagamentos.items())
+        ],
+    }
@@ -12,11 +12,17 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
-from app.database.connection import get_db
+from app.database.connection import AsyncSessionLocal, get_db, release_db
 from app.modules.produttivo import api_client, config_crud
-from app.modules.produttivo.excel import gerar_excel_relatorio1, gerar_excel_relatorio2
+from app.modules.produttivo.config_models import ProduttivoConfig
+from app.modules.produttivo.excel import (
+    gerar_excel_relatorio1,
+    gerar_excel_relatorio2,
+    gerar_excel_relatorio_valorado,
+)
 from app.modules.produttivo.reports.atividades import gerar_relatorio_atividades
-from app.modules.produttivo.reports.atividades_usuario import gerar_relatorio_usuario
+from app.modules.produttivo.reports.atividades_usuario import METRICAS, gerar_relatorio_usuario
+from app.modules.produttivo.reports.valoracao import gerar_relatorio_valorado
 from app.rbac.dependencies import require_roles
 from app.utils.responses import success
 from pydantic import BaseModel
@@ -27,6 +33,17 @@ _staff_up = require_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN, User
 _manager_up = require_roles(UserRole.MANAGER, UserRole.ADMIN, UserRole.MASTER)
 
 
+async def _config_upstream(db: AsyncSession, tenant_id: UUID) -> ProduttivoConfig:
+    """
+    Config do tenant para quem vai chamar o Produttivo. A conexão volta ao pool
+    antes da chamada externa, que leva segundos; consultas depois dela pegam
+    outra conexão.
+    """
+    config = await config_crud.get_config_or_404(db, tenant_id)
+    await release_db(db)
+    return config
+
+
 # ---------------------------------------------------------------------------
 # CONFIG — Cookie management
 # ---------------------------------------------------------------------------
@@ -39,6 +56,11 @@ class AccountPayload(BaseModel):
     account_id: str
 
 
+class ServicosPayload(BaseModel):
+    # métrica (cabo_m, cordoalha_m, ceo, cto, dio) → código do serviço; null remove
+    servicos: dict[str, Optional[str]]
+
+
 @router.get("/config")
 async def get_config(
     db: AsyncSession = Depends(get_db),
@@ -68,7 +90,7 @@ async def validate_cookie(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     valid = await api_client.validate_cookie(config.cookie, config.account_id)
     if not valid:
         return success("Cookie inválido ou expirado.", {"valid": False})
@@ -83,7 +105,6 @@ class GerarCookiePayload(BaseModel):
 @router.post("/config/gerar-cookie")
 async def gerar_cookie_automatico(
     payload: GerarCookiePayload,
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_manager_up),
 ):
     """
@@ -172,7 +193,10 @@ async def gerar_cookie_automatico(
                     return
 
                 if cookie_value:
-                    await config_crud.save_cookie(db, tenant_id, cookie_value)
+                    # Sessão própria e curta: a do request já foi fechada e o
+                    # login no navegador leva segundos sem precisar do banco
+                    async with AsyncSessionLocal() as db:
+                        await config_crud.save_cookie(db, tenant_id, cookie_value)
                     yield evento(100, "Cookie capturado e salvo com sucesso!", "done", cookie_value)
                 else:
                     yield evento(0, "Login ok mas cookie não encontrado.", "error")
@@ -200,6 +224,38 @@ async def save_account_id(
     return success("Account ID salvo.", {"account_id": config.account_id})
 
 
+def _mapa_response(mapa: dict) -> list[dict]:
+    return [
+        {
+            "metrica": metrica,
+            "coluna": coluna,
+            "servico_id": mapa[metrica].id if metrica in mapa else None,
+            "servico_codigo": mapa[metrica].codigo if metrica in mapa else None,
+            "servico_atividade": mapa[metrica].atividade if metrica in mapa else None,
+        }
+        for metrica, coluna in METRICAS.items()
+    ]
+
+
+@router.get("/config/servicos")
+async def get_servicos(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_staff_up),
+):
+    mapa = await config_crud.get_mapa_servicos(db, current_user.tenant_id)
+    return success("Serviços por métrica.", _mapa_response(mapa))
+
+
+@router.put("/config/servicos")
+async def save_servicos(
+    payload: ServicosPayload,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_manager_up),
+):
+    mapa = await config_crud.save_mapa_servicos(db, current_user.tenant_id, payload.servicos)
+    return success("Serviços por métrica salvos.", _mapa_response(mapa))
+
+
 # ---------------------------------------------------------------------------
 # DATA — Proxy endpoints for Produttivo lists
 # ---------------------------------------------------------------------------
@@ -210,7 +266,7 @@ async def listar_usuarios(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     members = await api_client.buscar_todos_usuarios(
         config.cookie, config.account_id, include_inactive=include_inactive
     )
@@ -230,7 +286,7 @@ async def listar_formularios(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     forms = await api_client.buscar_todos_formularios(config.cookie, config.account_id)
     return success("Formulários do Produttivo.", [
         {"id": f.id, "nome": f.name, "status": f.status}
@@ -244,7 +300,7 @@ async def listar_works(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     ids = [int(i.strip()) for i in form_ids.split(",") if i.strip().isdigit()]
     works = await api_client.buscar_works_por_form(config.cookie, config.account_id, ids)
     return success("Works do Produttivo.", [
@@ -259,7 +315,7 @@ async def listar_locais(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     places = await api_client.buscar_resource_places(config.cookie, config.account_id, search)
     return success("Locais do Produttivo.", [
         {"id": p.id, "nome": p.display_name}
@@ -278,7 +334,7 @@ async def relatorio_atividades(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     resultado = await gerar_relatorio_atividades(
         config.cookie, config.account_id, data_inicio, data_fim
     )
@@ -292,7 +348,7 @@ async def relatorio_atividades_excel(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
+    config = await _config_upstream(db, current_user.tenant_id)
     resultado = await gerar_relatorio_atividades(
         config.cookie, config.account_id, data_inicio, data_fim
     )
@@ -305,6 +361,13 @@ async def relatorio_atividades_excel(
     )
 
 
+def _parse_ids(s: Optional[str]) -> Optional[list[int]]:
+    if not s:
+        return None
+    ids = [int(i.strip()) for i in s.split(",") if i.strip().isdigit()]
+    return ids if ids else None
+
+
 @router.get("/relatorio/usuario")
 async def relatorio_usuario(
     data_inicio: str = Query(..., description="DD/MM/YYYY"),
@@ -316,13 +379,7 @@ async def relatorio_usuario(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
-
-    def _parse_ids(s: Optional[str]) -> Optional[list[int]]:
-        if not s:
-            return None
-        ids = [int(i.strip()) for i in s.split(",") if i.strip().isdigit()]
-        return ids if ids else None
+    config = await _config_upstream(db, current_user.tenant_id)
 
     try:
         resultado = await gerar_relatorio_usuario(
@@ -351,13 +408,7 @@ async def relatorio_usuario_excel(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(_staff_up),
 ):
-    config = await config_crud.get_config_or_404(db, current_user.tenant_id)
-
-    def _parse_ids(s: Optional[str]) -> Optional[list[int]]:
-        if not s:
-            return None
-        ids = [int(i.strip()) for i in s.split(",") if i.strip().isdigit()]
-        return ids if ids else None
+    config = await _config_upstream(db, current_user.tenant_id)
 
     resultado = await gerar_relatorio_usuario(
         config.cookie, config.account_id, data_inicio, data_fim,
@@ -375,6 +426,68 @@ async def relatorio_usuario_excel(
     )
 
 
+@router.get("/relatorio/valorado")
+async def relatorio_valorado(
+    data_inicio: str = Query(..., description="DD/MM/YYYY"),
+    data_fim: str = Query(..., description="DD/MM/YYYY"),
+    user_ids: Optional[str] = Query(None, description="IDs separados por vírgula"),
+    form_ids: Optional[str] = Query(None, description="IDs separados por vírgula"),
+    resource_place_ids: Optional[str] = Query(None, description="IDs separados por vírgula"),
+    work_ids: Optional[str] = Query(None, description="IDs separados por vírgula"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_staff_up),
+):
+    config = await _config_upstream(db, current_user.tenant_id)
+    try:
+        resultado = await gerar_relatorio_valorado(
+            db, current_user.tenant_id, config.cookie, config.account_id, data_inicio, data_fim,
+            user_ids=_parse_ids(user_ids),
+            form_ids=_parse_ids(form_ids),
+            resource_place_ids=_parse_ids(resource_place_ids),
+            work_ids=_parse_ids(work_ids),
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Erro inesperado em gerar_relatorio_valorado: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Erro interno ao gerar relatório: {exc}") from exc
+    return success("Produção valorada.", resultado)
+
+
+@router.get("/relatorio/valorado/excel")
+async def relatorio_valorado_excel(
+    data_inicio: str = Query(..., description="DD/MM/YYYY"),
+    data_fim: str = Query(..., description="DD/MM/YYYY"),
+    user_ids: Optional[str] = Query(None),
+    form_ids: Optional[str] = Query(None),
+    resource_place_ids: Optional[str] = Query(None),
+    work_ids: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(_staff_up),
+):
+    config = await _config_upstream(db, current_user.tenant_id)
+    try:
+        resultado = await gerar_relatorio_valorado(
+            db, current_user.tenant_id, config.cookie, config.account_id, data_inicio, data_fim,
+            user_ids=_parse_ids(user_ids),
+            form_ids=_parse_ids(form_ids),
+            resource_place_ids=_parse_ids(resource_place_ids),
+            work_ids=_parse_ids(work_ids),
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.exception("Erro inesperado em gerar_relatorio_valorado: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Erro interno ao gerar relatório: {exc}") from exc
+    excel_bytes = gerar_excel_relatorio_valorado(resultado)
+    filename = f"producao_valorada_{data_inicio.replace('/', '-')}_{data_fim.replace('/', '-')}.xlsx"
+    return StreamingResponse(
+        io.BytesIO(excel_bytes),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # ---------------------------------------------------------------------------
 # DEBUG — inspect raw field_values from Produttivo (temporary)
 # ---------------------------------------------------------------------------
@@ -394,6 +507,7 @@ async def debug_fill_fields(
     config = await config_crud.get_or_create_config(db, current_user.tenant_id)
     if not config.cookie or not config.account_id:
         raise HTTPException(status_code=400, detail="Cookie ou account_id não configurado.")
+    await release_db(db)
 
     headers = api_client._build_headers(config.cookie)
     params = [
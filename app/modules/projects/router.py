@@ -1,15 +1,17 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
 from app.modules.projects import schemas, service
 from app.modules.projects.models import ProjectStatus
 from app.rbac.dependencies import require_roles
 from app.rbac.tenant import get_user_tenant_ids
+from app.utils.pagination import PageParams, page_params
 from app.utils.responses import success
 
 router = APIRouter()
@@ -36,19 +38,16 @@ async def create_project(
 
 @router.get("/")
 async def list_projects(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
     status: Optional[ProjectStatus] = None,
-    db: AsyncSession = Depends(get_db),
+    params: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_staff_up),
 ):
     tenant_ids = get_user_tenant_ids(current_user)
-    projects, total = await service.list_projects(db, tenant_ids, page, per_page, status)
+    page = await service.list_projects(db, tenant_ids, params, status)
     return success("Lista de projetos.", {
-        "results": [schemas.ProjectResponse.model_validate(p) for p in projects],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.ProjectResponse.model_validate(p) for p in page.items],
+        **page.meta(),
     })
 
 
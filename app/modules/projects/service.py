@@ -2,11 +2,14 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import select, func, true
+from sqlalchemy import select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.projects.models import Project, ProjectStatus
 from app.modules.projects.schemas import ProjectCreate, ProjectUpdate
+from app.modules.reports.cache import dashboard_cache
+from app.tenants import stats as tenant_stats
+from app.utils.pagination import Page, PageParams, paginate
 
 
 def _tenant_filter(tenant_ids: list[UUID]):
@@ -25,7 +28,9 @@ async def create_project(db: AsyncSession, tenant_id: UUID, data: ProjectCreate)
         end_date=data.end_date,
     )
     db.add(project)
+    await tenant_stats.bump(db, tenant_id, [(tenant_stats.metric("projects", ProjectStatus.PENDING), 1, 0)])
     await db.commit()
+    dashboard_cache.invalidate(tenant_id)
     await db.refresh(project)
     return project
 
@@ -33,24 +38,15 @@ async def create_project(db: AsyncSession, tenant_id: UUID, data: ProjectCreate)
 async def list_projects(
     db: AsyncSession,
     tenant_ids: list[UUID],
-    page: int = 1,
-    per_page: int = 20,
+    params: PageParams,
     status: ProjectStatus | None = None,
-) -> tuple[list[Project], int]:
+) -> Page:
     query = select(Project).where(_tenant_filter(tenant_ids))
-    count_query = select(func.count()).select_from(Project).where(_tenant_filter(tenant_ids))
 
     if status:
         query = query.where(Project.status == status)
-        count_query = count_query.where(Project.status == status)
 
-    total = (await db.execute(count_query)).scalar()
-    projects = (
-        await db.execute(
-            query.order_by(Project.created_at.desc()).offset((page - 1) * per_page).limit(per_page)
-        )
-    ).scalars().all()
-    return projects, total
+    return await paginate(db, query, [(Project.created_at, True), (Project.id, True)], params)
 
 
 async def get_project(db: AsyncSession, tenant_ids: list[UUID], project_id: UUID) -> Project:
@@ -73,6 +69,7 @@ async def update_project(
     if data.description is not None:
         project.description = data.description
     if data.status is not None:
+        await tenant_stats.bump(db, project.tenant_id, tenant_stats.move("projects", project.status, data.status))
         project.status = data.status
     if data.responsible_id is not None:
         project.responsible_id = data.responsible_id
@@ -83,5 +80,6 @@ async def update_project(
 
     project.updated_at = datetime.utcnow()
     await db.commit()
+    dashboard_cache.invalidate(project.tenant_id)
     await db.refresh(project)
     return project
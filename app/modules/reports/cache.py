@@ -0,0 +1,54 @@
+"""
+Cache do dashboard gerencial por empresa (memória do processo).
+
+Cada entrada vale REPORTS_DASHBOARD_TTL_SECONDS. Os services que alteram
+contratos, pagamentos, projetos e materiais chamam `invalidate(tenant_id)` após
+o commit — o próximo acesso recalcula. Outros workers enxergam a mudança ao fim
+do TTL.
+
+Uma invalidação durante o cálculo incrementa a geração da empresa; o resultado
+calculado antes dela é descartado em vez de gravado (não volta dado velho).
+"""
+import time
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.config.settings import settings
+
+
+class DashboardCache:
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._entries: dict[Optional[UUID], tuple[float, dict]] = {}
+        self._generations: dict[Optional[UUID], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def get(self, tenant_id: Optional[UUID]) -> Optional[dict]:
+        entry = self._entries.get(tenant_id)
+        if entry is None or time.monotonic() - entry[0] > self._ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def generation(self, tenant_id: Optional[UUID]) -> int:
+        return self._generations.get(tenant_id, 0)
+
+    def put(self, tenant_id: Optional[UUID], generation: int, data: dict) -> None:
+        if self.generation(tenant_id) == generation:
+            self._entries[tenant_id] = (time.monotonic(), data)
+
+    def invalidate(self, tenant_id: Optional[UUID]) -> None:
+        self._generations[tenant_id] = self.generation(tenant_id) + 1
+        self._entries.pop(tenant_id, None)
+
+    def invalidate_many(self, tenant_ids: Iterable[Optional[UUID]]) -> None:
+        for tenant_id in set(tenant_ids):
+            self.invalidate(tenant_id)
+
+
+dashboard_cache = DashboardCache(ttl=settings.REPORTS_DASHBOARD_TTL_SECONDS)
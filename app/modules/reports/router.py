@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
-from app.database.connection import get_db
+from app.auth.dependencies import get_read_db
 from app.modules.reports import service
 from app.rbac.dependencies import require_roles
 from app.utils.responses import success
@@ -14,7 +14,7 @@ _manager_up = require_roles(UserRole.MANAGER, UserRole.ADMIN, UserRole.MASTER)
 
 @router.get("/dashboard")
 async def dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_manager_up),
 ):
     data = await service.dashboard(db, current_user.tenant_id)
@@ -23,7 +23,7 @@ async def dashboard(
 
 @router.get("/contracts")
 async def contracts_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_manager_up),
 ):
     data = await service.contracts_summary(db, current_user.tenant_id)
@@ -32,7 +32,7 @@ async def contracts_summary(
 
 @router.get("/payments")
 async def payments_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_manager_up),
 ):
     data = await service.payments_summary(db, current_user.tenant_id)
@@ -41,7 +41,7 @@ async def payments_summary(
 
 @router.get("/projects")
 async def projects_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_manager_up),
 ):
     data = await service.projects_summary(db, current_user.tenant_id)
@@ -50,7 +50,7 @@ async def projects_summary(
 
 @router.get("/materials")
 async def materials_summary(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(_manager_up),
 ):
     data = await service.materials_summary(db, current_user.tenant_id)
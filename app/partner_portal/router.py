@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_from_db, get_read_db
 from app.auth.models import User, UserRole
+from app.modules.reports.service import dashboard
 from app.partner_portal.schemas import PartnerOverview, PartnerProfile
 from app.utils.responses import success
 
 router = APIRouter()
 
 
-def _require_partner(current_user: User = Depends(get_current_user)) -> User:
+def _check_partner(current_user: User) -> User:
     if current_user.role != UserRole.PARTNER:
         raise HTTPException(status_code=403, detail="Acesso restrito ao portal do parceiro")
     if not current_user.tenant_id:
@@ -16,15 +18,30 @@ def _require_partner(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+def _require_partner(current_user: User = Depends(get_current_user)) -> User:
+    return _check_partner(current_user)
+
+
+def _require_partner_profile(current_user: User = Depends(get_current_user_from_db)) -> User:
+    """Como `_require_partner`, mas com o usuário do banco (nome, e-mail...) para o perfil."""
+    return _check_partner(current_user)
+
+
 @router.get("/me")
-async def partner_me(current_user: User = Depends(_require_partner)):
+async def partner_me(current_user: User = Depends(_require_partner_profile)):
     return success("Dados do parceiro.", PartnerProfile.model_validate(current_user))
 
 
 @router.get("/overview")
-async def partner_overview(current_user: User = Depends(_require_partner)):
-    # SCAFFOLD — implementar na próxima fase
-    # Módulo: Dashboard do parceiro
-    # Responsabilidade: Resumo de contratos, projetos e chamados do tenant
-    # Isolamento garantido: tenant_id = current_user.tenant_id (filtro obrigatório em todas as queries)
-    return success("Overview do parceiro.", PartnerOverview(tenant_id=current_user.tenant_id))
+async def partner_overview(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(_require_partner),
+):
+    # Contratos e projetos vêm de tenant_stats (O(1)); chamados — próxima fase
+    # Isolamento garantido: tenant_id = current_user.tenant_id
+    data = await dashboard(db, current_user.tenant_id)
+    return success("Overview do parceiro.", PartnerOverview(
+        tenant_id=current_user.tenant_id,
+        contracts=data["contracts"],
+        projects=data["projects"],
+    ))
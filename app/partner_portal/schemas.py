@@ -20,4 +20,6 @@ class PartnerProfile(BaseModel):
 
 class PartnerOverview(BaseModel):
     tenant_id: Optional[UUID]
+    contracts: dict[str, int] = {}
+    projects: dict[str, int] = {}
     message: str = "Portal do parceiro — módulos em desenvolvimento"
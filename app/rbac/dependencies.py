@@ -1,9 +1,12 @@
 from typing import Callable
 
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import User, UserRole
 from app.auth.dependencies import get_current_user
+from app.database.connection import get_db
+from app.rbac.matrix import parse_permission, permission_matrix
 
 
 def require_roles(*roles: UserRole) -> Callable:
@@ -18,11 +21,30 @@ def require_roles(*roles: UserRole) -> Callable:
 
 
 def require_permissions(*permission_names: str) -> Callable:
-    async def permission_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role in (UserRole.MASTER, UserRole.ADMIN):
+    """
+    Exige permissões de tela no formato "screen_key:ação" (ação: view, create,
+    edit, delete; sem ação = view). Ex: require_permissions("contratos:edit").
+
+    Checagem O(1) na matriz pré-compilada — só consulta o banco quando a
+    matriz precisa ser (re)carregada. MASTER sempre tem acesso.
+    """
+    required = [parse_permission(name) for name in permission_names]
+
+    async def permission_checker(
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db),
+    ) -> User:
+        if current_user.role == UserRole.MASTER:
             return current_user
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Permissão negada: {list(permission_names)}",
-        )
+        await permission_matrix.ensure_loaded(db)
+        missing = [
+            name for name, (screen_key, mask) in zip(permission_names, required)
+            if not permission_matrix.allows(current_user.role, screen_key, mask)
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Permissão negada: {missing}",
+            )
+        return current_user
     return permission_checker
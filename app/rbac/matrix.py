@@ -0,0 +1,132 @@
+"""
+Matriz de permissões de tela pré-compilada (cache do processo).
+
+`screen_permissions` é carregada uma vez e convertida em bitmasks por
+(role, screen_key) — a checagem de permissão vira um teste de bits O(1), sem
+query por request. Os `ScreenActionSet` das respostas também são montados uma
+única vez por versão da matriz.
+
+Atualização:
+  - `update_screen_permissions_for_role` aplica a mudança na matriz após o commit
+    (nova versão, sem recarregar do banco);
+  - outros workers recarregam quando a matriz passa de RBAC_MATRIX_TTL_SECONDS.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.models import UserRole
+from app.config.settings import settings
+from app.rbac.models import ScreenPermission
+from app.rbac.schemas import ScreenActionSet
+
+VIEW = 1
+CREATE = 2
+EDIT = 4
+DELETE = 8
+
+ACTION_BITS = {"view": VIEW, "create": CREATE, "edit": EDIT, "delete": DELETE}
+
+
+def actions_to_mask(actions: ScreenActionSet) -> int:
+    return (
+        (VIEW if actions.view else 0)
+        | (CREATE if actions.create else 0)
+        | (EDIT if actions.edit else 0)
+        | (DELETE if actions.delete else 0)
+    )
+
+
+def mask_to_actions(mask: int) -> ScreenActionSet:
+    return ScreenActionSet(
+        view=bool(mask & VIEW),
+        create=bool(mask & CREATE),
+        edit=bool(mask & EDIT),
+        delete=bool(mask & DELETE),
+    )
+
+
+def parse_permission(name: str) -> tuple[str, int]:
+    """'contracts:edit' → ('contracts', EDIT). Sem ação, assume 'view'."""
+    screen_key, _, action = name.partition(":")
+    action = action or "view"
+    if action not in ACTION_BITS:
+        raise ValueError(f"Ação de permissão inválida: {name}")
+    return screen_key, ACTION_BITS[action]
+
+
+class PermissionMatrix:
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._masks: dict[UserRole, dict[str, int]] = {}
+        self._sets: dict[UserRole, dict[str, ScreenActionSet]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.version = 0
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self._ttl
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if not self.is_stale:
+            return
+        async with self._lock:
+            if self.is_stale:
+                await self.load(db)
+
+    async def load(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(
+                ScreenPermission.role,
+                ScreenPermission.screen_key,
+                ScreenPermission.can_view,
+                ScreenPermission.can_create,
+                ScreenPermission.can_edit,
+                ScreenPermission.can_delete,
+            )
+        )
+        masks: dict[UserRole, dict[str, int]] = {}
+        for role, screen_key, can_view, can_create, can_edit, can_delete in result.all():
+            masks.setdefault(role, {})[screen_key] = (
+                (VIEW if can_view else 0)
+                | (CREATE if can_create else 0)
+                | (EDIT if can_edit else 0)
+                | (DELETE if can_delete else 0)
+            )
+        self._install(masks)
+
+    def replace_role(self, role: UserRole, screens: dict[str, ScreenActionSet]) -> None:
+        """Aplica a nova configuração de um perfil (chamado após o commit)."""
+        if self._loaded_at is None:
+            return  # ainda não carregada — o próximo uso lê do banco
+        masks = dict(self._masks)
+        masks[role] = {key: actions_to_mask(actions) for key, actions in screens.items()}
+        self._install(masks, loaded_at=self._loaded_at)
+
+    def _install(self, masks: dict[UserRole, dict[str, int]], loaded_at: Optional[float] = None) -> None:
+        # Monta tudo antes e troca as referências de uma vez — leitores nunca veem estado parcial
+        sets = {
+            role: {key: mask_to_actions(mask) for key, mask in screens.items()}
+            for role, screens in masks.items()
+        }
+        self._masks, self._sets = masks, sets
+        self._loaded_at = loaded_at if loaded_at is not None else time.monotonic()
+        self.version += 1
+
+    def allows(self, role: UserRole, screen_key: str, action_mask: int) -> bool:
+        if role == UserRole.MASTER:
+            return True
+        return self._masks.get(role, {}).get(screen_key, 0) & action_mask == action_mask
+
+    def for_role(self, role: UserRole) -> dict[str, ScreenActionSet]:
+        return self._sets.get(role, {})
+
+    def all_roles(self) -> dict[str, dict[str, ScreenActionSet]]:
+        return {role.value: screens for role, screens in self._sets.items()}
+
+
+permission_matrix = PermissionMatrix(ttl=settings.RBAC_MATRIX_TTL_SECONDS)
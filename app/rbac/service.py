@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
+from app.rbac.matrix import permission_matrix
 from app.rbac.models import Permission, RolePermission, ScreenPermission
 from app.rbac.schemas import ScreenActionSet
 from app.auth.models import UserRole
@@ -19,43 +20,20 @@ async def list_role_permissions(db: AsyncSession, role: UserRole) -> list[RolePe
 
 
 # --- Screen Permissions ---
+# Leituras servidas pela matriz pré-compilada (app/rbac/matrix.py).
 
 async def get_all_screen_permissions(db: AsyncSession) -> dict[str, dict[str, ScreenActionSet]]:
     """Retorna permissões de tela de todos os perfis."""
-    result = await db.execute(select(ScreenPermission))
-    rows = result.scalars().all()
-
-    output: dict[str, dict[str, ScreenActionSet]] = {}
-    for row in rows:
-        role_key = row.role.value
-        if role_key not in output:
-            output[role_key] = {}
-        output[role_key][row.screen_key] = ScreenActionSet(
-            view=row.can_view,
-            create=row.can_create,
-            edit=row.can_edit,
-            delete=row.can_delete,
-        )
-    return output
+    await permission_matrix.ensure_loaded(db)
+    return permission_matrix.all_roles()
 
 
 async def get_screen_permissions_for_role(
     db: AsyncSession, role: UserRole
 ) -> dict[str, ScreenActionSet]:
     """Retorna permissões de tela de um perfil específico."""
-    result = await db.execute(
-        select(ScreenPermission).where(ScreenPermission.role == role)
-    )
-    rows = result.scalars().all()
-    return {
-        row.screen_key: ScreenActionSet(
-            view=row.can_view,
-            create=row.can_create,
-            edit=row.can_edit,
-            delete=row.can_delete,
-        )
-        for row in rows
-    }
+    await permission_matrix.ensure_loaded(db)
+    return permission_matrix.for_role(role)
 
 
 async def update_screen_permissions_for_role(
@@ -79,4 +57,5 @@ async def update_screen_permissions_for_role(
         ))
 
     await db.commit()
+    permission_matrix.replace_role(role, screens)
     return screens
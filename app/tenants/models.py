@@ -2,7 +2,7 @@ import uuid
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, String, DateTime, Enum
+from sqlalchemy import BigInteger, Column, String, DateTime, Enum, ForeignKey, Numeric
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -25,3 +25,18 @@ class Tenant(Base):
 
     users = relationship("User", back_populates="tenant")
     member_users = relationship("User", secondary="user_tenants", back_populates="tenants")
+
+
+class TenantStat(Base):
+    """
+    Contador materializado por tenant (ver app/tenants/stats.py).
+
+    `metric` = "<seção>:<chave>", ex.: "contracts:ACTIVE", "payments:PAID",
+    "materials:low_stock". `amount` só é usado por pagamentos.
+    """
+    __tablename__ = "tenant_stats"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String(64), primary_key=True)
+    qty = Column(BigInteger, nullable=False, default=0)
+    amount = Column(Numeric(14, 2), nullable=False, default=0)
@@ -4,9 +4,11 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.models import UserRole
+from app.auth.dependencies import get_read_db
 from app.database.connection import get_db
 from app.rbac.dependencies import require_roles
 from app.tenants import schemas, service
+from app.utils.pagination import PageParams, picker_page_params
 from app.utils.responses import success
 
 router = APIRouter()
@@ -21,13 +23,15 @@ async def create_tenant(data: schemas.TenantCreate, db: AsyncSession = Depends(g
 
 
 @router.get("/")
-async def list_tenants(page: int = 1, per_page: int = 20, db: AsyncSession = Depends(get_db), admin=Depends(_admin_master)):
-    tenants, total = await service.list_tenants(db, page, per_page)
+async def list_tenants(
+    params: PageParams = Depends(picker_page_params),
+    db: AsyncSession = Depends(get_read_db),
+    admin=Depends(_admin_master),
+):
+    page = await service.list_tenants(db, params)
     return success("Lista de tenants.", {
-        "results": [schemas.TenantResponse.model_validate(t) for t in tenants],
-        "total": total,
-        "page": page,
-        "per_page": per_page,
+        "results": [schemas.TenantResponse.model_validate(t) for t in page.items],
+        **page.meta(),
     })
 
 
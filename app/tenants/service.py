@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.tenants.models import Tenant, TenantStatus
 from app.tenants.schemas import TenantCreate, TenantUpdate
+from app.utils.pagination import Page, PageParams, paginate
 
 
 async def create_tenant(db: AsyncSession, data: TenantCreate) -> Tenant:
@@ -17,13 +18,8 @@ async def create_tenant(db: AsyncSession, data: TenantCreate) -> Tenant:
     return tenant
 
 
-async def list_tenants(db: AsyncSession, page: int = 1, per_page: int = 20) -> tuple[list[Tenant], int]:
-    from sqlalchemy import func
-    total = (await db.execute(select(func.count()).select_from(Tenant))).scalar()
-    tenants = (await db.execute(
-        select(Tenant).order_by(Tenant.name).offset((page - 1) * per_page).limit(per_page)
-    )).scalars().all()
-    return tenants, total
+async def list_tenants(db: AsyncSession, params: PageParams) -> Page:
+    return await paginate(db, select(Tenant), [(Tenant.name, False), (Tenant.id, False)], params)
 
 
 async def get_tenant(db: AsyncSession, tenant_id: UUID) -> Tenant:
@@ -0,0 +1,217 @@
+"""
+Contadores materializados por tenant (`tenant_stats`).
+
+Os services de contratos, pagamentos, projetos e materiais chamam `bump()` na
+mesma transação da escrita — o contador só muda se a escrita for confirmada.
+Leituras (`read()`) são O(nº de métricas), independentes do volume de dados.
+
+Métricas:
+  contracts:<ContractStatus>   qty
+  payments:<PaymentStatus>     qty, amount
+  projects:<ProjectStatus>     qty
+  materials:total              qty
+  materials:low_stock          qty (quantity <= min_quantity)
+
+Alterações fora dos services (SQL manual, cascades) geram divergência — o
+`stats_reconciler` recalcula cada tenant a partir das tabelas de origem a cada
+TENANT_STATS_RECONCILE_INTERVAL_SECONDS e corrige o que estiver diferente.
+
+Ciclo de vida do reconciliador: `start()` e `stop()` no lifespan (app/main.py).
+"""
+import asyncio
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable, Optional, Union
+from uuid import UUID
+
+from sqlalchemy import String, cast, func, literal_column, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.database.connection import AsyncSessionLocal
+from app.modules.contracts.models import Contract
+from app.modules.materials.models import Material
+from app.modules.payments.models import Payment
+from app.modules.projects.models import Project
+from app.modules.reports.cache import dashboard_cache
+from app.tenants.models import Tenant, TenantStat
+
+logger = logging.getLogger(__name__)
+
+# (métrica, Δqty, Δamount)
+Change = tuple[str, int, Union[Decimal, int]]
+
+
+def metric(section: str, key) -> str:
+    return f"{section}:{getattr(key, 'value', key)}"
+
+
+def move(section: str, old, new, amount: Union[Decimal, int] = 0) -> list[Change]:
+    """Uma linha saindo do status `old` para `new` (sem efeito se iguais)."""
+    if old == new:
+        return []
+    return [(metric(section, old), -1, -amount), (metric(section, new), 1, amount)]
+
+
+async def bump(db: AsyncSession, tenant_id: UUID, changes: Iterable[Change]) -> None:
+    """Aplica deltas aos contadores do tenant (na transação do chamador, sem commit)."""
+    merged: dict[str, list] = {}
+    for name, qty, amount in changes:
+        entry = merged.setdefault(name, [0, Decimal(0)])
+        entry[0] += qty
+        entry[1] += Decimal(amount)
+
+    # Ordem fixa de métricas → transações concorrentes travam as linhas na mesma ordem
+    rows = [
+        {"tenant_id": tenant_id, "metric": name, "qty": qty, "amount": amount}
+        for name, (qty, amount) in sorted(merged.items())
+        if qty or amount
+    ]
+    if not rows:
+        return
+    stmt = pg_insert(TenantStat).values(rows)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[TenantStat.tenant_id, TenantStat.metric],
+        set_={
+            "qty": TenantStat.qty + stmt.excluded.qty,
+            "amount": TenantStat.amount + stmt.excluded.amount,
+        },
+    ))
+
+
+async def read(db: AsyncSession, tenant_id: UUID) -> dict[str, tuple[int, Decimal]]:
+    result = await db.execute(
+        select(TenantStat.metric, TenantStat.qty, TenantStat.amount)
+        .where(TenantStat.tenant_id == tenant_id)
+    )
+    return {name: (qty, amount) for name, qty, amount in result.all()}
+
+
+def _source_query(tenant_id: UUID):
+    """Valores corretos das métricas do tenant, calculados das tabelas de origem."""
+    # Constantes inline (não bind params): tipos resolvidos pelo Postgres no UNION
+    zero = literal_column("0")
+
+    def name(value: str):
+        return literal_column(f"'{value}'", String)
+
+    def grouped(section: str, model, amount=None):
+        return (
+            select(
+                (name(f"{section}:") + cast(model.status, String)).label("metric"),
+                func.count().label("qty"),
+                func.coalesce(func.sum(amount), 0).label("amount") if amount is not None
+                else zero.label("amount"),
+            )
+            .where(model.tenant_id == tenant_id)
+            .group_by(model.status)
+        )
+
+    return union_all(
+        grouped("contracts", Contract),
+        grouped("payments", Payment, Payment.amount),
+        grouped("projects", Project),
+        select(name("materials:total"), func.count(), zero)
+        .where(Material.tenant_id == tenant_id),
+        select(
+            name("materials:low_stock"),
+            func.count().filter(Material.quantity <= Material.min_quantity),
+            zero,
+        ).where(Material.tenant_id == tenant_id),
+    )
+
+
+async def reconcile_tenant(db: AsyncSession, tenant_id: UUID) -> int:
+    """Corrige os contadores do tenant; retorna quantas métricas divergiam."""
+    # Trava os contadores do tenant: escritas concorrentes esperam a correção
+    current = {
+        name: (qty, amount)
+        for name, qty, amount in (await db.execute(
+            select(TenantStat.metric, TenantStat.qty, TenantStat.amount)
+            .where(TenantStat.tenant_id == tenant_id)
+            .with_for_update()
+        )).all()
+    }
+    expected = {
+        name: (qty, Decimal(amount or 0))
+        for name, qty, amount in (await db.execute(_source_query(tenant_id))).all()
+    }
+
+    changes: list[Change] = []
+    for name in current.keys() | expected.keys():
+        qty, amount = expected.get(name, (0, Decimal(0)))
+        cur_qty, cur_amount = current.get(name, (0, Decimal(0)))
+        if qty != cur_qty or amount != cur_amount:
+            changes.append((name, qty - cur_qty, amount - cur_amount))
+    if changes:
+        await bump(db, tenant_id, changes)
+    await db.commit()
+    return len(changes)
+
+
+class StatsReconciler:
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self.fixed = 0
+        self.last_fixed: Optional[int] = None
+        self.last_run: Optional[datetime] = None
+
+    def stats(self) -> dict:
+        return {
+            "fixed": self.fixed,
+            "last_fixed": self.last_fixed,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run(), name="tenant-stats-reconciler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.reconcile()
+            except Exception as exc:
+                logger.error("Falha ao reconciliar tenant_stats: %s", exc)
+            try:
+                await asyncio.wait_for(self._stop.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def reconcile(self) -> int:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as session:
+            tenant_ids = (await session.execute(select(Tenant.id))).scalars().all()
+
+        fixed = 0
+        for tenant_id in tenant_ids:
+            if self._stop.is_set():
+                break
+            # Uma transação curta por tenant
+            async with AsyncSessionLocal() as session:
+                drift = await reconcile_tenant(session, tenant_id)
+            if drift:
+                dashboard_cache.invalidate(tenant_id)
+                logger.warning("tenant_stats divergente corrigido: tenant=%s métricas=%d", tenant_id, drift)
+            fixed += drift
+
+        self.fixed += fixed
+        self.last_fixed = fixed
+        self.last_run = now
+        return fixed
+
+
+stats_reconciler = StatsReconciler(interval=settings.TENANT_STATS_RECONCILE_INTERVAL_SECONDS)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user_from_db
 from app.auth.models import User
 from app.database.connection import get_db
 from app.users import schemas, service
@@ -11,7 +11,7 @@ router = APIRouter()
 
 
 @router.get("/me")
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_from_db)):
     return success("Perfil do usuário.", schemas.UserProfileResponse.model_validate(current_user))
 
 
@@ -19,7 +19,7 @@ async def get_me(current_user: User = Depends(get_current_user)):
 async def update_me(
     data: schemas.UpdateProfile,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_from_db),
 ):
     user = await service.update_profile(db, current_user, data)
     return success("Perfil atualizado.", schemas.UserProfileResponse.model_validate(user))
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from starlette.requests import Request
+
+from app.config.settings import settings
+
+
+def client_ip(request: Optional[Request]) -> Optional[str]:
+    """
+    IP do cliente para rate limit e audit log.
+
+    Atrás de proxy reverso (Render) `request.client.host` é o IP do proxy — o
+    mesmo para todos os clientes. Com TRUSTED_PROXY_HOPS=N, o IP vem do
+    X-Forwarded-For: cada proxy acrescenta à direita o endereço de quem o
+    chamou, então a N-ésima entrada a partir do fim foi escrita pelo proxy mais
+    externo e não pode ser forjada pelo cliente (entradas à esquerda podem).
+    """
+    if request is None:
+        return None
+    hops = settings.TRUSTED_PROXY_HOPS
+    if hops > 0:
+        forwarded = [ip.strip() for ip in request.headers.get("x-forwarded-for", "").split(",") if ip.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else None
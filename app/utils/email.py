@@ -1,4 +1,21 @@
+"""
+Envio de e-mails transacionais.
+
+`send_email` apenas enfileira a mensagem e retorna — o envio acontece em uma
+task de background (`email_outbox`, iniciada no lifespan), com retry e backoff
+exponencial. O SDK do Resend é síncrono, então a chamada HTTP roda em thread
+(`asyncio.to_thread`) para não bloquear o event loop.
+
+Transportes:
+  - ResendTransport (padrão em produção)
+  - MemoryTransport (EMAIL_TRANSPORT=memory) — guarda as mensagens em memória,
+    para testes e desenvolvimento local.
+"""
+import asyncio
 import logging
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
 import resend
 
 from app.config.settings import settings
@@ -6,24 +23,147 @@ from app.config.settings import settings
 logger = logging.getLogger(__name__)
 
 
-async def send_email(to: str, subject: str, body: str) -> bool:
-    if not settings.RESEND_API_KEY:
-        logger.warning("RESEND_API_KEY não configurado — e-mail ignorado: %s", subject)
-        return False
+@dataclass
+class EmailMessage:
+    to: str
+    subject: str
+    html: str
+    attempts: int = 0
+
+
+class EmailTransport(Protocol):
+    async def send(self, message: EmailMessage) -> None: ...
 
-    resend.api_key = settings.RESEND_API_KEY
 
-    try:
-        resend.Emails.send({
+class ResendTransport:
+    async def send(self, message: EmailMessage) -> None:
+        resend.api_key = settings.RESEND_API_KEY
+        await asyncio.to_thread(resend.Emails.send, {
             "from": settings.EMAIL_FROM,
-            "to": [to],
-            "subject": subject,
-            "html": body,
+            "to": [message.to],
+            "subject": message.subject,
+            "html": message.html,
         })
-        return True
-    except Exception as exc:
-        logger.error("Falha ao enviar e-mail para %s: %s", to, exc)
+
+
+class MemoryTransport:
+    """Transporte local — não envia nada, apenas acumula em `sent`."""
+
+    def __init__(self):
+        self.sent: list[EmailMessage] = []
+
+    async def send(self, message: EmailMessage) -> None:
+        self.sent.append(message)
+
+
+class EmailOutbox:
+    def __init__(self, transport: EmailTransport, maxsize: int, max_attempts: int, backoff_seconds: float):
+        self.transport = transport
+        self._queue: asyncio.Queue[Optional[EmailMessage]] = asyncio.Queue(maxsize=maxsize)
+        self._max_attempts = max_attempts
+        self._backoff = backoff_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # retry agendado → mensagem (reenfileirada no stop para uma última tentativa)
+        self._retries: dict[asyncio.TimerHandle, EmailMessage] = {}
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error("Fila de e-mail cheia — mensagem descartada: %s", message.subject)
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "retrying": len(self._retries),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="email-outbox")
+
+    async def stop(self) -> None:
+        """
+        Envia o que estiver na fila — incluindo as mensagens que aguardavam
+        retry, numa última tentativa — sem novos retries, e encerra o sender.
+        """
+        if self._task is None:
+            return
+        # Antes do dreno: falhas durante o shutdown não agendam retry nem esperam backoff
+        self._stopping = True
+        pendentes = list(self._retries.items())
+        self._retries.clear()
+        for handle, message in pendentes:
+            handle.cancel()
+            self.enqueue(message)
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            message = await self._queue.get()
+            if message is None:
+                return
+            await self._deliver(message)
+
+    async def _deliver(self, message: EmailMessage) -> None:
+        message.attempts += 1
+        try:
+            await self.transport.send(message)
+            self.sent += 1
+        except Exception as exc:
+            if message.attempts >= self._max_attempts or self._stopping:
+                self.failed += 1
+                logger.error("Falha ao enviar e-mail para %s: %s", message.to, exc)
+                return
+            delay = self._backoff * 2 ** (message.attempts - 1)
+            logger.warning(
+                "Falha ao enviar e-mail para %s (tentativa %d) — nova tentativa em %.0fs: %s",
+                message.to, message.attempts, delay, exc,
+            )
+            self._schedule_retry(message, delay)
+
+    def _schedule_retry(self, message: EmailMessage, delay: float) -> None:
+        def _requeue() -> None:
+            self._retries.pop(handle, None)
+            self.enqueue(message)
+
+        handle = asyncio.get_running_loop().call_later(delay, _requeue)
+        self._retries[handle] = message
+
+
+def _build_transport() -> EmailTransport:
+    if settings.EMAIL_TRANSPORT == "memory":
+        return MemoryTransport()
+    return ResendTransport()
+
+
+email_outbox = EmailOutbox(
+    _build_transport(),
+    maxsize=settings.EMAIL_QUEUE_MAXSIZE,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    backoff_seconds=settings.EMAIL_RETRY_BACKOFF_SECONDS,
+)
+
+
+async def send_email(to: str, subject: str, body: str) -> bool:
+    """Enfileira o e-mail para envio em background. Retorna False se descartado."""
+    if settings.EMAIL_TRANSPORT == "resend" and not settings.RESEND_API_KEY:
+        logger.warning("RESEND_API_KEY não configurado — e-mail ignorado: %s", subject)
         return False
+    return email_outbox.enqueue(EmailMessage(to=to, subject=subject, html=body))
 
 
 async def send_approval_notification(admin_email: str, user_name: str, user_email: str) -> None:
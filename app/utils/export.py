@@ -0,0 +1,159 @@
+"""
+Exportações em streaming (CSV / XLSX / NDJSON).
+
+`export_response(stmt, formato, nome)` executa uma consulta Core (colunas
+rotuladas — os rótulos viram o cabeçalho) com cursor server-side
+(`AsyncSession.stream` + `yield_per`) e escreve as linhas na resposta à medida
+que chegam, em lotes de YIELD_PER: memória constante, qualquer que seja o
+tamanho do tenant.
+
+Conexão: a consulta roda em uma sessão própria (réplica de leitura, se
+configurada — app/database/routing.py), aberta só quando o corpo da resposta
+começa a ser gerado e fechada ao ler a última linha (ou se o cliente
+desconectar). A sessão do request (get_db) já foi encerrada antes disso — o
+FastAPI fecha as dependências com yield antes de enviar a resposta —, então
+validações (tenant, 404) devem ser feitas no endpoint, antes de chamar
+export_response.
+
+  csv / ndjson → transmitidos direto do cursor;
+  xlsx         → o zip só fica válido no fim: as linhas vão para uma planilha
+                 write_only (em disco), a conexão é devolvida e só então o
+                 arquivo é transmitido — cliente lento não segura conexão.
+"""
+import asyncio
+import csv
+import enum
+import io
+import json
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Sequence
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy import Select
+
+from app.database.connection import read_session
+
+YIELD_PER = 1_000
+_CHUNK = 64 * 1024
+# Acima disso o XLSX montado vai para disco em vez de memória
+_XLSX_SPOOL = 8 * 1024 * 1024
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+    NDJSON = "ndjson"
+
+
+_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(_plain(v)) for v in value)
+    return value
+
+
+def _texto(value: Any) -> str:
+    value = _plain(value)
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _json(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_json(v) for v in value]
+    value = _plain(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+async def _partitions(stmt: Select) -> AsyncIterator[Sequence]:
+    async with read_session() as db:
+        result = await db.stream(stmt.execution_options(yield_per=YIELD_PER))
+        async for rows in result.partitions():
+            yield rows
+
+
+async def _csv(stmt: Select, colunas: list[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM: o Excel reconhece UTF-8 ao abrir o arquivo direto
+    buffer.write("﻿")
+    writer.writerow(colunas)
+    yield buffer.getvalue().encode()
+    async for rows in _partitions(stmt):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_texto(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode()
+
+
+async def _ndjson(stmt: Select, colunas: list[str]) -> AsyncIterator[bytes]:
+    async for rows in _partitions(stmt):
+        yield "".join(
+            json.dumps(dict(zip(colunas, map(_json, row))), ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode()
+
+
+def _append(ws, rows: Sequence) -> None:
+    for row in rows:
+        ws.append([_plain(v) for v in row])
+
+
+async def _xlsx(stmt: Select, colunas: list[str]) -> AsyncIterator[bytes]:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(colunas)
+    async for rows in _partitions(stmt):
+        await asyncio.to_thread(_append, ws, rows)
+
+    arquivo = tempfile.SpooledTemporaryFile(max_size=_XLSX_SPOOL)
+    try:
+        await asyncio.to_thread(wb.save, arquivo)
+        arquivo.seek(0)
+        while chunk := await asyncio.to_thread(arquivo.read, _CHUNK):
+            yield chunk
+    finally:
+        arquivo.close()
+
+
+_WRITERS = {
+    ExportFormat.CSV: _csv,
+    ExportFormat.XLSX: _xlsx,
+    ExportFormat.NDJSON: _ndjson,
+}
+
+
+def export_response(stmt: Select, formato: ExportFormat, nome: str) -> StreamingResponse:
+    colunas = [c.key for c in stmt.selected_columns]
+    arquivo = f"{nome}-{datetime.utcnow():%Y%m%d-%H%M%S}.{formato.value}"
+    return StreamingResponse(
+        _WRITERS[formato](stmt, colunas),
+        media_type=_MEDIA_TYPES[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{arquivo}"',
+            "Cache-Control": "no-store",
+            # Proxies (nginx) não devem acumular a resposta antes de repassar
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,264 @@
+"""
+Paginação compartilhada das listagens.
+
+Dois modos, escolhidos pelo cliente:
+  - offset (legado): ?page=N&per_page=M — custo cresce com N;
+  - keyset: ?cursor=<next_cursor da página anterior> — custo constante em
+    qualquer profundidade (WHERE (chaves) > (última linha) + índice).
+
+Toda resposta traz `next_cursor` (None na última página), então o cliente pode
+começar por page=1 e seguir por cursor. O cursor é opaco (base64 de JSON com os
+valores das chaves de ordenação da última linha).
+
+Total (?total=):
+  - exact (padrão): COUNT(*) da consulta filtrada, calculado NA MESMA query da
+    página (`count(*) OVER ()` no modo offset; subquery escalar no modo cursor,
+    onde o WHERE do keyset não pode entrar na contagem) — um único round trip;
+  - estimate: estimativa do planner (EXPLAIN), sem varrer a tabela.
+?include_total=false dispensa o total (`total: null`) — só a página é buscada.
+
+Uso no service:
+    query = select(Payment).where(...)
+    return await paginate(db, query, [(Payment.due_date, True), (Payment.id, True)], params)
+
+As chaves de ordenação devem ser NOT NULL (use coalesce para colunas nulas) e a
+última deve ser única (normalmente o `id`).
+
+`items` traz as entidades quando a query seleciona um único modelo; em
+projeções (várias colunas), cada item é um dict {label: valor}.
+"""
+import base64
+import enum
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Literal, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select, and_, func, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+
+TotalMode = Literal["exact", "estimate"]
+
+# (expressão de ordenação, descendente?)
+SortKey = tuple[ColumnElement, bool]
+
+
+@dataclass
+class PageParams:
+    page: int = 1
+    per_page: int = 20
+    cursor: Optional[str] = None
+    total: TotalMode = "exact"
+    include_total: bool = True
+
+
+def _page_params(max_per_page: int):
+    def dependency(
+        page: int = Query(1, ge=1),
+        per_page: int = Query(20, ge=1, le=max_per_page),
+        cursor: Optional[str] = Query(None, description="next_cursor da página anterior (ignora page)."),
+        total: TotalMode = Query("exact", description="exact = COUNT(*); estimate = estimativa do planner."),
+        include_total: bool = Query(True, description="false = não calcula o total (mais rápido)."),
+    ) -> PageParams:
+        return PageParams(page=page, per_page=per_page, cursor=cursor, total=total, include_total=include_total)
+    return dependency
+
+
+page_params = _page_params(100)
+# Listagens que alimentam seletores no front (parceiros, empresas) — carregadas de uma vez
+picker_page_params = _page_params(500)
+
+
+@dataclass
+class Page:
+    items: list
+    total: Optional[int]
+    params: PageParams
+    next_cursor: Optional[str] = None
+
+    @classmethod
+    def empty(cls, params: PageParams) -> "Page":
+        return cls(items=[], total=0, params=params)
+
+    def meta(self) -> dict:
+        return {
+            "total": self.total,
+            "page": None if self.params.cursor else self.params.page,
+            "per_page": self.params.per_page,
+            "next_cursor": self.next_cursor,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Cursor
+# ---------------------------------------------------------------------------
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        (tag, raw), = value.items()
+        return {
+            "u": UUID,
+            "dt": datetime.fromisoformat,
+            "d": date.fromisoformat,
+            "n": Decimal,
+        }[tag](raw)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _matches(expr: ColumnElement, value: Any) -> bool:
+    """O valor do cursor tem o tipo Python da chave? (senão o asyncpg falharia no execute)"""
+    try:
+        python_type = expr.type.python_type
+    except NotImplementedError:
+        return True
+    if python_type is datetime:
+        # timestamp sem fuso não aceita datetime com fuso (e vice-versa)
+        aware = bool(getattr(expr.type, "timezone", False))
+        return isinstance(value, datetime) and (value.tzinfo is not None) == aware
+    if python_type is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    if python_type is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    if python_type is Decimal:
+        return isinstance(value, (Decimal, int)) and not isinstance(value, bool)
+    if python_type is str or issubclass(python_type, enum.Enum):
+        return isinstance(value, str)
+    return isinstance(value, python_type)
+
+
+def decode_cursor(cursor: str, order: Sequence[SortKey]) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_decode_value(v) for v in json.loads(raw)]
+    except (ValueError, TypeError, KeyError, AttributeError, InvalidOperation):
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+    if len(values) != len(order) or not all(_matches(expr, v) for (expr, _), v in zip(order, values)):
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+    return values
+
+
+def _after(order: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    """Linhas estritamente depois de `values` na ordenação `order`."""
+    directions = {desc for _, desc in order}
+    if len(directions) == 1:
+        # Mesma direção em todas as chaves → row comparison, aproveita índice composto
+        desc = directions.pop()
+        left = tuple_(*[expr for expr, _ in order])
+        right = tuple_(*[literal(v, type_=expr.type) for (expr, _), v in zip(order, values)])
+        return left < right if desc else left > right
+
+    clauses = []
+    for i, (expr, desc) in enumerate(order):
+        equal = [order[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, expr < values[i] if desc else expr > values[i]))
+    return or_(*clauses)
+
+
+# ---------------------------------------------------------------------------
+# Total
+# ---------------------------------------------------------------------------
+
+async def _exact_total(db: AsyncSession, query: Select) -> int:
+    return (await db.execute(
+        select(func.count()).select_from(query.order_by(None).subquery())
+    )).scalar()
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def _estimated_total(db: AsyncSession, query: Select) -> int:
+    plan = (await db.execute(_Explain(query.order_by(None)))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# ---------------------------------------------------------------------------
+# Paginação
+# ---------------------------------------------------------------------------
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order: Sequence[SortKey],
+    params: PageParams,
+) -> Page:
+    """Executa `query` (já filtrada, sem ORDER BY) paginada por `order`."""
+    labels = list(query.selected_columns.keys())
+    inline_total = params.include_total and params.total == "exact"
+    total = None
+    if params.include_total and params.total == "estimate":
+        total = await _estimated_total(db, query)
+
+    page_query = query.add_columns(*[expr for expr, _ in order])
+    if inline_total:
+        if params.cursor:
+            count = select(func.count()).select_from(query.order_by(None).subquery()).scalar_subquery()
+        else:
+            count = func.count().over()
+        page_query = page_query.add_columns(count.label("_total"))
+
+    page_query = page_query.order_by(*[expr.desc() if desc else expr.asc() for expr, desc in order])
+    if params.cursor:
+        page_query = page_query.where(_after(order, decode_cursor(params.cursor, order)))
+    else:
+        page_query = page_query.offset((params.page - 1) * params.per_page)
+
+    rows = (await db.execute(page_query.limit(params.per_page + 1))).all()
+    has_more = len(rows) > params.per_page
+    rows = rows[:params.per_page]
+
+    if inline_total:
+        if rows:
+            total = rows[0][-1]
+        elif params.cursor or params.page > 1:
+            # Página além do fim: sem linhas não há onde ler o total inline
+            total = await _exact_total(db, query)
+        else:
+            total = 0
+
+    width = len(labels)
+    keys = slice(width, width + len(order))
+    if width == 1:
+        items = [row[0] for row in rows]
+    else:
+        items = [dict(zip(labels, row[:width])) for row in rows]
+    return Page(
+        items=items,
+        total=total,
+        params=params,
+        next_cursor=encode_cursor(rows[-1][keys]) if has_more else None,
+    )
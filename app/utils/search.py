@@ -0,0 +1,75 @@
+"""
+Busca textual com pg_trgm (pickers e campos de busca da UI).
+
+`search(db, query, columns, termo, limit)` aplica a busca sobre uma query já
+filtrada (tenant, role, ativo...) e devolve no máximo `limit` pares
+(item, score) — sem COUNT nem OFFSET, pensada para "busca enquanto digita".
+
+Dois caminhos:
+  - termo curto (< 3 caracteres): trigramas não discriminam, então vale só
+    prefixo — `lower(col) LIKE 'ab%'`, servido pelos índices btree
+    `text_pattern_ops` em lower(col), em ordem alfabética;
+  - termo maior: `col ILIKE '%termo%' OR col % termo` (índices GIN
+    gin_trgm_ops), ordenado por similaridade, com bônus para quem começa com o
+    termo — digitar "inst" traz "INST-001" antes de "Reinstalação".
+
+Índices: alembic/versions/018_trigram_search.py.
+"""
+from typing import Any, Sequence
+
+from fastapi import Query
+from sqlalchemy import Float, Select, case, func, literal_column, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+MIN_TRIGRAM_LEN = 3
+MAX_LIMIT = 50
+
+
+def search_limit(limit: int = Query(10, ge=1, le=MAX_LIMIT)) -> int:
+    return limit
+
+
+def _escape_like(termo: str) -> str:
+    return termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains_filter(columns: Sequence[ColumnElement], termo: str) -> ColumnElement:
+    """`ILIKE '%termo%'` em qualquer das colunas (servido pelos índices GIN de trigramas)."""
+    like = f"%{_escape_like(termo.strip())}%"
+    return or_(*[c.ilike(like, escape="\\") for c in columns])
+
+
+async def search(
+    db: AsyncSession,
+    query: Select,
+    columns: Sequence[ColumnElement],
+    termo: str,
+    limit: int,
+) -> list[tuple[Any, float]]:
+    termo = termo.strip()
+    if not termo:
+        return []
+
+    # Constantes inline: bind params sem tipo no SELECT/CASE viram text no Postgres
+    one, zero = literal_column("1.0", Float), literal_column("0.0", Float)
+    prefixo = _escape_like(termo.lower()) + "%"
+    starts = [func.lower(c).like(prefixo, escape="\\") for c in columns]
+
+    if len(termo) < MIN_TRIGRAM_LEN:
+        stmt = (
+            query.add_columns(one.label("score"))
+            .where(or_(*starts))
+            .order_by(*[func.lower(c) for c in columns])
+        )
+    else:
+        similarity = func.greatest(*[func.similarity(c, termo) for c in columns])
+        score = (similarity + case((or_(*starts), one), else_=zero)).label("score")
+        stmt = (
+            query.add_columns(score)
+            .where(or_(contains_filter(columns, termo), *[c.op("%", is_comparison=True)(termo) for c in columns]))
+            .order_by(score.desc())
+        )
+
+    rows = (await db.execute(stmt.limit(limit))).all()
+    return [(row[0], round(float(row[-1]), 3)) for row in rows]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Verificação de regressão de planos: toda listagem deve ler a tabela principal
+por index range scan, já na ordem da paginação (sem Seq Scan nem Sort).
+
+Chama os services reais de listagem contra o banco de DATABASE_URL, captura o
+SELECT da página que cada um envia e roda EXPLAIN (FORMAT JSON) sobre ele com
+os mesmos parâmetros. Os planos são avaliados com enable_seqscan/enable_sort
+desligados: em tabelas pequenas (dev/CI) o planner preferiria varredura
+sequencial mesmo com índice; desligadas, só sobra Seq Scan/Sort quando NÃO
+existe índice que sirva o filtro + ordenação — exatamente a regressão que
+interessa pegar. Índices: alembic/versions/017_composite_list_indexes.py.
+
+Uso:
+    python scripts/check_index_scans.py
+
+Sai com código 1 se alguma listagem não passar.
+"""
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event  # noqa: E402
+
+from app.admin.service import list_users  # noqa: E402
+from app.auth.models import User, UserRole, UserStatus  # noqa: E402
+from app.database.connection import AsyncSessionLocal, engine  # noqa: E402
+from app.modules.catalogo.lpu.service import list_lpus  # noqa: E402
+from app.modules.contracts.models import ContractStatus  # noqa: E402
+from app.modules.contracts.service import list_contracts  # noqa: E402
+from app.modules.materials.service import list_materials  # noqa: E402
+from app.modules.partners.service import list_partners  # noqa: E402
+from app.modules.payments.models import PaymentStatus  # noqa: E402
+from app.modules.payments.service import list_payments  # noqa: E402
+from app.modules.projects.models import ProjectStatus  # noqa: E402
+from app.modules.projects.service import list_projects  # noqa: E402
+from app.utils.pagination import PageParams  # noqa: E402
+
+_SCANS_OK = {"Index Scan", "Index Only Scan"}
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _check_plan(plan: dict, table: str) -> list[str]:
+    problems = []
+    scans = [n for n in _nodes(plan) if n.get("Relation Name") == table]
+    if not scans:
+        problems.append(f"tabela {table} não aparece no plano")
+    for node in scans:
+        if node["Node Type"] not in _SCANS_OK:
+            problems.append(f"{table}: {node['Node Type']}")
+    for node in _nodes(plan):
+        if node["Node Type"] in ("Sort", "Incremental Sort"):
+            problems.append(f"Sort em {', '.join(node.get('Sort Key', []))}")
+    return problems
+
+
+async def main() -> int:
+    tenant = uuid.uuid4()
+    master = User(id=uuid.uuid4(), role=UserRole.MASTER, status=UserStatus.APPROVED, is_active=True)
+    master.tenants = []
+    params = PageParams(per_page=20)
+
+    cases = [
+        ("payments", "payments", lambda db: list_payments(db, [tenant], params)),
+        ("payments ?status", "payments", lambda db: list_payments(db, [tenant], params, PaymentStatus.PENDING)),
+        ("contracts", "contracts", lambda db: list_contracts(db, [tenant], params)),
+        ("contracts ?status", "contracts", lambda db: list_contracts(db, [tenant], params, ContractStatus.ACTIVE)),
+        ("projects", "projects", lambda db: list_projects(db, [tenant], params)),
+        ("projects ?status", "projects", lambda db: list_projects(db, [tenant], params, ProjectStatus.PENDING)),
+        ("materials", "materials", lambda db: list_materials(db, [tenant], params)),
+        ("users", "users", lambda db: list_users(db, master, params)),
+        ("users ?role", "users", lambda db: list_users(db, master, params, UserRole.STAFF)),
+        ("partners", "users", lambda db: list_partners(db, master, params)),
+        ("lpus", "lpus", lambda db: list_lpus(db, tenant, params)),
+    ]
+
+    captured: list[tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    failures = 0
+    try:
+        for label, table, call in cases:
+            captured.clear()
+            async with AsyncSessionLocal() as db:
+                await call(db)
+            # O SELECT da página é o primeiro que toca a tabela (os seguintes são selectinload)
+            statement, parameters = next(
+                (s, p) for s, p in captured if f"FROM {table}" in s
+            )
+            async with engine.connect() as conn:
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                await conn.exec_driver_sql("SET LOCAL enable_sort = off")
+                plan = (await conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )).scalar()
+                await conn.rollback()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            problems = _check_plan(plan[0]["Plan"], table)
+            status = "OK  " if not problems else "FALHA"
+            print(f"{status} {label}" + (f" — {'; '.join(problems)}" if problems else ""))
+            failures += bool(problems)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        await engine.dispose()
+
+    print()
+    print("Todas as listagens usam índice." if not failures else f"{failures} listagem(ns) sem índice adequado.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))